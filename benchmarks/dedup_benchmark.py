@@ -0,0 +1,103 @@
+"""Benchmark the near-duplicate index on synthetic news batches.
+
+Three batch shapes are measured at increasing sizes:
+
+- typical: mostly distinct stories, about a quarter of them re-reported
+  with small wording changes by another source
+- all_duplicates: every item is a rewording of the same story
+- all_distinct: no duplicates, but every item draws on one shared vocabulary
+  (the most band collisions without any merges)
+
+Per-insert cost should stay roughly flat as the batch grows.
+
+Usage:
+    python -m benchmarks.dedup_benchmark [--sizes 1000 5000 20000] [--json out.json]
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from src.news.dedup import DedupIndex
+
+VOCABULARY = (
+    "senate house vote bill budget economy jobs inflation report rates federal reserve "
+    "court ruling election campaign governor mayor city state climate energy policy "
+    "tax reform education schools health care hospital border trade tariffs market "
+    "stocks growth recovery workers union strike housing prices rent infrastructure "
+    "bridge roads broadband funding deal talks agreement summit leaders officials"
+).split()
+
+SOURCES = ["Reuters", "Associated Press", "NPR", "BBC News", "Twitter"]
+
+
+def make_story(rng: random.Random, words: int = 30) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def reword(rng: random.Random, text: str, edits: int = 2) -> str:
+    tokens = text.split()
+    for _ in range(edits):
+        tokens[rng.randrange(len(tokens))] = rng.choice(VOCABULARY)
+    return " ".join(tokens)
+
+
+def make_batch(shape: str, size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    items = []
+    base = make_story(rng)
+    for i in range(size):
+        if shape == "all_duplicates":
+            text = reword(rng, base)
+        elif shape == "typical" and items and rng.random() < 0.25:
+            text = reword(rng, rng.choice(items)["summary"])
+        else:
+            text = make_story(rng)
+        items.append({
+            "title": text[:60],
+            "summary": text,
+            "source": rng.choice(SOURCES),
+            "url": f"https://example.com/{shape}/{i}",
+        })
+    return items
+
+
+def bench(shape: str, size: int) -> Dict[str, Any]:
+    items = make_batch(shape, size)
+    index = DedupIndex()
+    start = time.perf_counter()
+    for item in items:
+        index.add(item)
+    elapsed = time.perf_counter() - start
+    return {
+        "shape": shape,
+        "items": size,
+        "groups": len(index.items),
+        "seconds": elapsed,
+        "items_per_sec": size / elapsed,
+        "us_per_insert": elapsed / size * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'shape':<16} {'items':>7} {'groups':>7} {'items/sec':>10} {'us/insert':>10}")
+    for shape in ("typical", "all_duplicates", "all_distinct"):
+        for size in args.sizes:
+            r = bench(shape, size)
+            results.append(r)
+            print(f"{shape:<16} {size:>7} {r['groups']:>7} {r['items_per_sec']:>10.0f} {r['us_per_insert']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark article text extraction backends over the saved HTML fixtures.
+
+Reports pages/sec and peak Python memory per backend. ``soup`` is the
+original BeautifulSoup implementation and serves as the baseline.
+(tracemalloc only sees Python allocations, so lxml's C-side memory is
+not included in its peak.)
+
+Usage:
+    python -m benchmarks.extraction_benchmark [--rounds 5] [--max-chars 20000] [--json out.json]
+"""
+import argparse
+import glob
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from src.news.extraction import BACKENDS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+
+def load_corpus() -> List[str]:
+    paths = sorted(glob.glob(os.path.join(FIXTURES, "*.html")))
+    if not paths:
+        raise SystemExit(f"No fixtures found in {FIXTURES}")
+    corpus = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            corpus.append(f.read())
+    return corpus
+
+
+def bench_backend(name: str, corpus: List[str], rounds: int, max_chars: int) -> Dict[str, Any]:
+    extract = BACKENDS[name]
+    for html in corpus:  # warm up
+        extract(html, max_chars)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in corpus:
+            extract(html, max_chars)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for html in corpus:
+        extract(html, max_chars)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pages = rounds * len(corpus)
+    return {
+        "backend": name,
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_sec": pages / elapsed,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-chars", type=int, default=20000)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    corpus_kb = sum(len(html) for html in corpus) / 1024
+    print(f"{len(corpus)} pages, {corpus_kb:.0f} KB of HTML, {args.rounds} rounds")
+
+    results = [bench_backend(name, corpus, args.rounds, args.max_chars) for name in BACKENDS]
+    baseline = next(r for r in results if r["backend"] == "soup")
+    print(f"{'backend':<8} {'pages/sec':>10} {'speedup':>8} {'peak KB':>10}")
+    for r in results:
+        r["speedup"] = r["pages_per_sec"] / baseline["pages_per_sec"]
+        print(f"{r['backend']:<8} {r['pages_per_sec']:>10.1f} {r['speedup']:>7.1f}x {r['peak_memory_kb']:>10.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"corpus_pages": len(corpus), "corpus_kb": corpus_kb, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
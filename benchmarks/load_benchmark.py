@@ -0,0 +1,342 @@
+"""Offline load test of the podcast pipeline at increasing concurrency.
+
+Everything upstream is a deterministic fake: a stub Gemini model with a
+configurable first-token latency, decoding rate and output length; a stub
+tweepy client with per-call latency; and a local HTTP server that serves
+the article fixtures, which the aggregator fetches and extracts.
+
+Two scenarios are run at each concurrency level:
+
+- podcast: ``POST /generate-podcast`` over real HTTP against the app
+  running in-process under uvicorn (news comes from the shared cache,
+  so this is mostly generation)
+- aggregator: one uncached news aggregation per request (Twitter fan-out,
+  dedup, scoring, article fetch and extraction)
+
+For each level the benchmark reports throughput, p50/p95/p99 latency,
+status counts, event-loop lag (how late a 10 ms timer fires) and RSS.
+The transcript cache is disabled so every request reaches the model.
+Requests rejected with 503 count as errors and show where backpressure
+starts.
+
+Usage:
+    python -m benchmarks.load_benchmark [--concurrency 1 4 16 64] [--json out.json]
+    python -m benchmarks.load_benchmark --compare before.json after.json
+"""
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve_fixtures() -> ThreadingHTTPServer:
+    """Serve the article fixtures from a local HTTP server on a free port."""
+    handler = functools.partial(QuietHandler, directory=FIXTURES)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fixture_articles(base_url: str) -> List[Dict[str, Any]]:
+    """News items whose URLs point at the local fixture server."""
+    from datetime import datetime, timedelta
+
+    now = datetime.now()
+    return [
+        {
+            'title': name[:-5].replace('_', ' ').title(),
+            'summary': f"Coverage of the {name[:-5].replace('_', ' ')} story from our local fixture server.",
+            'source': 'Reuters',
+            'url': f"{base_url}/{name}",
+            'published_at': now - timedelta(hours=i),
+            'relevance_score': 0.9,
+        }
+        for i, name in enumerate(sorted(os.listdir(FIXTURES)))
+        if name.endswith(".html")
+    ]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def rss_mb() -> float:
+    """Current resident set size, falling back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class LoopLagMonitor:
+    """Samples how late a short timer fires, i.e. how long the loop was blocked."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    def __enter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._task.cancel()
+
+
+async def drive(
+    scenario: str,
+    send: Callable[[], Awaitable[int]],
+    concurrency: int,
+    total: int
+) -> Dict[str, Any]:
+    """Run ``total`` calls of ``send`` with ``concurrency`` in flight."""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                status = str(await send())
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    rss_before = rss_mb()
+    with LoopLagMonitor() as lag:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    ok = statuses.get("200", 0)
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": ok,
+        "errors": total - ok,
+        "statuses": statuses,
+        "seconds": elapsed,
+        "throughput_rps": ok / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "loop_lag_ms": {
+            "p99": percentile(lag.samples, 99) * 1000,
+            "max": max(lag.samples, default=0.0) * 1000,
+        },
+        "rss_mb": {"before": rss_before, "after": rss_mb()},
+    }
+
+
+def configure_environment(workdir: str) -> None:
+    """Point the app at the offline stubs; must run before ``src`` is imported."""
+    os.environ["USE_STUB_MODEL"] = "true"
+    os.environ["TRANSCRIPT_CACHE_ENABLED"] = "false"
+    os.environ["FETCH_ARTICLE_CONTENT"] = "true"
+    os.environ["JOB_DATABASE_PATH"] = os.path.join(workdir, "jobs.sqlite3")
+    os.environ["SHARED_CACHE_PATH"] = os.path.join(workdir, "shared.sqlite3")
+    os.environ["EPISODE_ARCHIVE_DIR"] = os.path.join(workdir, "episodes")
+    for name in ("TWITTER_API_KEY", "TWITTER_API_SECRET", "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_SECRET"):
+        os.environ.pop(name, None)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import uvicorn
+
+    from src.api import main as app_module
+    from src.generation.stub import StubModel
+    from src.news.aggregator import NewsAggregator
+    from src.news.cache import NewsCache
+    from src.news.stub import StubTwitterClient
+
+    logging.getLogger().setLevel(args.log_level)
+
+    fixture_server = serve_fixtures()
+    base_url = f"http://127.0.0.1:{fixture_server.server_address[1]}"
+    articles = fixture_articles(base_url)
+
+    class FixtureNewsAggregator(NewsAggregator):
+        async def _fetch_news_api(self) -> List[Dict[str, Any]]:
+            return [dict(article) for article in articles]
+
+    def make_aggregator() -> NewsAggregator:
+        return FixtureNewsAggregator(
+            cache=NewsCache(ttl_seconds=3600),
+            twitter_client=StubTwitterClient(latency=args.twitter_latency)
+        )
+
+    app_module.news_aggregator = make_aggregator()
+    for model_name in app_module.model_router.model_names:
+        app_module.model_registry.register(model_name, StubModel(
+            model_name,
+            first_token_latency=args.first_token_latency,
+            output_tokens=args.output_tokens,
+            tokens_per_second=args.tokens_per_second
+        ))
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app_module.app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300, limits=limits) as client:
+            body = {"topic": "Load test", "duration_minutes": args.duration_minutes}
+
+            async def send_podcast() -> int:
+                response = await client.post("/generate-podcast", json=body)
+                return response.status_code
+
+            # warm the news cache, the model and the connection pool
+            await send_podcast()
+
+            aggregator = make_aggregator()
+
+            async def send_aggregation() -> int:
+                items = await aggregator._aggregate_news()
+                return 200 if items else 204
+
+            for concurrency in args.concurrency:
+                total = max(args.requests, concurrency * args.rounds)
+                for scenario, send in (("podcast", send_podcast), ("aggregator", send_aggregation)):
+                    result = await drive(scenario, send, concurrency, total)
+                    results.append(result)
+                    print(
+                        f"{scenario:<11} {concurrency:>5} {result['ok']:>5}/{total:<5} "
+                        f"{result['throughput_rps']:>8.1f} {result['latency_ms']['p50']:>8.0f} "
+                        f"{result['latency_ms']['p95']:>8.0f} {result['latency_ms']['p99']:>8.0f} "
+                        f"{result['loop_lag_ms']['max']:>8.1f} {result['rss_mb']['after']:>7.0f}"
+                    )
+            await aggregator.fetcher.aclose()
+            aggregator.extraction_pool.shutdown()
+    finally:
+        server.should_exit = True
+        await serving
+        fixture_server.shutdown()
+
+    return {
+        "benchmark": "load",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            name: getattr(args, name) for name in (
+                "concurrency", "requests", "rounds", "duration_minutes", "first_token_latency",
+                "tokens_per_second", "output_tokens", "twitter_latency"
+            )
+        },
+        "results": results,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path: str, after_path: str) -> None:
+    """Print throughput and p95 changes between two saved runs."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    baseline = {(r["scenario"], r["concurrency"]): r for r in before["results"]}
+
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+    print(f"{'scenario':<11} {'conc':>5} {'rps':>17} {'p95 ms':>19}")
+    for r in after["results"]:
+        old = baseline.get((r["scenario"], r["concurrency"]))
+        if not old:
+            continue
+        rps_change = (r["throughput_rps"] / old["throughput_rps"] - 1) * 100 if old["throughput_rps"] else 0.0
+        p95_change = (r["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1) * 100 if old["latency_ms"]["p95"] else 0.0
+        print(
+            f"{r['scenario']:<11} {r['concurrency']:>5} "
+            f"{r['throughput_rps']:>8.1f} ({rps_change:+5.0f}%) "
+            f"{r['latency_ms']['p95']:>9.0f} ({p95_change:+5.0f}%)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=20, help="minimum requests per level")
+    parser.add_argument("--rounds", type=int, default=3, help="requests per concurrent client")
+    parser.add_argument("--duration-minutes", type=int, default=15)
+    parser.add_argument("--first-token-latency", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=2000)
+    parser.add_argument("--output-tokens", type=int, default=1000)
+    parser.add_argument("--twitter-latency", type=float, default=0.05)
+    parser.add_argument("--log-level", default="ERROR")
+    parser.add_argument("--json", help="also write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two saved runs and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_environment(workdir)
+        print(f"{'scenario':<11} {'conc':>5} {'ok':>11} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'lag ms':>8} {'rss MB':>7}")
+        report = asyncio.run(run(args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
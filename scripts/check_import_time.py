@@ -0,0 +1,57 @@
+"""Check that importing the API module stays within an import-time budget.
+
+Each run imports ``src.api.main`` in a fresh interpreter with no Google API
+key, so it measures exactly what a new uvicorn worker pays before it can
+serve requests.
+
+Usage:
+    python scripts/check_import_time.py [--budget-ms 1000] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MEASURE = (
+    "import time; start = time.perf_counter(); "
+    "import {module}; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def measure_import_ms(module: str) -> float:
+    env = dict(os.environ)
+    env.pop("GOOGLE_API_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(module=module)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.api.main")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = [measure_import_ms(args.module) for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(
+        f"import {args.module}: median {median:.0f} ms "
+        f"(min {min(timings):.0f}, max {max(timings):.0f}, budget {args.budget_ms:.0f})"
+    )
+    if median > args.budget_ms:
+        print("Import-time budget exceeded", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,163 @@
+import asyncio
+import gzip
 import os
-from typing import List, Dict, Any
-from fastapi import FastAPI, HTTPException
+import re
+import sqlite3
+from typing import List, Dict, Any, Optional
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import google.generativeai as genai
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from datetime import datetime
 import logging
 
 # Set up logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
-from ..presenters.personalities import ALEX, SARA, get_presenter_prompt
 from ..news.aggregator import NewsAggregator
+from ..audio.dialogue import parse_dialogue
+from ..audio.tts import AudioCache, TTSPipeline, create_engine, wav_header
+from ..config.settings import AI_SETTINGS, ARCHIVE_SETTINGS, AUDIO_SETTINGS, JOB_SETTINGS, PODCAST_SETTINGS, TRANSCRIPT_CACHE_SETTINGS
+from ..generation.cache import generate_text, transcript_cache as shared_transcript_cache
+from ..generation.executor import GenerationExecutor, GenerationQueueFullError
+from ..generation.models import ModelRegistry, ModelUnavailableError
+from ..generation.prompts import build_episode_prompt
+from ..generation.router import ModelRouter, ModelTier
+from ..generation.scheduler import ModelScheduler, UpstreamUnavailableError
+from ..generation.segments import generate_segmented_transcript, needs_segmentation
+from ..generation.streaming import SEGMENT_MARKER_INSTRUCTIONS, SegmentMarkerParser, format_sse
+from ..jobs.store import IdempotencyKeyConflictError, JobStore
+from ..jobs.worker import JobQueue
+from ..news.cache import news_cache
+from ..storage.archive import EpisodeArchive
+from ..storage.shared_cache import shared_cache
+from .responses import file_response, negotiate_encoding, ranged_response
+from ..observability.metrics import hit_ratio, render_metrics, runtime_stats, span
 
 # Load environment variables
 load_dotenv()
 logger.debug("Environment variables loaded")
 
-# Get API key and validate
-google_api_key = os.getenv("GOOGLE_API_KEY")
-logger.debug(f"GOOGLE_API_KEY present: {'Yes' if google_api_key else 'No'}")
-if not google_api_key:
-    raise ValueError(
-        "GOOGLE_API_KEY environment variable is not set. "
-        "Please create a .env file with your Google API key. "
-        "You can get one from https://makersuite.google.com/app/apikey"
-    )
+MODEL_TIERS = {
+    name: ModelTier(name, **{"max_output_tokens": AI_SETTINGS["max_output_tokens"], **tier})
+    for name, tier in AI_SETTINGS["model_tiers"].items()
+}
 
-# Configure Google's Generative AI
-try:
-    genai.configure(api_key=google_api_key)
-    # List available models to verify access
-    models = genai.list_models()
-    available_models = [model.name for model in models]
-    logger.debug(f"Available models: {available_models}")
-    
-    if 'models/gemini-1.5-pro' not in available_models:
-        raise ValueError("Gemini Pro model not available. Please check your API key and access.")
-        
-    logger.debug("Successfully configured Google AI")
-except Exception as e:
-    logger.error(f"Error configuring Google AI: {str(e)}")
-    raise
+# Google's Generative AI is configured lazily, on first use or at startup;
+# a tier whose model the API key can't use is routed around
+model_registry = ModelRegistry(
+    required_models=sorted({tier.model_name for tier in MODEL_TIERS.values()}),
+    validation_timeout=AI_SETTINGS["model_validation_timeout_seconds"],
+    use_stub=AI_SETTINGS["use_stub_model"]
+)
+
+GENERATION_CONFIG = {
+    "temperature": AI_SETTINGS["temperature"],
+    "top_p": AI_SETTINGS["top_p"],
+    "top_k": AI_SETTINGS["top_k"],
+    "max_output_tokens": AI_SETTINGS["max_output_tokens"],
+}
 
 app = FastAPI(title="AI Podcast System")
 
+# Model calls are blocking, so they run on a bounded worker pool
+generation_executor = GenerationExecutor(
+    max_concurrent=AI_SETTINGS["max_concurrent_generations"],
+    max_queue_size=AI_SETTINGS["generation_queue_size"]
+)
+
+# Quota, retries, hedging and circuit breaking in front of the pool
+model_scheduler = ModelScheduler(
+    generation_executor,
+    requests_per_minute=AI_SETTINGS["requests_per_minute"],
+    tokens_per_minute=AI_SETTINGS["tokens_per_minute"],
+    timeout=AI_SETTINGS["request_timeout_seconds"],
+    max_retries=AI_SETTINGS["max_retries"],
+    backoff_base=AI_SETTINGS["retry_backoff_base_seconds"],
+    max_backoff=AI_SETTINGS["retry_backoff_max_seconds"],
+    hedge_after=AI_SETTINGS["hedge_after_seconds"],
+    failure_threshold=AI_SETTINGS["circuit_failure_threshold"],
+    reset_timeout=AI_SETTINGS["circuit_reset_seconds"],
+    max_quota_wait=AI_SETTINGS["max_quota_wait_seconds"]
+)
+
+# Each request's model tier and output budget, from its duration and the queue
+model_router = ModelRouter(
+    MODEL_TIERS,
+    generation_executor,
+    GENERATION_CONFIG,
+    default_tier=AI_SETTINGS["default_tier"],
+    fast_tier=AI_SETTINGS["fast_tier"],
+    fallback_tier=AI_SETTINGS["fallback_tier"],
+    fast_path_max_minutes=PODCAST_SETTINGS["fast_path_max_duration_minutes"],
+    queue_latency_slo=AI_SETTINGS["queue_latency_slo_seconds"],
+    output_tokens_per_minute=PODCAST_SETTINGS["output_tokens_per_minute"],
+    headroom=AI_SETTINGS["output_token_headroom"],
+    min_minutes=PODCAST_SETTINGS["min_duration_minutes"],
+    max_minutes=PODCAST_SETTINGS["max_duration_minutes"],
+    min_output_tokens=AI_SETTINGS["min_output_tokens"],
+    available=model_registry.is_available
+)
+
+# Identical prompts are answered from the transcript cache
+transcript_cache = shared_transcript_cache if TRANSCRIPT_CACHE_SETTINGS["enabled"] else None
+
+# Speaker turns are rendered concurrently and cached per turn
+audio_cache = AudioCache(
+    AUDIO_SETTINGS["cache_directory"],
+    max_entries=AUDIO_SETTINGS["max_cache_entries"],
+    max_bytes=AUDIO_SETTINGS["max_cache_bytes"]
+) if AUDIO_SETTINGS["cache_enabled"] else None
+tts_pipeline = TTSPipeline(
+    create_engine(AUDIO_SETTINGS["engine"], AUDIO_SETTINGS["sample_rate"], AUDIO_SETTINGS["words_per_minute"]),
+    AUDIO_SETTINGS["voices"],
+    workers=AUDIO_SETTINGS["workers"],
+    lookahead=AUDIO_SETTINGS["lookahead_turns"],
+    pause_ms=AUDIO_SETTINGS["pause_ms"],
+    cache=audio_cache
+)
+
+# One aggregator (and Twitter client) shared across requests
+news_aggregator = NewsAggregator()
+
+runtime_stats.gauge("podcast_llm_in_flight", "Model calls currently running", lambda: generation_executor.in_flight)
+runtime_stats.gauge("podcast_llm_queued", "Model calls waiting for a generation slot", lambda: generation_executor.queued)
+runtime_stats.gauge(
+    "podcast_llm_circuit_open", "1 while the model circuit breaker is failing fast",
+    lambda: float(model_scheduler.breaker.state != model_scheduler.breaker.CLOSED)
+)
+runtime_stats.gauge(
+    "podcast_llm_queue_wait_seconds", "Moving average of recent waits for a generation slot",
+    lambda: generation_executor.queue_wait
+)
+runtime_stats.gauge("podcast_jobs_queued", "Podcast jobs waiting for a worker", lambda: app.state.job_queue.depth)
+runtime_stats.counter("podcast_news_cache_hits", "News lookups served from the cache", lambda: news_cache.hits)
+runtime_stats.counter("podcast_news_cache_misses", "News lookups that refreshed the cache", lambda: news_cache.misses)
+runtime_stats.gauge(
+    "podcast_news_cache_hit_ratio", "Share of news lookups served from the cache",
+    lambda: hit_ratio(news_cache.hits, news_cache.misses)
+)
+if shared_cache:
+    runtime_stats.counter(
+        "podcast_shared_cache_refreshes", "Expired shared entries this worker refreshed",
+        lambda: shared_cache.refreshes
+    )
+    runtime_stats.counter(
+        "podcast_shared_cache_joined", "Refreshes this worker left to another worker and waited for",
+        lambda: shared_cache.joined
+    )
+if transcript_cache:
+    runtime_stats.counter("podcast_transcript_cache_hits", "Transcripts served from the cache", lambda: transcript_cache.hits)
+    runtime_stats.counter("podcast_transcript_cache_misses", "Transcripts that needed a model call", lambda: transcript_cache.misses)
+    runtime_stats.gauge(
+        "podcast_transcript_cache_hit_ratio", "Share of transcripts served from the cache",
+        lambda: hit_ratio(transcript_cache.hits, transcript_cache.misses)
+    )
+if audio_cache:
+    runtime_stats.counter("podcast_audio_cache_hits", "Speaker turns served from the audio cache", lambda: audio_cache.hits)
+    runtime_stats.counter("podcast_audio_cache_misses", "Speaker turns that had to be synthesised", lambda: audio_cache.misses)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -58,12 +169,40 @@ app.add_middleware(
 
 class PodcastRequest(BaseModel):
     topic: str
-    duration_minutes: int = 15
+    duration_minutes: int = Field(
+        PODCAST_SETTINGS["default_duration_minutes"],
+        ge=PODCAST_SETTINGS["min_duration_minutes"],
+        le=PODCAST_SETTINGS["max_duration_minutes"]
+    )
+    # None picks segmented generation automatically for long episodes
+    segmented: Optional[bool] = None
 
 class PodcastResponse(BaseModel):
     title: str
     transcript: str
     topics: List[Dict[str, Any]]
+    # Fetch the episode again from /episodes/{episode_id}
+    episode_id: Optional[str] = None
+
+class BatchPodcastRequest(BaseModel):
+    requests: List[PodcastRequest]
+
+class BatchItemResult(BaseModel):
+    index: int
+    status_code: int
+    result: Optional[PodcastResponse] = None
+    error: Optional[str] = None
+
+class BatchPodcastResponse(BaseModel):
+    results: List[BatchItemResult]
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+    result: Optional[PodcastResponse] = None
 
 @app.get("/")
 async def root():
@@ -71,129 +210,273 @@ async def root():
 
 @app.post("/generate-podcast", response_model=PodcastResponse)
 async def generate_podcast(request: PodcastRequest):
+    podcast = await create_podcast(request)
+    with span("serialize"):
+        body = podcast.model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+async def prepare_podcast() -> List[Dict[str, Any]]:
+    """The discussion topics every podcast request starts from."""
+    # Topics are built with each news refresh and served from the shared cache
+    with span("news"):
+        return await news_aggregator.get_discussion_topics()
+
+async def create_podcast(
+    request: PodcastRequest,
+    prepared: Optional[List[Dict[str, Any]]] = None
+) -> PodcastResponse:
+    """Run the full pipeline: news, topics and transcript.
+
+    Pass ``prepared`` (from ``prepare_podcast``) to reuse topics already
+    built for another request.
+    """
     try:
-        # Initialize news aggregator
-        news_aggregator = NewsAggregator()
-        
-        # Get news summaries
-        news_items = await news_aggregator.get_news_summaries()
-        
-        # Generate discussion topics
-        topics = news_aggregator.generate_discussion_topics(news_items)
-        
-        # Initialize the model with the correct name
-        model = genai.GenerativeModel('gemini-1.5-pro')
+        topics = prepared if prepared is not None else await prepare_podcast()
         
         # Generate podcast transcript
-        transcript = await generate_transcript(model, topics, request.duration_minutes)
+        with span("transcript"):
+            transcript = await generate_transcript(
+                topics, request.duration_minutes, segmented=request.segmented
+            )
         
-        return PodcastResponse(
+        podcast = PodcastResponse(
             title=f"AI Podcast: {request.topic}",
             transcript=transcript,
             topics=topics
         )
+        podcast.episode_id = await archive_episode(podcast)
+        return podcast
+    except HTTPException:
+        raise
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating podcast: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def generate_transcript(model: Any, topics: List[Dict[str, Any]], duration_minutes: int) -> str:
-    """Generate a podcast transcript using the AI model."""
-    
-    # Get current date
-    current_date = datetime.now().strftime("%B %d, %Y")
-    
-    # Ensure we have exactly 4 topics for the news summary segment
-    news_topics = topics[:4]
-    
-    # Create the conversation context
-    context = f"""Generate a {duration_minutes}-minute podcast discussion between two hosts: {ALEX.name} and {SARA.name}.
-
-The podcast should follow this structure:
-
-1. Introduction (2-3 minutes):
-   - Start with a warm greeting and mention today's date: {current_date}
-   - Briefly mention that they'll be discussing significant political and economic news from the past week
-   - Introduce the special topic for this week's show
-   - Keep the introduction engaging and natural
-
-2. News Summary Segment (8-10 minutes):
-   For each of these 4 topics (spend about 2 minutes per topic):
-   {chr(10).join(f'- {topic["title"]}: {topic["summary"]}' for topic in news_topics)}
-
-   For each topic, follow this pattern:
-   a) First presenter gives a non-partisan summary of the news
-   b) First presenter asks the other presenter for their perspective
-   c) Second presenter responds with their perspective, consistent with their political view
-   d) Second presenter asks a follow-up question
-   e) First presenter responds with their perspective
-   f) Brief back-and-forth discussion (30-45 seconds)
-   g) Smooth transition to next topic
-
-3. Main Topic Discussion (5-7 minutes):
-   Focus on a current issue where both conservatives and liberals agree America can do better.
-   Follow this structure:
-   a) First presenter introduces the topic and explains why it's important for America's future
-   b) First presenter asks the other presenter for their thoughts and ideas for improvement
-   c) Second presenter shares their perspective and specific suggestions
-   d) Back-and-forth discussion incorporating:
-      - Recent news relevant to the topic
-      - Data and statistics when available
-      - Specific examples of what's working or not working
-      - Concrete ideas for improvement
-   e) If the issue can be explained with data visualization:
-      - Describe what the graph/chart would show
-      - Explain the key trends and patterns
-      - Discuss what the data means for America's future
-      - Use the visualization to support specific improvement suggestions
-
-4. Closing Segment (3-4 minutes):
-   Each presenter finds common ground with the other's political goals:
-   a) {ALEX.name} (liberal) should:
-      - Choose a current conservative policy goal or initiative
-      - Find genuine positive aspects in it
-      - Explain how it could work and be beneficial from a liberal perspective
-      - Suggest how it could be implemented in a way that aligns with liberal values
-   
-   b) {SARA.name} (conservative) should:
-      - Choose a current liberal policy goal or initiative
-      - Find genuine positive aspects in it
-      - Explain how it could work and be beneficial from a conservative perspective
-      - Suggest how it could be implemented in a way that aligns with conservative values
-   
-   c) End with a brief, positive reflection on finding common ground
-
-Remember:
-- Keep the tone engaging, conversational, and fun
-- Both hosts should be polite and open-minded
-- Look for opportunities to find common ground
-- Show genuine curiosity about different perspectives
-- Use their favorite quotes when relevant
-- Reference their trusted sources when appropriate
-- Maintain a good pace - about 2 minutes per news topic
-- Ensure smooth transitions between topics
-- Focus on constructive solutions and improvements
-- Use data and examples to support points
-- Keep the discussion forward-looking and solution-oriented
-- In the closing segment, be genuine and specific about finding common ground
-- End on a positive, hopeful note about America's future
-"""
+async def archive_episode(podcast: PodcastResponse) -> Optional[str]:
+    """Store ``podcast`` in the episode archive; returns its id, or None if it isn't archived."""
+    archive = getattr(app.state, "episode_archive", None)
+    if archive is None:
+        return None
+    try:
+        # hashing, compression and file writes: keep them off the event loop
+        return await asyncio.to_thread(archive.store, podcast.model_dump(exclude={"episode_id"}))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Failed to archive episode: {str(e)}")
+        return None
+
+@app.post("/generate-podcast/batch", response_model=BatchPodcastResponse)
+async def generate_podcast_batch(batch: BatchPodcastRequest):
+    """Generate several podcasts from one news fetch and topic pass.
+
+    Transcripts are generated concurrently, at most
+    ``PODCAST_SETTINGS["batch_concurrency"]`` at a time. Results come back
+    in request order; an item that fails carries its own status code and
+    error instead of failing the whole batch.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=422, detail="A batch needs at least one request")
+    if len(batch.requests) > PODCAST_SETTINGS["max_batch_size"]:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch can hold at most {PODCAST_SETTINGS['max_batch_size']} requests"
+        )
+
+    try:
+        prepared = await prepare_podcast()
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error preparing podcast batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    limit = asyncio.Semaphore(PODCAST_SETTINGS["batch_concurrency"])
+
+    async def run_item(index: int, request: PodcastRequest) -> BatchItemResult:
+        async with limit:
+            try:
+                podcast = await create_podcast(request, prepared)
+            except HTTPException as e:
+                return BatchItemResult(index=index, status_code=e.status_code, error=str(e.detail))
+        return BatchItemResult(index=index, status_code=200, result=podcast)
+
+    results = await asyncio.gather(*(
+        run_item(index, request) for index, request in enumerate(batch.requests)
+    ))
+    with span("serialize"):
+        body = BatchPodcastResponse(results=results).model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_podcast_job(
+    request: PodcastRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Queue a podcast for background generation and return its job id.
+
+    Resubmitting with the same ``Idempotency-Key`` header returns the
+    existing job instead of starting the work again; reusing a key for a
+    different request is rejected with 422.
+    """
+    try:
+        job, created = await app.state.job_queue.submit(request.model_dump(), idempotency_key)
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not created:
+        response.status_code = 200
+    return to_job_response(job)
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_podcast_job(job_id: str):
+    job = await asyncio.to_thread(app.state.job_queue.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return to_job_response(job)
+
+def to_job_response(job: Dict[str, Any]) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        error=job["error"],
+        result=job["result"]
+    )
+
+async def run_podcast_job(request: Dict[str, Any]) -> Dict[str, Any]:
+    podcast = await create_podcast(PodcastRequest(**request))
+    return podcast.model_dump()
+
+@app.post("/generate-podcast/audio")
+async def generate_podcast_audio(request: PodcastRequest):
+    """Stream the podcast as a WAV file, rendered turn by turn.
+
+    The transcript is split into speaker turns, which are synthesised
+    concurrently with each host's voice. Audio is streamed in order as
+    soon as each turn (and every turn before it) is ready.
+    """
+    podcast = await create_podcast(request)
+    turns = parse_dialogue(podcast.transcript)
+    if not turns:
+        raise HTTPException(status_code=500, detail="The transcript has no speaker turns to render")
+    return StreamingResponse(
+        tts_pipeline.stream(turns),
+        media_type="audio/wav",
+        headers={"X-Podcast-Turns": str(len(turns)), "X-TTS-Engine": tts_pipeline.engine.name}
+    )
+
+@app.post("/generate-podcast/stream")
+async def generate_podcast_stream(request: PodcastRequest):
+    """Stream the transcript as Server-Sent Events while it is generated.
+
+    Emits a ``topics`` event first, then ``segment`` markers (intro, news,
+    main_topic, closing) interleaved with ``transcript`` text chunks, and
+    finally ``done`` or ``error``.
+    """
+    try:
+        topics = await prepare_podcast()
+        # Validate API access first so routing skips missing models
+        await model_registry.validate_async()
+        route = model_router.route(request.duration_minutes)
+        model = await model_registry.get_model(route.model_name)
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error preparing podcast stream: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    context = build_transcript_prompt(topics, request.duration_minutes) + SEGMENT_MARKER_INSTRUCTIONS
+
+    cache_key = transcript_cache.key(getattr(model, "model_name", ""), context, route.generation_config) if transcript_cache else None
+    cached = await transcript_cache.get_async(cache_key) if transcript_cache else None
+
+    async def replay(text: str):
+        yield text
+
+    async def events():
+        event_id = 0
+        yield format_sse("topics", {"title": f"AI Podcast: {request.topic}", "topics": topics}, event_id)
+        parser = SegmentMarkerParser()
+        chunks = replay(cached) if cached is not None else model_router.bind(model_scheduler, route).stream(
+            model, context, route.generation_config
+        )
+        received = []
+        try:
+            async for chunk in chunks:
+                received.append(chunk)
+                for event in parser.feed(chunk):
+                    event_id += 1
+                    yield format_sse(event["event"], event["data"], event_id)
+            for event in parser.close():
+                event_id += 1
+                yield format_sse(event["event"], event["data"], event_id)
+            if transcript_cache and cached is None:
+                await transcript_cache.set_async(cache_key, "".join(received))
+            yield format_sse("done", {}, event_id + 1)
+        except GenerationQueueFullError:
+            yield format_sse("error", {"status_code": 503, "detail": "Podcast generation is at capacity, please retry shortly"})
+        except UpstreamUnavailableError as e:
+            yield format_sse("error", {"status_code": 503, "detail": str(e)})
+        except Exception as e:
+            logger.error(f"Error streaming transcript: {str(e)}")
+            yield format_sse("error", {"status_code": 500, "detail": f"Failed to generate podcast transcript: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def build_transcript_prompt(topics: List[Dict[str, Any]], duration_minutes: int) -> str:
+    """Build the full-episode prompt for the AI model."""
+    with span("prompt_build"):
+        prompt = build_episode_prompt(topics, duration_minutes)
+    logger.debug("Built %d-token episode prompt: %s", prompt.total_tokens, prompt.sections)
+    return prompt.text
+
+async def generate_transcript(
+    topics: List[Dict[str, Any]],
+    duration_minutes: int,
+    segmented: Optional[bool] = None
+) -> str:
+    """Generate a podcast transcript using the AI model.
 
+    The model tier and output budget are picked by ``model_router``.
+    Episodes too long for one call's output limit are generated as
+    concurrent segments and stitched together in order.
+    """
     try:
-        # Generate the transcript - note that generate_content is not async
-        response = model.generate_content(
-            context,
-            generation_config={
-                "temperature": 0.7,
-                "top_p": 0.8,
-                "top_k": 40,
-                "max_output_tokens": 2048,
-            }
+        # Validate API access first so routing skips missing models
+        await model_registry.validate_async()
+        route = model_router.route(duration_minutes)
+        if segmented is None:
+            segmented = needs_segmentation(duration_minutes, route.tier.max_output_tokens)
+        model = await model_registry.get_model(route.model_name)
+        executor = model_router.bind(model_scheduler, route)
+        if segmented:
+            return await generate_segmented_transcript(
+                executor, model, topics, duration_minutes, route.generation_config,
+                cache=transcript_cache
+            )
+
+        context = build_transcript_prompt(topics, duration_minutes)
+        # generate_content is blocking, so it runs on the generation pool
+        return await generate_text(
+            executor, model, context, route.generation_config, cache=transcript_cache
         )
-        
-        if not response or not response.text:
-            raise ValueError("No response generated from the model")
-            
-        return response.text
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except GenerationQueueFullError as e:
+        logger.warning(f"Rejecting transcript generation: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Podcast generation is at capacity, please retry shortly"
+        )
+    except UpstreamUnavailableError as e:
+        logger.warning(f"Model unavailable: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating transcript: {str(e)}")
         raise HTTPException(
@@ -201,6 +484,201 @@ Remember:
             detail=f"Failed to generate podcast transcript: {str(e)}"
         )
 
+EPISODE_ID = re.compile(r"^[0-9a-f]{16}$")
+
+async def get_archived_episode(episode_id: str) -> Dict[str, Any]:
+    archive = getattr(app.state, "episode_archive", None)
+    if archive is None:
+        raise HTTPException(status_code=404, detail="The episode archive is disabled")
+    entry = await asyncio.to_thread(archive.get, episode_id) if EPISODE_ID.match(episode_id) else None
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Episode {episode_id} not found")
+    return entry
+
+@app.get("/episodes")
+async def list_episodes(limit: int = 20):
+    """The most recently archived episodes, newest first."""
+    archive = getattr(app.state, "episode_archive", None)
+    return {"episodes": await asyncio.to_thread(archive.recent, min(max(limit, 1), 100)) if archive else []}
+
+@app.get("/episodes/{episode_id}")
+async def get_episode(episode_id: str, request: Request):
+    """An archived ``PodcastResponse``, served straight from its compressed file.
+
+    Supports If-None-Match (ETags are content hashes), gzip or zstd
+    Content-Encoding per Accept-Encoding, and single byte ranges.
+    """
+    entry = await get_archived_episode(episode_id)
+    archive = app.state.episode_archive
+    tag = entry["sha256"][:32]
+    etags = [f'"{tag}"'] + [f'"{tag}-{encoding}"' for encoding in archive.encodings]
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), archive.encodings)
+    data = await asyncio.to_thread(archive.open, episode_id, encoding or "gzip")
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Episode {episode_id} not found")
+    if encoding is None:
+        # the client can't decode any stored encoding
+        with data:
+            data = await asyncio.to_thread(gzip.decompress, data)
+    return ranged_response(
+        request,
+        data,
+        media_type="application/json",
+        etag=f'"{tag}-{encoding}"' if encoding else f'"{tag}"',
+        variant_etags=etags,
+        encoding=encoding,
+        headers={
+            "Vary": "Accept-Encoding",
+            "Cache-Control": f"public, max-age={ARCHIVE_SETTINGS['cache_max_age_seconds']}, immutable"
+        }
+    )
+
+# Audio renders in progress, by episode id, so concurrent requests share one
+audio_renders: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+# Rendered audio is written to disk in blocks of about this many bytes
+AUDIO_WRITE_BLOCK = 1 << 20
+
+async def render_episode_audio(episode_id: str) -> Dict[str, Any]:
+    """Render the episode's WAV into the archive; returns its updated index entry."""
+    archive = app.state.episode_archive
+    episode = await asyncio.to_thread(archive.load, episode_id)
+    turns = parse_dialogue(episode["transcript"])
+    if not turns:
+        raise HTTPException(status_code=500, detail="The transcript has no speaker turns to render")
+
+    f = await asyncio.to_thread(archive.create_audio, episode_id)
+    try:
+        chunks = tts_pipeline.stream(turns)
+        # a streaming header, rewritten once the length is known
+        block = [await chunks.__anext__()]
+        buffered = pcm_size = 0
+        async for chunk in chunks:
+            block.append(chunk)
+            buffered += len(chunk)
+            pcm_size += len(chunk)
+            if buffered >= AUDIO_WRITE_BLOCK:
+                await asyncio.to_thread(f.writelines, block)
+                block, buffered = [], 0
+        await asyncio.to_thread(f.writelines, block)
+        header = wav_header(tts_pipeline.sample_rate, pcm_size)
+        return await asyncio.to_thread(archive.commit_audio, episode_id, f, header)
+    except BaseException:
+        await asyncio.shield(asyncio.to_thread(archive.discard, f))
+        raise
+
+def _forget_render(episode_id: str, task: "asyncio.Future[Dict[str, Any]]") -> None:
+    audio_renders.pop(episode_id, None)
+    if not task.cancelled():
+        task.exception()  # retrieved by the waiters, if any are left
+
+@app.get("/episodes/{episode_id}/audio")
+async def get_episode_audio(episode_id: str, request: Request):
+    """The episode as WAV, rendered once on first request and archived; supports byte ranges."""
+    entry = await get_archived_episode(episode_id)
+    archive = app.state.episode_archive
+    if entry["audio_sha256"] is None:
+        render = audio_renders.get(episode_id)
+        if render is None:
+            render = asyncio.ensure_future(render_episode_audio(episode_id))
+            audio_renders[episode_id] = render
+            render.add_done_callback(lambda task: _forget_render(episode_id, task))
+        # shielded: a client going away doesn't stop the render for the others
+        entry = await asyncio.shield(render)
+
+    path = archive.path(episode_id, "audio")
+    if not await asyncio.to_thread(os.path.exists, path):
+        raise HTTPException(status_code=404, detail=f"Audio for episode {episode_id} not found")
+    return file_response(
+        request,
+        path,
+        media_type="audio/wav",
+        etag=f'"{entry["audio_sha256"][:32]}"',
+        headers={"Cache-Control": f"public, max-age={ARCHIVE_SETTINGS['cache_max_age_seconds']}"}
+    )
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    if model_registry.ready:
+        status = "healthy"
+    else:
+        status = "degraded" if model_registry.error else "starting"
+    return {
+        "status": status,
+        "model": model_registry.status(),
+        "generation": {
+            "in_flight": generation_executor.in_flight,
+            "queued": generation_executor.queued,
+            "scheduler": model_scheduler.status(),
+            "routing": model_router.status()
+        },
+        "transcript_cache": transcript_cache.stats() if transcript_cache else None,
+        "shared_cache": shared_cache.stats() if shared_cache else None,
+        "audio": {
+            "engine": tts_pipeline.engine.name,
+            "cache_hits": audio_cache.hits if audio_cache else None,
+            "cache_misses": audio_cache.misses if audio_cache else None
+        },
+        "jobs": {
+            "workers": app.state.job_queue.workers,
+            "queued": app.state.job_queue.depth
+        }
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage latency histograms, LLM calls, caches and queues."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.on_event("startup")
+async def start_model_validation():
+    # Validate in the background so startup isn't held up by the network
+    async def validate():
+        try:
+            await model_registry.validate_async()
+        except Exception as e:
+            logger.warning(f"Model validation failed at startup: {str(e)}")
+
+    app.state.model_validation = asyncio.ensure_future(validate())
+
+@app.on_event("startup")
+async def start_job_queue():
+    database_dir = os.path.dirname(JOB_SETTINGS["database_path"])
+    if database_dir:
+        os.makedirs(database_dir, exist_ok=True)
+    app.state.job_queue = JobQueue(
+        JobStore(
+            JOB_SETTINGS["database_path"],
+            max_attempts=JOB_SETTINGS["max_attempts"],
+            retention_seconds=JOB_SETTINGS["retention_hours"] * 3600
+        ),
+        run_podcast_job,
+        workers=JOB_SETTINGS["workers"],
+        lease_seconds=JOB_SETTINGS["lease_seconds"],
+        poll_interval=JOB_SETTINGS["poll_interval_seconds"]
+    )
+    app.state.job_queue.start()
+
+@app.on_event("startup")
+async def open_episode_archive():
+    app.state.episode_archive = EpisodeArchive(
+        ARCHIVE_SETTINGS["directory"],
+        gzip_level=ARCHIVE_SETTINGS["gzip_level"],
+        zstd_level=ARCHIVE_SETTINGS["zstd_level"]
+    ) if ARCHIVE_SETTINGS["enabled"] else None
+
+@app.on_event("shutdown")
+async def release_resources():
+    await app.state.job_queue.stop()
+    app.state.job_queue.store.close()
+    if app.state.episode_archive:
+        app.state.episode_archive.close()
+    generation_executor.shutdown()
+    tts_pipeline.shutdown()
+    await news_aggregator.fetcher.aclose()
+    news_aggregator.extraction_pool.shutdown()
+    if news_aggregator.twitter_ingestor:
+        news_aggregator.twitter_ingestor.shutdown()
+    if shared_cache:
+        shared_cache.close() 
\ No newline at end of file
@@ -0,0 +1,181 @@
+import mmap
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+# Bodies larger than this are streamed from the map in chunks of STREAM_CHUNK
+STREAM_THRESHOLD = 1 << 20
+STREAM_CHUNK = 256 * 1024
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: List[str]) -> Optional[str]:
+    """The first of ``available`` (in server preference) the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def etag_matches(header: Optional[str], etags: Iterable[str]) -> bool:
+    """Weak comparison of an If-None-Match header against ``etags``."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return any(etag in wanted for etag in etags)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """The inclusive byte range a Range header asks for, or None for the whole body.
+
+    Only single ``bytes=`` ranges are honoured; malformed and multi-range
+    headers get the whole body, which the spec allows. Raises ValueError
+    when the range starts past the end of the body.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, dash, last = header[6:].strip().partition("-")
+    if not dash or (first and not first.isdigit()) or (last and not last.isdigit()) or not (first or last):
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        if int(last) == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _body(data: Union[bytes, mmap.mmap], start: int, end: int) -> Iterator[bytes]:
+    try:
+        for offset in range(start, end + 1, STREAM_CHUNK):
+            yield data[offset:min(offset + STREAM_CHUNK, end + 1)]
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def ranged_response(
+    request: Request,
+    data: Union[bytes, mmap.mmap],
+    media_type: str,
+    etag: str,
+    variant_etags: Iterable[str] = (),
+    encoding: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Serve ``data`` honouring If-None-Match, Range and If-Range.
+
+    ``data`` is the representation as sent, i.e. already encoded with
+    ``encoding``; ranges apply to those bytes. ``variant_etags`` are the
+    ETags of the same content in other encodings, which also count for
+    If-None-Match. A memory-mapped ``data`` is closed once it is sent.
+    """
+    headers = dict(headers or {})
+    headers.update({"ETag": etag, "Accept-Ranges": "bytes"})
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    size = len(data)
+
+    def finish() -> None:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    if etag_matches(request.headers.get("if-none-match"), [etag, *variant_etags]):
+        finish()
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            finish()
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1
+    if length > STREAM_THRESHOLD:
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(_body(data, start, end), status_code=status_code, media_type=media_type, headers=headers)
+    content = data[start:end + 1]
+    finish()
+    return Response(content=content, status_code=status_code, media_type=media_type, headers=headers)
+
+
+def _file_body(path: str, start: int, end: int) -> Iterator[bytes]:
+    # a plain iterator: Starlette runs it on a thread
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    etag: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Serve the file at ``path`` honouring If-None-Match, Range and If-Range.
+
+    The whole file goes out as a ``FileResponse`` (sendfile where the
+    server supports it); a range is read from disk in chunks, off the
+    event loop.
+    """
+    headers = dict(headers or {})
+    headers.update({"ETag": etag, "Accept-Ranges": "bytes"})
+    if etag_matches(request.headers.get("if-none-match"), [etag]):
+        return Response(status_code=304, headers=headers)
+
+    size = os.path.getsize(path)
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_file_body(path, start, end), status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,108 @@
+import re
+from typing import Dict, List, Optional, Sequence
+
+from ..presenters.personalities import ALEX, SARA, PresenterPersonality
+
+# Text the hosts shouldn't read out: [music], (laughs), *pauses*
+STAGE_DIRECTION = re.compile(r"\[[^\]]*\]|\([a-z]+(?: [a-z]+)?\)|(?<!\*)\*[^*\n]+\*(?!\*)")
+HEADING = re.compile(r"^\s*(#|\*\*[^*]+\*\*\s*$|-{3,}\s*$)")
+
+
+class Turn:
+    """One uninterrupted stretch of speech by one host."""
+
+    def __init__(self, index: int, speaker: PresenterPersonality, text: str):
+        self.index = index
+        self.speaker = speaker
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Turn({self.index}, {self.speaker.name!r}, {self.text[:40]!r})"
+
+
+def speaker_pattern(hosts: Sequence[PresenterPersonality]) -> "re.Pattern[str]":
+    """Matches a line opening with a host's full or first name and a colon.
+
+    Tolerates the markdown models like to add: ``**Alex Rivera:**``,
+    ``- ALEX:`` and the like.
+    """
+    names = sorted(
+        {host.name for host in hosts} | {host.name.split()[0] for host in hosts},
+        key=len, reverse=True
+    )
+    alternatives = "|".join(re.escape(name) for name in names)
+    return re.compile(
+        rf"^\s*(?:[-*>]\s+)?\**\s*({alternatives})\s*\**\s*:\s*\**\s*(.*)$",
+        re.IGNORECASE
+    )
+
+
+class DialogueParser:
+    """Splits transcript text into speaker turns as it arrives.
+
+    ``feed`` returns the turns completed by a chunk; a turn is complete
+    once the next speaker starts. ``close`` returns the last one. Lines
+    before the first speaker, headings and stage directions are dropped.
+    """
+
+    def __init__(self, hosts: Sequence[PresenterPersonality] = (ALEX, SARA)):
+        self._pattern = speaker_pattern(hosts)
+        self._by_name: Dict[str, PresenterPersonality] = {}
+        for host in hosts:
+            self._by_name[host.name.lower()] = host
+            self._by_name.setdefault(host.name.split()[0].lower(), host)
+        self._pending = ""
+        self._speaker: Optional[PresenterPersonality] = None
+        self._lines: List[str] = []
+        self._count = 0
+
+    def feed(self, chunk: str) -> List[Turn]:
+        turns: List[Turn] = []
+        data = self._pending + chunk
+        lines = data.split("\n")
+        # the last piece may be half a line; keep it for the next chunk
+        self._pending = lines.pop()
+        for line in lines:
+            turn = self._line(line)
+            if turn is not None:
+                turns.append(turn)
+        return turns
+
+    def close(self) -> List[Turn]:
+        turns = self.feed("\n")
+        turn = self._finish()
+        if turn is not None:
+            turns.append(turn)
+        return turns
+
+    def _line(self, line: str) -> Optional[Turn]:
+        match = self._pattern.match(line)
+        if match:
+            turn = self._finish()
+            self._speaker = self._by_name[match.group(1).lower()]
+            self._lines = [match.group(2)]
+            return turn
+        if self._speaker is not None and not HEADING.match(line):
+            self._lines.append(line)
+        return None
+
+    def _finish(self) -> Optional[Turn]:
+        if self._speaker is None:
+            return None
+        text = " ".join(STAGE_DIRECTION.sub(" ", " ".join(self._lines)).split())
+        self._lines = []
+        if not text:
+            return None
+        turn = Turn(self._count, self._speaker, text)
+        self._count += 1
+        return turn
+
+
+def parse_dialogue(
+    transcript: str,
+    hosts: Sequence[PresenterPersonality] = (ALEX, SARA)
+) -> List[Turn]:
+    """All speaker turns in ``transcript``, in order."""
+    parser = DialogueParser(hosts)
+    return parser.feed(transcript) + parser.close()
+
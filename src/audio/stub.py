@@ -0,0 +1,34 @@
+import time
+import zlib
+
+import numpy as np
+
+
+class StubTTSEngine:
+    """Offline stand-in for a TTS engine.
+
+    Renders a quiet tone per word, pitched by voice so the hosts are
+    distinguishable, lasting as long as the text would take to read at
+    ``words_per_minute``. ``seconds_per_word`` makes synthesis take time,
+    like a real engine, for benchmarks.
+    """
+
+    name = "stub"
+
+    def __init__(self, sample_rate: int = 22050, words_per_minute: int = 165, seconds_per_word: float = 0.0):
+        self.sample_rate = sample_rate
+        self.words_per_minute = words_per_minute
+        self.seconds_per_word = seconds_per_word
+        self.calls = 0
+
+    def synthesize(self, text: str, voice: str) -> bytes:
+        self.calls += 1
+        words = max(len(text.split()), 1)
+        if self.seconds_per_word:
+            time.sleep(words * self.seconds_per_word)
+        samples_per_word = int(self.sample_rate * 60 / self.words_per_minute)
+        pitch = 120 + zlib.crc32(voice.encode()) % 120
+        t = np.arange(samples_per_word) / self.sample_rate
+        # fade each word in and out so the words don't click
+        word = np.sin(2 * np.pi * pitch * t) * np.hanning(samples_per_word) * 3000
+        return np.tile(word, words).astype("<i2").tobytes()
@@ -0,0 +1,303 @@
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Union
+import logging
+
+import numpy as np
+
+from ..observability.metrics import TTS_SECONDS
+from .dialogue import Turn
+from .stub import StubTTSEngine
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_WIDTH = 2  # 16-bit mono PCM throughout
+
+
+def wav_header(sample_rate: int, data_size: Optional[int] = None) -> bytes:
+    """A 44-byte WAV header; with no ``data_size`` it is for a stream of unknown length."""
+    size = 0xFFFFFFFF - 36 if data_size is None else data_size
+    return (
+        b"RIFF" + struct.pack("<I", size + 36) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * SAMPLE_WIDTH, SAMPLE_WIDTH, 16)
+        + b"data" + struct.pack("<I", size)
+    )
+
+
+def wav_to_pcm(data: bytes, sample_rate: int) -> bytes:
+    """Mono 16-bit PCM at ``sample_rate`` from the WAV file in ``data``."""
+    with wave.open(io.BytesIO(data)) as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    if width != SAMPLE_WIDTH:
+        raise ValueError(f"Expected 16-bit audio, got {8 * width}-bit")
+    samples = np.frombuffer(frames, dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate and len(samples):
+        positions = np.arange(0, len(samples), rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.astype("<i2").tobytes()
+
+
+class EspeakEngine:
+    """Offline synthesis with the ``espeak-ng`` (or ``espeak``) command-line tool."""
+
+    name = "espeak"
+
+    def __init__(self, executable: str, sample_rate: int = 22050, words_per_minute: int = 165):
+        self.executable = executable
+        self.sample_rate = sample_rate
+        self.words_per_minute = words_per_minute
+
+    def synthesize(self, text: str, voice: str) -> bytes:
+        result = subprocess.run(
+            [self.executable, "-v", voice, "-s", str(self.words_per_minute), "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            check=True
+        )
+        return wav_to_pcm(result.stdout, self.sample_rate)
+
+
+def _espeak(sample_rate: int, words_per_minute: int) -> Optional[EspeakEngine]:
+    executable = shutil.which("espeak-ng") or shutil.which("espeak")
+    return EspeakEngine(executable, sample_rate, words_per_minute) if executable else None
+
+
+def _stub(sample_rate: int, words_per_minute: int) -> StubTTSEngine:
+    return StubTTSEngine(sample_rate, words_per_minute)
+
+
+# Engine factories by name; a factory returns None when its engine isn't installed
+ENGINES: Dict[str, Callable[[int, int], Any]] = {
+    "espeak": _espeak,
+    "stub": _stub,
+}
+
+
+def create_engine(name: str = "auto", sample_rate: int = 22050, words_per_minute: int = 165) -> Any:
+    """The TTS engine called ``name``; "auto" picks espeak when installed, else the stub."""
+    if name == "auto":
+        engine = _espeak(sample_rate, words_per_minute)
+        if engine is None:
+            logger.info("No local TTS engine found, rendering audio with the stub engine")
+        return engine or _stub(sample_rate, words_per_minute)
+    if name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine {name!r}; choose from {', '.join(ENGINES)} or auto")
+    engine = ENGINES[name](sample_rate, words_per_minute)
+    if engine is None:
+        raise ValueError(f"TTS engine {name!r} is not installed")
+    return engine
+
+
+class AudioCache:
+    """Rendered turns on disk, keyed by a hash of engine, voice and text.
+
+    Each turn is a raw PCM file written atomically; the oldest files are
+    removed once there are more than ``max_entries`` or they add up to more
+    than ``max_bytes``. The directory is scanned once, on the first write;
+    after that the file sizes are tracked as they are written and removed.
+    The methods are blocking; async code uses ``get_async``/``set_async``.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 4096, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # path -> size in bytes, oldest first; None until the first write
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(engine: str, voice: str, sample_rate: int, text: str) -> str:
+        payload = f"{engine}\0{voice}\0{sample_rate}\0{text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pcm")
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable audio cache entry {key}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return audio
+
+    async def get_async(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.get, key)
+
+    def set(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write audio cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            index = self._load_index()
+            self.size += len(audio) - index.pop(path, 0)
+            index[path] = len(audio)
+            while index and (
+                len(index) > self.max_entries or (self.max_bytes and self.size > self.max_bytes)
+            ):
+                self._evict_oldest(index)
+
+    async def set_async(self, key: str, audio: bytes) -> None:
+        await asyncio.to_thread(self.set, key, audio)
+
+    def _paths(self) -> Iterable[str]:
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".pcm"):
+                    yield os.path.join(root, name)
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            for path in self._paths():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+            self._index = OrderedDict((path, size) for _, path, size in sorted(entries))
+            self.size = sum(self._index.values())
+        return self._index
+
+    def _evict_oldest(self, index: "OrderedDict[str, int]") -> None:
+        path, size = index.popitem(last=False)
+        self.size -= size
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class TTSPipeline:
+    """Renders speaker turns concurrently and streams them back in order.
+
+    Up to ``workers`` turns are synthesised at once on a thread pool (the
+    engines shell out or sleep, so threads overlap well) and at most
+    ``lookahead`` finished turns are held while waiting for an earlier
+    one. Each turn is streamed as soon as it and every turn before it are
+    ready, so playback can start long before the last turn is rendered.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        voices: Dict[str, str],
+        workers: int = 4,
+        lookahead: int = 16,
+        pause_ms: int = 300,
+        cache: Optional[AudioCache] = None
+    ):
+        self.engine = engine
+        self.voices = voices
+        self.lookahead = lookahead
+        self.pause_ms = pause_ms
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+
+    @property
+    def sample_rate(self) -> int:
+        return self.engine.sample_rate
+
+    def voice(self, turn: Turn) -> str:
+        return self.voices.get(turn.speaker.name, "en")
+
+    async def render(self, turn: Turn) -> bytes:
+        """PCM audio for one turn, from the cache when it was rendered before."""
+        voice = self.voice(turn)
+        key = self.cache.key(self.engine.name, voice, self.sample_rate, turn.text) if self.cache else None
+        if self.cache:
+            audio = await self.cache.get_async(key)
+            if audio is not None:
+                return audio
+
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        audio = await loop.run_in_executor(self._pool, self.engine.synthesize, turn.text, voice)
+        TTS_SECONDS.labels(engine=self.engine.name).observe(time.perf_counter() - start)
+        if self.cache:
+            await self.cache.set_async(key, audio)
+        return audio
+
+    async def stream(self, turns: Union[Iterable[Turn], AsyncIterator[Turn]]) -> AsyncIterator[bytes]:
+        """A WAV stream of ``turns`` with a short pause between speakers.
+
+        ``turns`` may be an async iterator, e.g. fed by a ``DialogueParser``
+        while the transcript is still being generated.
+        """
+        pause = b"\0" * (self.sample_rate * self.pause_ms // 1000 * SAMPLE_WIDTH)
+        pending: "asyncio.Queue[Optional[asyncio.Future]]" = asyncio.Queue(maxsize=self.lookahead)
+
+        async def schedule() -> None:
+            try:
+                if hasattr(turns, "__aiter__"):
+                    async for turn in turns:
+                        await pending.put(asyncio.ensure_future(self.render(turn)))
+                else:
+                    for turn in turns:
+                        await pending.put(asyncio.ensure_future(self.render(turn)))
+            finally:
+                await pending.put(None)
+
+        scheduler = asyncio.ensure_future(schedule())
+        future: Optional[asyncio.Future] = None
+        try:
+            yield wav_header(self.sample_rate)
+            first = True
+            while True:
+                future = await pending.get()
+                if future is None:
+                    break
+                audio = await future
+                if not first:
+                    yield pause
+                first = False
+                yield audio
+            await scheduler
+        finally:
+            # the client went away or a turn failed: stop rendering the rest
+            scheduler.cancel()
+            if future is not None:
+                future.cancel()
+            while not pending.empty():
+                future = pending.get_nowait()
+                if future is not None:
+                    future.cancel()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -15,8 +15,34 @@ API_SETTINGS: Dict[str, Any] = {
 # News Aggregation Settings
 NEWS_SETTINGS: Dict[str, Any] = {
     "max_news_items": 10,
+    # Best-scoring items clustered into topics on each news refresh
+    "max_cluster_candidates": 100,
     "min_relevance_score": 0.3,
+    "scoring_weights": {
+        "engagement": 0.4,
+        "recency": 0.35,
+        "credibility": 0.25
+    },
+    "recency_half_life_hours": 24,
+    # Estimated Jaccard similarity above which two items are the same story
+    "dedup_threshold": 0.5,
+    # TF-IDF cosine similarity at which related items become one discussion topic
+    "topic_similarity_threshold": 0.3,
+    # Discussion topics kept, best first, after clustering the candidates
+    "max_topics": 10,
+    "topic_summary_max_chars": 600,
     "cache_duration_minutes": 30,
+    # Article bodies are only fetched when real news sources are configured
+    "fetch_article_content": os.getenv("FETCH_ARTICLE_CONTENT", "False").lower() == "true",
+    "article_fetch_top_n": 5,
+    "article_fetch_timeout_seconds": 10,
+    "article_fetch_max_connections": 20,
+    "article_fetch_per_host_limit": 4,
+    "article_fetch_max_bytes": 2_000_000,
+    # "auto" uses lxml when installed, else the stdlib parser; "soup" is the old BeautifulSoup path
+    "extraction_backend": "auto",
+    "extraction_max_chars": 20000,
+    "extraction_workers": 2,
     "sources": [
         "The New York Times",
         "The Wall Street Journal",
@@ -31,7 +57,9 @@ NEWS_SETTINGS: Dict[str, Any] = {
 
 # Twitter Settings
 TWITTER_SETTINGS: Dict[str, Any] = {
-    "max_tweets": 100,
+    "max_tweets": 100,  # per search term and poll
+    "max_pages": 3,
+    "max_concurrent_queries": 4,
     "min_engagement": 100,
     "search_terms": [
         "breaking news",
@@ -44,11 +72,55 @@ TWITTER_SETTINGS: Dict[str, Any] = {
 
 # AI Model Settings
 AI_SETTINGS: Dict[str, Any] = {
-    "model_name": "gemini-pro",
     "temperature": 0.7,
     "top_p": 0.8,
     "top_k": 40,
     "max_output_tokens": 2048,
+    "max_concurrent_generations": 4,
+    "generation_queue_size": 32,
+    "max_segment_output_tokens": 8192,
+    # Prompt budget: input tokens a prompt may use, within the model's context window
+    "context_window_tokens": 32768,
+    "max_prompt_tokens": 4096,
+    "min_topic_tokens": 24,
+    "model_validation_timeout_seconds": 10,
+    # Client-side quota and fault handling for model calls
+    "requests_per_minute": 60,
+    "tokens_per_minute": 1_000_000,
+    "max_quota_wait_seconds": 30,
+    "request_timeout_seconds": 120,
+    "max_retries": 3,
+    "retry_backoff_base_seconds": 1.0,
+    "retry_backoff_max_seconds": 30,
+    # Send a second, hedged call if the first hasn't answered by then (0 disables)
+    "hedge_after_seconds": 0,
+    "circuit_failure_threshold": 5,
+    "circuit_reset_seconds": 30,
+    # Model tiers requests are routed between; costs are USD per million tokens
+    "model_tiers": {
+        "fast": {
+            "model_name": "gemini-1.5-flash",
+            "input_cost_per_million": 0.075,
+            "output_cost_per_million": 0.30
+        },
+        "quality": {
+            "model_name": "gemini-1.5-pro",
+            "input_cost_per_million": 1.25,
+            "output_cost_per_million": 5.00
+        }
+    },
+    "default_tier": "quality",
+    # Short episodes (see PODCAST_SETTINGS) go to the fast tier
+    "fast_tier": "fast",
+    # While model calls wait longer than this for a slot, new requests use fallback_tier
+    "fallback_tier": "fast",
+    "queue_latency_slo_seconds": 5.0,
+    # max_output_tokens is sized to the episode, with this much headroom
+    "output_token_headroom": 1.25,
+    # ...but never below this
+    "min_output_tokens": 512,
+    # Serve transcripts from an offline stub model (for tests and benchmarks)
+    "use_stub_model": os.getenv("USE_STUB_MODEL", "False").lower() == "true",
     "safety_settings": {
         "harassment": "block_none",
         "hate_speech": "block_none",
@@ -57,11 +129,86 @@ AI_SETTINGS: Dict[str, Any] = {
     }
 }
 
+# Transcript Cache Settings
+TRANSCRIPT_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": os.getenv("TRANSCRIPT_CACHE_ENABLED", "True").lower() == "true",
+    "max_memory_entries": 256,
+    # Transcripts kept on disk, or in the shared cache when it is enabled
+    "max_disk_entries": 2048,
+    "max_age_hours": 24,
+    "directory": os.getenv("TRANSCRIPT_CACHE_DIR", ".cache/transcripts")
+}
+
+# Cache shared by all worker processes (news items and transcripts)
+SHARED_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": os.getenv("SHARED_CACHE_ENABLED", "True").lower() == "true",
+    "path": os.getenv("SHARED_CACHE_PATH", ".cache/shared.sqlite3"),
+    "max_entries": 10000,
+    # Expired entries are kept this long to serve while a refresh fails
+    "stale_hours": 24,
+    # Lease on a refresh lock, renewed every third of this while the refresh
+    # runs; a worker that dies mid-refresh holds the lock at most this long
+    "lock_timeout_seconds": 60,
+    "poll_interval_seconds": 0.1
+}
+
+# Audio Rendering Settings
+AUDIO_SETTINGS: Dict[str, Any] = {
+    # "auto" uses espeak-ng when installed, else the offline stub engine
+    "engine": os.getenv("TTS_ENGINE", "auto"),
+    "sample_rate": 22050,
+    "words_per_minute": 165,
+    "workers": 4,
+    # Rendered turns held back while an earlier turn is still rendering
+    "lookahead_turns": 16,
+    "pause_ms": 300,
+    # Engine voice for each presenter
+    "voices": {
+        "Alex Rivera": "en-us+m3",
+        "Sara Bennett": "en-us+f3"
+    },
+    "cache_enabled": os.getenv("AUDIO_CACHE_ENABLED", "True").lower() == "true",
+    "cache_directory": os.getenv("AUDIO_CACHE_DIR", ".cache/audio"),
+    "max_cache_entries": 4096,
+    "max_cache_bytes": 2 * 1024 ** 3
+}
+
+# Episode Archive Settings
+ARCHIVE_SETTINGS: Dict[str, Any] = {
+    "enabled": os.getenv("EPISODE_ARCHIVE_ENABLED", "True").lower() == "true",
+    "directory": os.getenv("EPISODE_ARCHIVE_DIR", ".cache/episodes"),
+    "gzip_level": 6,
+    # Used when the optional zstandard package is installed
+    "zstd_level": 10,
+    # Archived episodes never change, so clients may cache them this long
+    "cache_max_age_seconds": 86400
+}
+
+# Background Job Settings
+JOB_SETTINGS: Dict[str, Any] = {
+    "workers": 2,
+    "database_path": os.getenv("JOB_DATABASE_PATH", ".cache/jobs.sqlite3"),
+    # A job whose worker stops renewing its lease is run again by another worker
+    "lease_seconds": 60,
+    "poll_interval_seconds": 5,
+    # A job whose worker died this many times is failed instead of run again
+    "max_attempts": 3,
+    # Finished jobs (and their idempotency keys) are deleted after this long
+    "retention_hours": 168
+}
+
 # Podcast Settings
 PODCAST_SETTINGS: Dict[str, Any] = {
     "default_duration_minutes": 15,
     "max_duration_minutes": 60,
     "min_duration_minutes": 5,
     "topics_per_episode": 3,
-    "max_topic_duration_minutes": 20
+    "max_topic_duration_minutes": 20,
+    # Used to size output budgets; longer episodes are generated in segments
+    "output_tokens_per_minute": 130,
+    # Episodes up to this long are generated by the fast model tier
+    "fast_path_max_duration_minutes": 10,
+    # /generate-podcast/batch: requests per batch, and transcripts generated at once
+    "max_batch_size": 20,
+    "batch_concurrency": 4
 } 
\ No newline at end of file
@@ -0,0 +1,297 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+import logging
+
+from ..config.settings import TRANSCRIPT_CACHE_SETTINGS
+from ..storage.shared_cache import SharedCache, shared_cache
+from .executor import GenerationExecutor
+from .router import RoutedExecutor
+from .scheduler import ModelScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """Content-addressed cache of generated text.
+
+    Entries are keyed on a hash of the model name, the fully rendered prompt
+    and the generation config, so identical requests map to the same entry.
+    Lookups go to an in-memory LRU first and then to JSON files on disk;
+    both tiers are bounded by entry count and by age. With a ``shared``
+    cache, that replaces the JSON files as the second tier (still holding
+    at most ``max_disk_entries`` transcripts), and ``get_or_generate``
+    makes sure only one worker process generates a given transcript.
+    Within a process, concurrent misses for a key always share one
+    ``generate`` call.
+    """
+
+    def __init__(
+        self,
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 2048,
+        max_age_seconds: float = 24 * 3600,
+        directory: Optional[str] = None,
+        shared: Optional[SharedCache] = None
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_age_seconds = max_age_seconds
+        self.directory = directory
+        self.shared = shared
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._disk_count: Optional[int] = None
+        self._pending: Dict[str, "asyncio.Future[str]"] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_name: str, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "config": generation_config or {}},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        text = self._get_memory(key)
+        if text is not None:
+            return text
+        return self._found(key, self._read(key))
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """``get``, reading the second tier on a thread."""
+        text = self._get_memory(key)
+        if text is not None:
+            return text
+        return self._found(key, await asyncio.to_thread(self._read, key))
+
+    def set(self, key: str, text: str) -> None:
+        entry = (time.time(), text)
+        self._remember(key, entry)
+        self._write(key, entry)
+
+    async def set_async(self, key: str, text: str) -> None:
+        """``set``, writing the second tier on a thread."""
+        entry = (time.time(), text)
+        self._remember(key, entry)
+        await asyncio.to_thread(self._write, key, entry)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, text = entry
+            if time.time() - created_at < self.max_age_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+            del self._memory[key]
+        return None
+
+    def _found(self, key: str, entry: Optional[Tuple[float, str]]) -> Optional[str]:
+        if entry is not None and time.time() - entry[0] < self.max_age_seconds:
+            self._remember(key, entry)
+            self.hits += 1
+            self.disk_hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def _read(self, key: str) -> Optional[Tuple[float, str]]:
+        return self._read_shared(key) if self.shared else self._read_disk(key)
+
+    def _write(self, key: str, entry: Tuple[float, str]) -> None:
+        if self.shared:
+            self.shared.set(self._shared_key(key), entry[1], self.max_age_seconds)
+            self.shared.trim(self._shared_key(""), self.max_disk_entries)
+        else:
+            self._write_disk(key, entry)
+
+    async def get_or_generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        """Return the text for ``key``, calling ``generate`` on a miss.
+
+        Concurrent misses for the same key in this process wait for one
+        ``generate`` call; with a shared cache, so do those in other workers.
+        """
+        while True:
+            cached = await self.get_async(key)
+            if cached is not None:
+                return cached
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # the caller generating it was cancelled; look again
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            text = await self._generate(key, generate)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; don't log it as unretrieved
+            raise
+        else:
+            future.set_result(text)
+            return text
+        finally:
+            del self._pending[key]
+
+    async def _generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        if not self.shared:
+            text = await generate()
+            await self.set_async(key, text)
+            return text
+
+        generated = False
+
+        async def refresh() -> str:
+            nonlocal generated
+            generated = True
+            return await generate()
+
+        entry = await self.shared.get_or_refresh(self._shared_key(key), refresh, self.max_age_seconds)
+        if generated:
+            await asyncio.to_thread(self.shared.trim, self._shared_key(""), self.max_disk_entries)
+        self._remember(key, (entry.created_at, entry.value))
+        return entry.value
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.shared:
+            self.shared.clear("transcript:")
+        if self.directory and os.path.isdir(self.directory):
+            for path in self._disk_paths():
+                os.remove(path)
+        self._disk_count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _shared_key(key: str) -> str:
+        return f"transcript:{key}"
+
+    def _read_shared(self, key: str) -> Optional[Tuple[float, str]]:
+        entry = self.shared.get(self._shared_key(key))
+        return (entry.created_at, entry.value) if entry is not None else None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _disk_paths(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, str]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            return data["created_at"], data["text"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable transcript cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, entry: Tuple[float, str]) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            existed = os.path.exists(path)
+            # write then rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"created_at": entry[0], "text": entry[1]}, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write transcript cache entry {key}: {e}")
+            return
+
+        if self._disk_count is None:
+            self._disk_count = sum(1 for _ in self._disk_paths())
+        elif not existed:
+            self._disk_count += 1
+        if self._disk_count > self.max_disk_entries:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Drop expired files, then the oldest until 10% below the limit."""
+        now = time.time()
+        paths = sorted(self._disk_paths(), key=os.path.getmtime)
+        target = int(self.max_disk_entries * 0.9)
+        remaining = len(paths)
+        for path in paths:
+            if remaining <= target and now - os.path.getmtime(path) < self.max_age_seconds:
+                break
+            try:
+                os.remove(path)
+                remaining -= 1
+            except OSError:
+                pass
+        self._disk_count = remaining
+
+
+async def generate_text(
+    executor: Union[GenerationExecutor, ModelScheduler, RoutedExecutor],
+    model: Any,
+    prompt: str,
+    generation_config: Dict[str, Any],
+    cache: Optional[TranscriptCache] = None
+) -> str:
+    """Generate text for ``prompt``, serving identical requests from ``cache``."""
+    async def generate() -> str:
+        response = await executor.generate(model, prompt, generation_config=generation_config)
+        if not response or not response.text:
+            raise ValueError("No response generated from the model")
+        return response.text
+
+    if cache is None:
+        return await generate()
+    key = cache.key(getattr(model, "model_name", ""), prompt, generation_config)
+    return await cache.get_or_generate(key, generate)
+
+
+transcript_cache = TranscriptCache(
+    max_memory_entries=TRANSCRIPT_CACHE_SETTINGS["max_memory_entries"],
+    max_disk_entries=TRANSCRIPT_CACHE_SETTINGS["max_disk_entries"],
+    max_age_seconds=TRANSCRIPT_CACHE_SETTINGS["max_age_hours"] * 3600,
+    directory=TRANSCRIPT_CACHE_SETTINGS["directory"],
+    shared=shared_cache
+)
@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional
+import logging
+
+from ..observability.metrics import (
+    LLM_CALL_SECONDS, LLM_CALLS, LLM_FIRST_TOKEN_SECONDS, LLM_QUEUE_SECONDS
+)
+
+# Weight of the newest wait in the moving average of queue waits
+QUEUE_WAIT_SMOOTHING = 0.2
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationQueueFullError(Exception):
+    """Raised when the generation queue is full and a request must be rejected."""
+
+
+class GenerationExecutor:
+    """Runs blocking model calls on a dedicated worker pool.
+
+    At most ``max_concurrent`` calls are in flight at once. Up to
+    ``max_queue_size`` further callers wait for a free slot; anything beyond
+    that is rejected with ``GenerationQueueFullError`` so the event loop never
+    blocks and load is shed instead of piling up.
+
+    ``queue_wait`` is a moving average of how long recent calls waited for
+    a slot, for routing decisions under load.
+
+    Timeouts only count time spent holding a slot, never time queued for
+    one. A call that times out keeps its slot until its worker thread
+    actually finishes, so the pool never runs more than ``max_concurrent``
+    calls.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue_size: int = 32):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queue_size = max_queue_size
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrent,
+            thread_name_prefix="generation"
+        )
+        self._in_flight = 0
+        self._queued = 0
+        self.queue_wait = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    async def _acquire(self, mode: str) -> None:
+        if self._semaphore.locked() and self._queued >= self.max_queue_size:
+            LLM_CALLS.labels(mode=mode, outcome="rejected").inc()
+            raise GenerationQueueFullError(
+                f"Generation queue is full ({self._queued} waiting, "
+                f"{self._in_flight} in flight)"
+            )
+
+        self._queued += 1
+        start = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+        wait = time.perf_counter() - start
+        LLM_QUEUE_SECONDS.observe(wait)
+        self.queue_wait += QUEUE_WAIT_SMOOTHING * (wait - self.queue_wait)
+        self._in_flight += 1
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._semaphore.release()
+
+    def _finished(self, worker: "asyncio.Future[Any]") -> None:
+        self._release()
+        if not worker.cancelled():
+            # retrieve it, so an abandoned call's error isn't logged as unhandled
+            worker.exception()
+
+    async def run(self, func: Any, *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run ``func(*args, **kwargs)`` in the worker pool once a slot is free.
+
+        Raises ``asyncio.TimeoutError`` if the call itself takes longer than
+        ``timeout`` seconds.
+        """
+        await self._acquire("blocking")
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        worker = loop.run_in_executor(self._pool, lambda: func(*args, **kwargs))
+        # the slot is held until the thread is done, even if nobody waits for it
+        worker.add_done_callback(self._finished)
+        outcome = "error"
+        try:
+            # shielded: timing out or being cancelled must not mark the worker done early
+            result = await asyncio.wait_for(asyncio.shield(worker), timeout)
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            LLM_CALL_SECONDS.labels(mode="blocking").observe(time.perf_counter() - start)
+            LLM_CALLS.labels(mode="blocking", outcome=outcome).inc()
+
+    async def generate(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Call ``model.generate_content`` without blocking the event loop."""
+        return await self.run(
+            model.generate_content,
+            prompt,
+            timeout=timeout,
+            generation_config=generation_config
+        )
+
+    async def stream(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        first_chunk_timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Yield text chunks from ``model.generate_content(..., stream=True)``.
+
+        The blocking iteration happens on a worker thread and chunks are handed
+        back to the event loop as they arrive. The slot is held until the
+        worker finishes, even if the consumer stops early. Raises
+        ``asyncio.TimeoutError`` if no chunk arrives within
+        ``first_chunk_timeout`` seconds of getting a slot.
+        """
+        await self._acquire("stream")
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        cancelled = threading.Event()
+
+        def put(item: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            except RuntimeError:
+                # The event loop has gone away; nobody is listening any more
+                cancelled.set()
+
+        def produce() -> None:
+            try:
+                response = model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True
+                )
+                for chunk in response:
+                    if cancelled.is_set():
+                        break
+                    put(chunk.text)
+            except Exception as e:
+                put(e)
+            finally:
+                put(finished)
+
+        start = time.perf_counter()
+        first_chunk = True
+        outcome = "error"
+        worker = loop.run_in_executor(self._pool, produce)
+        worker.add_done_callback(lambda _: self._release())
+        try:
+            while True:
+                if first_chunk and first_chunk_timeout:
+                    item = await asyncio.wait_for(chunks.get(), first_chunk_timeout)
+                else:
+                    item = await chunks.get()
+                if item is finished:
+                    outcome = "ok"
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if first_chunk:
+                    LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start)
+                    first_chunk = False
+                yield item
+        finally:
+            cancelled.set()
+            LLM_CALL_SECONDS.labels(mode="stream").observe(time.perf_counter() - start)
+            LLM_CALLS.labels(mode="stream", outcome=outcome).inc()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+from .stub import StubModel
+
+logger = logging.getLogger(__name__)
+
+
+class ModelUnavailableError(Exception):
+    """Raised when the Gemini API cannot be configured or a model is missing."""
+
+
+class ModelRegistry:
+    """Lazily configures Google's Generative AI and caches model handles.
+
+    Nothing touches the network (or even imports the SDK) until the first
+    model is requested or ``validate_async`` is called from a startup hook,
+    so importing the API module stays cheap. With ``use_stub`` set, every
+    model is a ``StubModel`` and the network is never used at all.
+
+    Validation only fails if none of ``required_models`` is available; the
+    missing ones are listed in ``missing_models`` and refused by
+    ``get_model``, so callers can fall back to the others.
+    """
+
+    def __init__(
+        self,
+        required_models: List[str],
+        api_key: Optional[str] = None,
+        validation_timeout: float = 10.0,
+        use_stub: bool = False
+    ):
+        self.required_models = required_models
+        self.api_key = api_key
+        self.validation_timeout = validation_timeout
+        self.use_stub = use_stub
+        self.available_models: List[str] = []
+        self.missing_models: List[str] = []
+        self.error: Optional[str] = None
+        self.validated_at: Optional[float] = None
+        self._genai: Any = None
+        self._models: Dict[str, Any] = {}
+        self._validation_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.validated_at is not None
+
+    def _configure(self) -> Any:
+        if self._genai is not None:
+            return self._genai
+
+        api_key = self.api_key or os.getenv("GOOGLE_API_KEY")
+        logger.debug("GOOGLE_API_KEY present: %s", "Yes" if api_key else "No")
+        if not api_key:
+            raise ModelUnavailableError(
+                "GOOGLE_API_KEY environment variable is not set. "
+                "Please create a .env file with your Google API key. "
+                "You can get one from https://makersuite.google.com/app/apikey"
+            )
+
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        return genai
+
+    def validate(self) -> List[str]:
+        """List available models and check the required ones are present."""
+        if self.use_stub:
+            self.available_models = [f"models/{name}" for name in self.required_models]
+            self.validated_at = time.time()
+            return self.available_models
+
+        try:
+            genai = self._configure()
+            available_models = [model.name for model in genai.list_models()]
+            logger.debug("Available models: %s", available_models)
+
+            missing = [
+                name for name in self.required_models
+                if f"models/{name}" not in available_models
+            ]
+            if len(missing) == len(self.required_models):
+                raise ModelUnavailableError(
+                    f"Models not available: {', '.join(missing)}. "
+                    "Please check your API key and access."
+                )
+            if missing:
+                logger.warning(f"Models not available, continuing without them: {', '.join(missing)}")
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Error configuring Google AI: {self.error}")
+            raise
+
+        self.available_models = available_models
+        self.missing_models = missing
+        self.error = None
+        self.validated_at = time.time()
+        logger.debug("Successfully configured Google AI")
+        return available_models
+
+    async def validate_async(self, timeout: Optional[float] = None) -> List[str]:
+        """Validate off the event loop, sharing one attempt between callers."""
+        if self.ready:
+            return self.available_models
+
+        if self._validation_task is None or self._validation_task.done():
+            self._validation_task = asyncio.ensure_future(asyncio.wait_for(
+                asyncio.to_thread(self.validate),
+                timeout or self.validation_timeout
+            ))
+        try:
+            return await asyncio.shield(self._validation_task)
+        except asyncio.TimeoutError:
+            self.error = "Timed out listing Gemini models"
+            raise ModelUnavailableError(self.error)
+
+    def is_available(self, name: str) -> bool:
+        """False once validation has shown ``name`` is missing."""
+        return name not in self.missing_models
+
+    async def get_model(self, name: str) -> Any:
+        """Return a cached ``GenerativeModel``, validating access on first use."""
+        if name not in self._models:
+            await self.validate_async()
+            if not self.is_available(name):
+                raise ModelUnavailableError(f"Model {name} is not available with this API key")
+            if self.use_stub:
+                self._models[name] = StubModel(name)
+            else:
+                self._models[name] = self._genai.GenerativeModel(name)
+        return self._models[name]
+
+    def register(self, name: str, model: Any) -> None:
+        """Serve ``model`` for ``name`` from now on (e.g. a configured stub)."""
+        self._models[name] = model
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "stub": self.use_stub,
+            "required_models": self.required_models,
+            "missing_models": self.missing_models,
+            "error": self.error
+        }
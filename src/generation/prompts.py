@@ -0,0 +1,284 @@
+from datetime import datetime
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from ..config.settings import AI_SETTINGS
+from ..presenters.personalities import ALEX, SARA, PresenterPersonality
+
+logger = logging.getLogger(__name__)
+
+# Gemini averages roughly four characters of English per token
+CHARS_PER_TOKEN = 4
+
+# Sections of the full-episode prompt, in order. ``{first}``/``{second}`` are
+# host fields filled in once per pair of hosts; ``$name`` fields are filled
+# in per request.
+EPISODE_SECTIONS: List[Tuple[str, str]] = [
+    ("header", """Generate a $duration_minutes-minute podcast discussion between two hosts: {first.name} and {second.name}.
+
+"""),
+    ("hosts", """The hosts:
+
+{hosts}
+
+"""),
+    ("intro", """The podcast should follow this structure:
+
+1. Introduction (2-3 minutes):
+   - Start with a warm greeting and mention today's date: $current_date
+   - Briefly mention that they'll be discussing significant political and economic news from the past week
+   - Introduce the special topic for this week's show
+   - Keep the introduction engaging and natural
+
+"""),
+    ("news", """2. News Summary Segment (8-10 minutes):
+   For each of these $topic_count topics (spend about 2 minutes per topic):
+$news_topics
+
+   For each topic, follow this pattern:
+   a) First presenter gives a non-partisan summary of the news
+   b) First presenter asks the other presenter for their perspective
+   c) Second presenter responds with their perspective, consistent with their political view
+   d) Second presenter asks a follow-up question
+   e) First presenter responds with their perspective
+   f) Brief back-and-forth discussion (30-45 seconds)
+   g) Smooth transition to next topic
+
+"""),
+    ("main_topic", """3. Main Topic Discussion (5-7 minutes):
+   Focus on a current issue where both conservatives and liberals agree America can do better.
+   Follow this structure:
+   a) First presenter introduces the topic and explains why it's important for America's future
+   b) First presenter asks the other presenter for their thoughts and ideas for improvement
+   c) Second presenter shares their perspective and specific suggestions
+   d) Back-and-forth discussion incorporating:
+      - Recent news relevant to the topic
+      - Data and statistics when available
+      - Specific examples of what's working or not working
+      - Concrete ideas for improvement
+   e) If the issue can be explained with data visualization:
+      - Describe what the graph/chart would show
+      - Explain the key trends and patterns
+      - Discuss what the data means for America's future
+      - Use the visualization to support specific improvement suggestions
+
+"""),
+    ("closing", """4. Closing Segment (3-4 minutes):
+   Each presenter finds common ground with the other's political goals:
+   a) {first.name} (liberal) should:
+      - Choose a current conservative policy goal or initiative
+      - Find genuine positive aspects in it
+      - Explain how it could work and be beneficial from a liberal perspective
+      - Suggest how it could be implemented in a way that aligns with liberal values
+
+   b) {second.name} (conservative) should:
+      - Choose a current liberal policy goal or initiative
+      - Find genuine positive aspects in it
+      - Explain how it could work and be beneficial from a conservative perspective
+      - Suggest how it could be implemented in a way that aligns with conservative values
+
+   c) End with a brief, positive reflection on finding common ground
+
+"""),
+    ("reminders", """Remember:
+- Keep the tone engaging, conversational, and fun
+- Both hosts should be polite and open-minded
+- Look for opportunities to find common ground
+- Show genuine curiosity about different perspectives
+- Use their favorite quotes when relevant
+- Reference their trusted sources when appropriate
+- Maintain a good pace - about 2 minutes per news topic
+- Ensure smooth transitions between topics
+- Focus on constructive solutions and improvements
+- Use data and examples to support points
+- Keep the discussion forward-looking and solution-oriented
+- In the closing segment, be genuine and specific about finding common ground
+- End on a positive, hopeful note about America's future
+"""),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for ``text``; no tokenizer round-trip."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Shorten ``text`` to about ``max_tokens``, keeping its leading sentences."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    limit = max_tokens * CHARS_PER_TOKEN - 1
+    cut = text.rfind(". ", 0, limit)
+    if cut >= limit // 2:
+        return text[:cut + 1]
+    words = text[:limit].rsplit(" ", 1)[0]
+    return words.rstrip(" ,;:") + "…"
+
+
+@lru_cache(maxsize=None)
+def presenter_profile(personality: PresenterPersonality) -> str:
+    """Compact description of a host, sent along with the episode prompt."""
+    return (
+        f"{personality.name} ({personality.political_lean}): {', '.join(personality.personality_traits)}\n"
+        f"Speaking style: {personality.speaking_style}\n"
+        f"Trusted sources: {', '.join(personality.trusted_sources)}\n"
+        f"Favorite quotes: {' | '.join(personality.favorite_quotes)}"
+    )
+
+
+@lru_cache(maxsize=None)
+def hosts_section(first: PresenterPersonality, second: PresenterPersonality) -> str:
+    return f"{presenter_profile(first)}\n\n{presenter_profile(second)}"
+
+
+class EpisodeTemplate:
+    """The full-episode prompt with the hosts already filled in.
+
+    Built once per pair of hosts (see ``episode_template``); rendering only
+    substitutes the per-request fields. Sections without per-request fields
+    have their token counts computed up front.
+    """
+
+    def __init__(self, first: PresenterPersonality, second: PresenterPersonality):
+        hosts = hosts_section(first, second)
+        self.sections: List[Tuple[str, Template]] = [
+            (name, Template(text.format(first=first, second=second, hosts=hosts)))
+            for name, text in EPISODE_SECTIONS
+        ]
+        self.static_tokens: Dict[str, int] = {
+            name: estimate_tokens(template.template)
+            for name, template in self.sections
+            if "$" not in template.template
+        }
+
+    def render(self, fields: Dict[str, Any]) -> List[Tuple[str, str]]:
+        return [(name, template.substitute(fields)) for name, template in self.sections]
+
+
+@lru_cache(maxsize=None)
+def episode_template(first: PresenterPersonality = ALEX, second: PresenterPersonality = SARA) -> EpisodeTemplate:
+    return EpisodeTemplate(first, second)
+
+
+class PromptBuild:
+    """A rendered prompt and where its tokens went."""
+
+    def __init__(self, text: str, sections: Dict[str, int], trimmed_topics: int = 0, dropped_topics: int = 0):
+        self.text = text
+        self.sections = sections
+        self.total_tokens = sum(sections.values())
+        self.trimmed_topics = trimmed_topics
+        self.dropped_topics = dropped_topics
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "sections": self.sections,
+            "trimmed_topics": self.trimmed_topics,
+            "dropped_topics": self.dropped_topics,
+        }
+
+
+class PromptBudget:
+    """Keeps a prompt within the model's input budget.
+
+    A prompt may use at most ``max_prompt_tokens``, and never so much that
+    the prompt plus ``max_output_tokens`` overflows ``context_window``.
+    Topics are what gets trimmed: each keeps its title and as much of its
+    summary as fits. If even that leaves a topic under ``min_topic_tokens``,
+    the lowest-ranked topics are dropped instead.
+    """
+
+    def __init__(
+        self,
+        context_window: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        max_prompt_tokens: Optional[int] = None,
+        min_topic_tokens: Optional[int] = None
+    ):
+        self.context_window = context_window or AI_SETTINGS["context_window_tokens"]
+        self.max_output_tokens = max_output_tokens or AI_SETTINGS["max_output_tokens"]
+        self.max_prompt_tokens = max_prompt_tokens or AI_SETTINGS["max_prompt_tokens"]
+        self.min_topic_tokens = min_topic_tokens or AI_SETTINGS["min_topic_tokens"]
+
+    @property
+    def available(self) -> int:
+        return max(min(self.max_prompt_tokens, self.context_window - self.max_output_tokens), 0)
+
+    def fit_topics(
+        self,
+        topics: List[Dict[str, Any]],
+        max_tokens: int,
+        prefix: str = ""
+    ) -> Tuple[List[str], int, int]:
+        """Render one line per topic within ``max_tokens`` in total.
+
+        Returns ``(lines, trimmed, dropped)``. ``topics`` must be best first.
+        """
+        heads = [f"{prefix}- {topic['title']}" for topic in topics]
+        summaries = [topic.get('summary') or "" for topic in topics]
+        costs = [estimate_tokens(f"{head}: {summary}\n") for head, summary in zip(heads, summaries)]
+        if sum(costs) <= max_tokens:
+            return [f"{head}: {summary}" for head, summary in zip(heads, summaries)], 0, 0
+
+        keep = len(topics)
+        while keep > 1 and max_tokens // keep < self.min_topic_tokens:
+            keep -= 1
+
+        # water-filling: short topics keep their full text and leave the
+        # rest of the budget to the long ones
+        allowances = [0] * keep
+        remaining = max_tokens
+        order = sorted(range(keep), key=costs.__getitem__)
+        for position, i in enumerate(order):
+            allowances[i] = min(costs[i], remaining // (keep - position))
+            remaining -= allowances[i]
+
+        lines, trimmed = [], 0
+        for i in range(keep):
+            if allowances[i] >= costs[i]:
+                lines.append(f"{heads[i]}: {summaries[i]}")
+                continue
+            trimmed += 1
+            summary = trim_to_tokens(summaries[i], allowances[i] - estimate_tokens(heads[i] + ": \n"))
+            lines.append(f"{heads[i]}: {summary}" if summary else heads[i])
+        return lines, trimmed, len(topics) - keep
+
+
+def build_episode_prompt(
+    topics: List[Dict[str, Any]],
+    duration_minutes: int,
+    budget: Optional[PromptBudget] = None,
+    current_date: Optional[str] = None
+) -> PromptBuild:
+    """Render the full-episode prompt for up to four topics, within ``budget``."""
+    budget = budget or PromptBudget()
+    template = episode_template()
+    fields = {
+        "duration_minutes": duration_minutes,
+        "current_date": current_date or datetime.now().strftime("%B %d, %Y"),
+        "topic_count": 0,
+        "news_topics": "",
+    }
+
+    # size everything but the topics, then give the topics what is left
+    news_topics = topics[:4]
+    fields["topic_count"] = len(news_topics)
+    fixed = sum(estimate_tokens(text) for _, text in template.render(fields))
+    lines, trimmed, dropped = budget.fit_topics(news_topics, budget.available - fixed, prefix="   ")
+    fields["topic_count"] = len(lines)
+    fields["news_topics"] = "\n".join(lines)
+
+    rendered = template.render(fields)
+    sections = {
+        name: template.static_tokens.get(name) or estimate_tokens(text)
+        for name, text in rendered
+    }
+    build = PromptBuild("".join(text for _, text in rendered), sections, trimmed, dropped)
+    if build.total_tokens > budget.available:
+        logger.warning(f"Episode prompt is {build.total_tokens} tokens, over the {budget.available}-token budget")
+    return build
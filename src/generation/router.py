@@ -0,0 +1,268 @@
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+import logging
+
+from ..observability.metrics import LLM_ROUTE_COST, LLM_ROUTE_SECONDS, LLM_ROUTE_TOKENS, LLM_ROUTES
+from .executor import GenerationExecutor
+from .models import ModelUnavailableError
+from .prompts import estimate_tokens
+from .scheduler import ModelScheduler
+
+logger = logging.getLogger(__name__)
+
+# Latencies kept per tier for the percentiles in ``status``
+LATENCY_WINDOW = 200
+
+
+class ModelTier:
+    """One model requests can be routed to, with its price per million tokens."""
+
+    def __init__(
+        self,
+        name: str,
+        model_name: str,
+        max_output_tokens: int = 2048,
+        input_cost_per_million: float = 0.0,
+        output_cost_per_million: float = 0.0
+    ):
+        self.name = name
+        self.model_name = model_name
+        self.max_output_tokens = max_output_tokens
+        self.input_cost_per_million = input_cost_per_million
+        self.output_cost_per_million = output_cost_per_million
+
+    def cost(self, prompt_tokens: int, output_tokens: int) -> float:
+        return (
+            prompt_tokens * self.input_cost_per_million
+            + output_tokens * self.output_cost_per_million
+        ) / 1_000_000
+
+
+class Route:
+    """The tier and generation config chosen for one request, and why."""
+
+    def __init__(self, tier: ModelTier, generation_config: Dict[str, Any], reason: str):
+        self.tier = tier
+        self.generation_config = generation_config
+        self.reason = reason
+
+    @property
+    def model_name(self) -> str:
+        return self.tier.model_name
+
+    def __repr__(self) -> str:
+        return f"Route({self.tier.name!r}, {self.reason!r}, max_output_tokens={self.generation_config.get('max_output_tokens')})"
+
+
+class TierStats:
+    """Calls, latency, tokens and estimated spend for one tier."""
+
+    def __init__(self):
+        self.requests = 0
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost, 6)
+        }
+
+
+class RoutedExecutor:
+    """The scheduler's ``generate``/``stream`` interface, recording every call against a route."""
+
+    def __init__(self, scheduler: ModelScheduler, router: "ModelRouter", route: Route):
+        self.scheduler = scheduler
+        self.router = router
+        self.route = route
+
+    async def generate(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            response = await self.scheduler.generate(model, prompt, generation_config)
+        except Exception:
+            self.router.record(self.route, prompt, "", time.perf_counter() - start, ok=False)
+            raise
+        self.router.record(self.route, prompt, getattr(response, "text", "") or "", time.perf_counter() - start)
+        return response
+
+    async def stream(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        received: List[str] = []
+        ok = False
+        try:
+            async for chunk in self.scheduler.stream(model, prompt, generation_config):
+                received.append(chunk)
+                yield chunk
+            ok = True
+        finally:
+            self.router.record(self.route, prompt, "".join(received), time.perf_counter() - start, ok=ok)
+
+
+class ModelRouter:
+    """Picks a model tier and output budget for each request.
+
+    Episodes up to ``fast_path_max_minutes`` go to ``fast_tier``, longer
+    ones to ``default_tier``. ``max_output_tokens`` is sized to the episode
+    (with ``headroom``) rather than always asking for the tier's maximum,
+    which keeps quota reservations honest. Durations are clamped to
+    ``min_minutes``/``max_minutes`` first and the budget never drops below
+    ``min_output_tokens``. While every generation slot is
+    busy and calls have recently waited longer than ``queue_latency_slo``
+    for one, requests go to ``fallback_tier`` instead: its shorter calls
+    free slots sooner and drain the queue.
+
+    A tier whose model ``available`` reports missing is skipped: its
+    requests go to the fallback, default or any other usable tier.
+
+    Each model call made through ``bind`` is recorded per tier (latency,
+    estimated tokens and cost) in Prometheus and in ``status`` so the
+    thresholds can be tuned.
+    """
+
+    def __init__(
+        self,
+        tiers: Dict[str, ModelTier],
+        load: GenerationExecutor,
+        base_config: Dict[str, Any],
+        default_tier: str,
+        fast_tier: Optional[str] = None,
+        fallback_tier: Optional[str] = None,
+        fast_path_max_minutes: float = 0,
+        queue_latency_slo: float = 0.0,
+        output_tokens_per_minute: int = 130,
+        headroom: float = 1.25,
+        min_minutes: float = 0,
+        max_minutes: Optional[float] = None,
+        min_output_tokens: int = 256,
+        available: Optional[Callable[[str], bool]] = None
+    ):
+        for name in (default_tier, fast_tier, fallback_tier):
+            if name is not None and name not in tiers:
+                raise ValueError(f"Unknown model tier {name!r}; choose from {', '.join(tiers)}")
+        self.tiers = tiers
+        self.load = load
+        self.base_config = base_config
+        self.default_tier = default_tier
+        self.fast_tier = fast_tier
+        self.fallback_tier = fallback_tier
+        self.fast_path_max_minutes = fast_path_max_minutes
+        self.queue_latency_slo = queue_latency_slo
+        self.output_tokens_per_minute = output_tokens_per_minute
+        self.headroom = headroom
+        self.min_minutes = min_minutes
+        self.max_minutes = max_minutes
+        self.min_output_tokens = min_output_tokens
+        self.available = available or (lambda model_name: True)
+        self.fallbacks = 0
+        self._stats = {name: TierStats() for name in tiers}
+
+    @property
+    def model_names(self) -> List[str]:
+        return sorted({tier.model_name for tier in self.tiers.values()})
+
+    def usable(self, name: str) -> bool:
+        return self.available(self.tiers[name].model_name)
+
+    def expected_queue_wait(self) -> float:
+        """How long a new call can expect to wait for a generation slot."""
+        if self.load.in_flight < self.load.max_concurrent:
+            return 0.0
+        return self.load.queue_wait
+
+    def route(self, duration_minutes: float) -> Route:
+        duration_minutes = max(duration_minutes, self.min_minutes)
+        if self.max_minutes is not None:
+            duration_minutes = min(duration_minutes, self.max_minutes)
+        if self.fast_tier and duration_minutes <= self.fast_path_max_minutes:
+            name, reason = self.fast_tier, "fast_path"
+        else:
+            name, reason = self.default_tier, "default"
+
+        if self.fallback_tier and name != self.fallback_tier and self.queue_latency_slo:
+            wait = self.expected_queue_wait()
+            if wait > self.queue_latency_slo:
+                logger.debug("Queue wait %.1fs is over the %.1fs SLO; routing to %s", wait, self.queue_latency_slo, self.fallback_tier)
+                name, reason = self.fallback_tier, "queue_slo"
+                self.fallbacks += 1
+
+        if not self.usable(name):
+            candidates = [self.fallback_tier, self.default_tier, *self.tiers]
+            usable = [candidate for candidate in candidates if candidate and self.usable(candidate)]
+            if not usable:
+                raise ModelUnavailableError("No model tier is available with this API key")
+            logger.debug("Tier %s is unavailable; routing to %s", name, usable[0])
+            name, reason = usable[0], "unavailable"
+
+        tier = self.tiers[name]
+        config = dict(self.base_config)
+        config["max_output_tokens"] = min(
+            max(int(duration_minutes * self.output_tokens_per_minute * self.headroom) + 64, self.min_output_tokens),
+            tier.max_output_tokens
+        )
+        self._stats[name].requests += 1
+        LLM_ROUTES.labels(tier=name, reason=reason).inc()
+        return Route(tier, config, reason)
+
+    def bind(self, scheduler: ModelScheduler, route: Route) -> RoutedExecutor:
+        """``scheduler`` with every call recorded against ``route``."""
+        return RoutedExecutor(scheduler, self, route)
+
+    def record(self, route: Route, prompt: str, output: str, seconds: float, ok: bool = True) -> None:
+        tier = route.tier
+        stats = self._stats[tier.name]
+        prompt_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(output) if output else 0
+        cost = tier.cost(prompt_tokens, output_tokens)
+
+        stats.calls += 1
+        if not ok:
+            stats.errors += 1
+        stats.latencies.append(seconds)
+        stats.prompt_tokens += prompt_tokens
+        stats.output_tokens += output_tokens
+        stats.cost += cost
+
+        LLM_ROUTE_SECONDS.labels(tier=tier.name).observe(seconds)
+        LLM_ROUTE_TOKENS.labels(tier=tier.name, kind="prompt").inc(prompt_tokens)
+        LLM_ROUTE_TOKENS.labels(tier=tier.name, kind="output").inc(output_tokens)
+        LLM_ROUTE_COST.labels(tier=tier.name).inc(cost)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "queue_wait_seconds": round(self.load.queue_wait, 3),
+            "queue_latency_slo_seconds": self.queue_latency_slo,
+            "fallbacks": self.fallbacks,
+            "tiers": {
+                name: {"model": self.tiers[name].model_name, "available": self.usable(name), **stats.report()}
+                for name, stats in self._stats.items()
+            }
+        }
@@ -0,0 +1,336 @@
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+import logging
+
+from ..observability.metrics import LLM_HEDGES, LLM_RETRIES
+from .executor import GenerationExecutor, GenerationQueueFullError
+from .prompts import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, quota and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "InternalServerError", "DeadlineExceeded", "GatewayTimeout"
+}
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when the model can't be called right now: quota, open circuit or exhausted retries."""
+
+
+def used_tokens(prompt: str, response: Any) -> int:
+    """Tokens a call used: as reported by the API, or else estimated."""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    if isinstance(total, int) and total > 0:
+        return total
+    return estimate_tokens(prompt) + estimate_tokens(getattr(response, "text", "") or "")
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate_per_minute``.
+
+    ``acquire`` waits for enough tokens, but raises rather than wait longer
+    than ``max_wait`` seconds. Unused tokens can be handed back with
+    ``refund``.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, max_wait: float = 30.0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.max_wait = max_wait
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        # the lock keeps waiters in arrival order
+        async with self._lock:
+            self._refill()
+            wait = (amount - self.tokens) / self.rate if self.tokens < amount else 0.0
+            if wait > self.max_wait:
+                raise UpstreamUnavailableError(f"Model quota exhausted; next slot in {wait:.0f}s")
+            if wait:
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive upstream failures.
+
+    Once open, calls are rejected for ``reset_timeout`` seconds. Then a
+    single trial call is let through (half-open): success closes the
+    circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    def allow(self) -> None:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise UpstreamUnavailableError("Model upstream is unhealthy; failing fast")
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._trial_running:
+                raise UpstreamUnavailableError("Model upstream is recovering; failing fast")
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_abandoned(self) -> None:
+        """The call was cancelled before it said anything about upstream health."""
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Opening model circuit after %d failures", self.failures)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class ModelScheduler:
+    """Quota-aware, fault-tolerant front end to a ``GenerationExecutor``.
+
+    Offers the executor's ``generate``/``stream`` interface. Every call:
+
+    - takes one request from the requests/min bucket and its estimated
+      prompt plus output tokens from the tokens/min bucket, waiting for
+      them when the quota is used up
+    - fails fast while the circuit breaker is open
+    - times out after ``timeout`` seconds holding a generation slot (time
+      queued for a slot doesn't count) and is retried with jittered
+      exponential backoff on retryable errors (429, 5xx, timeouts)
+    - with ``hedge_after`` set, starts a second identical call if the
+      first hasn't answered by then and keeps whichever finishes first
+
+    A stream is only retried if it fails before its first chunk. Once a
+    call ends, however it ends, the tokens it reserved but didn't use are
+    handed back; a failed call is charged for its prompt and whatever it
+    streamed.
+    """
+
+    def __init__(
+        self,
+        executor: GenerationExecutor,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 1_000_000,
+        timeout: float = 120.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        max_backoff: float = 30.0,
+        hedge_after: float = 0.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_quota_wait: float = 30.0
+    ):
+        self.executor = executor
+        self.requests = TokenBucket(requests_per_minute, max_wait=max_quota_wait)
+        self.tokens = TokenBucket(tokens_per_minute, max_wait=max_quota_wait)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    @property
+    def in_flight(self) -> int:
+        return self.executor.in_flight
+
+    @property
+    def queued(self) -> int:
+        return self.executor.queued
+
+    def backoff(self, attempt: int) -> float:
+        # "full jitter": anywhere up to the exponential ceiling
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * 2 ** attempt))
+
+    async def _admit(self, prompt: str, generation_config: Optional[Dict[str, Any]]) -> int:
+        self.breaker.allow()
+        cost = estimate_tokens(prompt) + (generation_config or {}).get("max_output_tokens", 0)
+        try:
+            await self.requests.acquire()
+            await self.tokens.acquire(cost)
+        except BaseException:
+            self.breaker.record_abandoned()
+            raise
+        return cost
+
+    def _settle(self, cost: int, used: int) -> None:
+        """Hand back the part of a call's token reservation it didn't use."""
+        self.tokens.refund(max(cost - used, 0))
+
+    async def _attempt(self, model: Any, prompt: str, generation_config: Optional[Dict[str, Any]]) -> Any:
+        cost = await self._admit(prompt, generation_config)
+        used = estimate_tokens(prompt)
+        try:
+            response = await self.executor.generate(model, prompt, generation_config, timeout=self.timeout)
+            used = used_tokens(prompt, response)
+        except GenerationQueueFullError:
+            # local backpressure, not an upstream fault; nothing was sent
+            used = 0
+            self.breaker.record_abandoned()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.record_abandoned()
+            raise
+        except Exception as e:
+            if is_retryable(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        finally:
+            self._settle(cost, used)
+        self.breaker.record_success()
+        return response
+
+    async def _hedged(self, model: Any, prompt: str, generation_config: Optional[Dict[str, Any]]) -> Any:
+        first = asyncio.ensure_future(self._attempt(model, prompt, generation_config))
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        if done:
+            return first.result()
+
+        second = asyncio.ensure_future(self._attempt(model, prompt, generation_config))
+        LLM_HEDGES.labels(outcome="sent").inc()
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            LLM_HEDGES.labels(outcome="won").inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Call ``model.generate_content`` under the quota, retry and circuit policies."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.hedge_after:
+                    return await self._hedged(model, prompt, generation_config)
+                return await self._attempt(model, prompt, generation_config)
+            except (GenerationQueueFullError, UpstreamUnavailableError):
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if attempt == self.max_retries:
+                    raise UpstreamUnavailableError(
+                        f"Model call failed after {attempt + 1} attempts: {e}"
+                    ) from e
+                delay = self.backoff(attempt)
+                LLM_RETRIES.inc()
+                logger.debug("Retryable model error (%s); retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+
+    async def stream(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream ``model.generate_content`` chunks, retrying failures before the first chunk."""
+        for attempt in range(self.max_retries + 1):
+            cost = await self._admit(prompt, generation_config)
+            chunks = self.executor.stream(model, prompt, generation_config, first_chunk_timeout=self.timeout)
+            started = False
+            sent = True
+            output = 0
+            try:
+                first = await chunks.__anext__()
+                started = True
+                self.breaker.record_success()
+                output += estimate_tokens(first)
+                yield first
+                async for chunk in chunks:
+                    output += estimate_tokens(chunk)
+                    yield chunk
+                return
+            except StopAsyncIteration:
+                self.breaker.record_success()
+                return
+            except (GenerationQueueFullError, asyncio.CancelledError) as e:
+                sent = not isinstance(e, GenerationQueueFullError)
+                if not started:
+                    self.breaker.record_abandoned()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    if not started:
+                        self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if started:
+                    raise
+                if attempt == self.max_retries:
+                    raise UpstreamUnavailableError(
+                        f"Model stream failed after {attempt + 1} attempts: {e}"
+                    ) from e
+                delay = self.backoff(attempt)
+                LLM_RETRIES.inc()
+                logger.debug("Retryable model error (%s); retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+            finally:
+                await chunks.aclose()
+                self._settle(cost, estimate_tokens(prompt) + output if sent else 0)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "request_tokens": round(self.requests.tokens, 1),
+            "model_tokens": round(self.tokens.tokens),
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
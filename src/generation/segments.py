@@ -0,0 +1,188 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+import logging
+
+from ..presenters.personalities import ALEX, SARA
+from ..config.settings import AI_SETTINGS, PODCAST_SETTINGS
+from .cache import TranscriptCache, generate_text
+from .executor import GenerationExecutor
+from .router import RoutedExecutor
+from .scheduler import ModelScheduler
+from ..observability.metrics import span
+from .prompts import PromptBudget, estimate_tokens, hosts_section, trim_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Share of the episode given to each part; news is split evenly across topics
+SEGMENT_SHARES = {
+    "intro": 0.15,
+    "news": 0.45,
+    "main_topic": 0.25,
+    "closing": 0.15,
+}
+
+NEWS_TOPIC_INSTRUCTIONS = """Follow this pattern:
+a) First presenter gives a non-partisan summary of the news
+b) First presenter asks the other presenter for their perspective
+c) Second presenter responds with their perspective, consistent with their political view
+d) Second presenter asks a follow-up question
+e) First presenter responds with their perspective
+f) Brief back-and-forth discussion"""
+
+SEGMENT_INSTRUCTIONS = {
+    "intro": """- Start with a warm greeting and mention today's date: {date}
+- Briefly mention that they'll be discussing significant political and economic news from the past week
+- Introduce the special topic for this week's show
+- Keep the introduction engaging and natural""",
+    "main_topic": """Focus on a current issue where both conservatives and liberals agree America can do better.
+a) First presenter introduces the topic and explains why it's important for America's future
+b) First presenter asks the other presenter for their thoughts and ideas for improvement
+c) Second presenter shares their perspective and specific suggestions
+d) Back-and-forth discussion incorporating recent news, data and statistics,
+   specific examples of what's working or not working, and concrete ideas for improvement
+e) If the issue can be explained with a data visualization, describe what it would show
+   and use it to support specific improvement suggestions""",
+    "closing": """Each presenter finds common ground with the other's political goals:
+a) {alex} (liberal) picks a current conservative policy goal, finds genuine positive aspects
+   in it and suggests how it could be implemented in a way that aligns with liberal values
+b) {sara} (conservative) picks a current liberal policy goal, finds genuine positive aspects
+   in it and suggests how it could be implemented in a way that aligns with conservative values
+c) End with a brief, positive reflection on finding common ground and America's future""",
+}
+
+
+def estimate_output_tokens(duration_minutes: float) -> int:
+    """Rough number of output tokens needed for ``duration_minutes`` of dialogue."""
+    return int(duration_minutes * PODCAST_SETTINGS["output_tokens_per_minute"])
+
+
+def needs_segmentation(duration_minutes: int, max_output_tokens: Optional[int] = None) -> bool:
+    """True if a single call can't produce an episode of this length."""
+    limit = max_output_tokens or AI_SETTINGS["max_output_tokens"]
+    return estimate_output_tokens(duration_minutes) > limit
+
+
+def plan_segments(topics: List[Dict[str, Any]], duration_minutes: int) -> List[Dict[str, Any]]:
+    """Split an episode into independently generated segments, in running order."""
+    news_topics = topics[:4]
+    plan = [{"name": "intro", "title": "Introduction", "minutes": duration_minutes * SEGMENT_SHARES["intro"]}]
+    news_minutes = duration_minutes * SEGMENT_SHARES["news"] / max(len(news_topics), 1)
+    for i, topic in enumerate(news_topics, 1):
+        plan.append({
+            "name": f"news_{i}",
+            "title": f"News: {topic['title']}",
+            "minutes": news_minutes,
+            "topic": topic,
+        })
+    plan.append({"name": "main_topic", "title": "Main Topic Discussion", "minutes": duration_minutes * SEGMENT_SHARES["main_topic"]})
+    plan.append({"name": "closing", "title": "Closing Segment", "minutes": duration_minutes * SEGMENT_SHARES["closing"]})
+    return plan
+
+
+def build_context_header(plan: List[Dict[str, Any]], duration_minutes: int, current_date: str) -> str:
+    """Shared header so separately generated segments hand off coherently."""
+    running_order = "\n".join(
+        f"{i}. {segment['title']} (~{segment['minutes']:.0f} min)"
+        for i, segment in enumerate(plan, 1)
+    )
+    return f"""You are writing one segment of a {duration_minutes}-minute podcast recorded on {current_date},
+hosted by {ALEX.name} ({ALEX.political_lean}) and {SARA.name} ({SARA.political_lean}).
+
+{hosts_section(ALEX, SARA)}
+
+The other segments are written separately and joined in this running order:
+{running_order}
+
+Both hosts are polite, open-minded and curious about each other's perspectives. Keep the tone
+engaging, conversational and fun, use their favorite quotes and trusted sources when relevant,
+and keep the discussion forward-looking and solution-oriented.
+Write only the dialogue for your segment, one line per turn in the form "Name: words"."""
+
+
+def build_segment_prompts(
+    topics: List[Dict[str, Any]],
+    duration_minutes: int,
+    budget: Optional[PromptBudget] = None
+) -> List[Tuple[Dict[str, Any], str]]:
+    """Return ``(segment, prompt)`` pairs for every segment of the episode.
+
+    A news story's summary is trimmed if the segment prompt would
+    otherwise exceed ``budget``.
+    """
+    budget = budget or PromptBudget(max_output_tokens=AI_SETTINGS["max_segment_output_tokens"])
+    current_date = datetime.now().strftime("%B %d, %Y")
+    plan = plan_segments(topics, duration_minutes)
+    header = build_context_header(plan, duration_minutes, current_date)
+
+    prompts = []
+    for i, segment in enumerate(plan):
+        if i == 0:
+            hand_off = f"Do not sign off; end by leading into \"{plan[i + 1]['title']}\"."
+        elif i == len(plan) - 1:
+            hand_off = "Do not greet the listeners again; pick up straight from the previous segment and sign off at the end."
+        else:
+            hand_off = (
+                f"Do not greet the listeners or sign off; pick up from \"{plan[i - 1]['title']}\" "
+                f"and end with a smooth transition into \"{plan[i + 1]['title']}\"."
+            )
+
+        def render(body: str) -> str:
+            return f"""{header}
+
+Your segment: {i + 1}. {segment['title']} (about {segment['minutes']:.0f} minutes)
+{body}
+
+{hand_off}
+"""
+
+        if "topic" in segment:
+            topic = segment["topic"]
+            # the story's summary gets whatever the rest of the prompt leaves
+            spare = budget.available - estimate_tokens(render(f"News story: {topic['title']}: \n{NEWS_TOPIC_INSTRUCTIONS}"))
+            summary = trim_to_tokens(topic['summary'], spare)
+            prompt = render(f"News story: {topic['title']}: {summary}\n{NEWS_TOPIC_INSTRUCTIONS}")
+        else:
+            prompt = render(SEGMENT_INSTRUCTIONS[segment["name"]].format(
+                date=current_date, alex=ALEX.name, sara=SARA.name
+            ))
+        prompts.append((segment, prompt))
+    return prompts
+
+
+async def generate_segmented_transcript(
+    executor: Union[GenerationExecutor, ModelScheduler, RoutedExecutor],
+    model: Any,
+    topics: List[Dict[str, Any]],
+    duration_minutes: int,
+    generation_config: Dict[str, Any],
+    cache: Optional[TranscriptCache] = None
+) -> str:
+    """Generate every segment concurrently and stitch them together in order."""
+    with span("prompt_build"):
+        prompts = build_segment_prompts(topics, duration_minutes)
+
+    async def generate_segment(segment: Dict[str, Any], prompt: str) -> str:
+        config = dict(generation_config)
+        config["max_output_tokens"] = min(
+            # headroom so a segment isn't cut off mid-sentence
+            int(estimate_output_tokens(segment["minutes"]) * 1.25) + 64,
+            AI_SETTINGS["max_segment_output_tokens"]
+        )
+        text = await generate_text(executor, model, prompt, config, cache=cache)
+        return text.strip()
+
+    logger.debug("Generating %d segments for a %d-minute episode", len(prompts), duration_minutes)
+    tasks = [
+        asyncio.ensure_future(generate_segment(segment, prompt)) for segment, prompt in prompts
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        errors = [task.exception() for task in tasks if task in done and task.exception() is not None]
+        if errors:
+            # the episode has failed; don't spend quota on the other segments
+            raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+    return "\n\n".join(task.result() for task in tasks)
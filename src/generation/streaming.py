@@ -0,0 +1,83 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+SEGMENT_NAMES = ["intro", "news", "main_topic", "closing"]
+
+# Appended to the prompt so segment boundaries can be spotted in the stream
+SEGMENT_MARKER_INSTRUCTIONS = f"""
+Formatting:
+- Start each of the four segments with a line of the form "## SEGMENT: <name>",
+  where <name> is one of: {', '.join(SEGMENT_NAMES)}
+"""
+
+SEGMENT_MARKER = re.compile(r"^\s*#*\s*SEGMENT:\s*([a-z_]+)\s*$", re.IGNORECASE)
+
+
+class SegmentMarkerParser:
+    """Splits streamed transcript text into text and segment-marker events.
+
+    Text is passed through as soon as it arrives, except for a partial line
+    that might still turn out to be a marker; that is held back until the
+    rest of the line (or the end of the stream) arrives.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._mid_line = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        text = ""
+        data, self._pending = self._pending + chunk, ""
+        while data:
+            newline = data.find("\n")
+            line = data if newline == -1 else data[:newline + 1]
+            data = data[len(line):]
+
+            if self._mid_line:
+                text += line
+            elif newline == -1 and _could_be_marker(line):
+                self._pending = line
+                break
+            else:
+                match = SEGMENT_MARKER.match(line)
+                if match:
+                    if text:
+                        events.append(_transcript_event(text))
+                        text = ""
+                    events.append({"event": "segment", "data": {"segment": match.group(1).lower()}})
+                else:
+                    text += line
+            self._mid_line = newline == -1
+
+        if text:
+            events.append(_transcript_event(text))
+        return events
+
+    def close(self) -> List[Dict[str, Any]]:
+        pending, self._pending = self._pending, ""
+        self._mid_line = False
+        if not pending:
+            return []
+        match = SEGMENT_MARKER.match(pending)
+        if match:
+            return [{"event": "segment", "data": {"segment": match.group(1).lower()}}]
+        return [_transcript_event(pending)]
+
+
+def _transcript_event(text: str) -> Dict[str, Any]:
+    return {"event": "transcript", "data": {"text": text}}
+
+
+def _could_be_marker(partial_line: str) -> bool:
+    stripped = partial_line.lstrip().lstrip("#").lstrip().upper()
+    return stripped.startswith("SEGMENT:") or "SEGMENT:".startswith(stripped)
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Event."""
+    message = f"event: {event}\n"
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json.dumps(data, default=str)}\n\n"
@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..presenters.personalities import ALEX, SARA
+from .prompts import CHARS_PER_TOKEN
+
+
+class StubChunk:
+    """Minimal stand-in for a Gemini response or streamed chunk."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Offline stand-in for ``genai.GenerativeModel``.
+
+    Produces a canned two-host transcript (with segment markers when the
+    prompt asks for them), sleeping ``first_token_latency`` before the first
+    chunk and ``chunk_delay`` between chunks so latency-sensitive code paths
+    can be exercised without the network.
+
+    ``output_tokens`` pads the transcript to about that many tokens (capped
+    by the call's ``max_output_tokens``), and ``tokens_per_second`` sets
+    ``chunk_delay`` from a decoding rate instead.
+    """
+
+    SEGMENTS = ["intro", "news", "main_topic", "closing"]
+
+    def __init__(
+        self,
+        model_name: str = "stub",
+        first_token_latency: float = 0.0,
+        chunk_delay: float = 0.0,
+        chunk_size: int = 64,
+        output_tokens: int = 0,
+        tokens_per_second: float = 0.0
+    ):
+        self.model_name = model_name
+        self.first_token_latency = first_token_latency
+        self.chunk_size = chunk_size
+        self.output_tokens = output_tokens
+        if tokens_per_second:
+            chunk_delay = chunk_size / CHARS_PER_TOKEN / tokens_per_second
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+
+    def render(self, prompt: str, max_output_tokens: Optional[int] = None) -> str:
+        target = self.output_tokens
+        if target and max_output_tokens:
+            target = min(target, max_output_tokens)
+        turns_per_segment = 1
+        if target:
+            # each exchange below is roughly 30 tokens
+            turns_per_segment = max(1, target // (30 * len(self.SEGMENTS)))
+
+        lines: List[str] = []
+        with_markers = "## SEGMENT:" in prompt
+        for segment in self.SEGMENTS:
+            if with_markers:
+                lines.append(f"## SEGMENT: {segment}")
+            for _ in range(turns_per_segment):
+                lines.append(f"{ALEX.name}: Here is what I think about the {segment} segment.")
+                lines.append(f"{SARA.name}: And here is where I see it a little differently.")
+            lines.append("")
+        return "\n".join(lines)
+
+    def generate_content(
+        self,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Any:
+        self.calls += 1
+        text = self.render(prompt, (generation_config or {}).get("max_output_tokens"))
+        if stream:
+            return self._stream(text)
+        time.sleep(self.first_token_latency + self.chunk_delay * (len(text) // self.chunk_size))
+        return StubChunk(text)
+
+    def _stream(self, text: str) -> Iterator[StubChunk]:
+        time.sleep(self.first_token_latency)
+        for start in range(0, len(text), self.chunk_size):
+            if start:
+                time.sleep(self.chunk_delay)
+            yield StubChunk(text[start:start + self.chunk_size])
+
+
+class StubAPIError(Exception):
+    """Stand-in for a Google API error; ``code`` is the HTTP status."""
+
+    def __init__(self, code: int, message: str = ""):
+        super().__init__(f"{code} {message}".strip())
+        self.code = code
+
+
+class FaultInjectingModel:
+    """Wraps a model and makes some of its calls fail or stall.
+
+    Each call independently raises ``StubAPIError(error_code)`` with
+    probability ``error_rate``, or first sleeps ``slow_delay`` seconds with
+    probability ``slow_rate``. ``fail_next(n)`` makes the next ``n`` calls
+    fail regardless. Seeded, so a run is reproducible.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        error_rate: float = 0.0,
+        error_code: int = 429,
+        slow_rate: float = 0.0,
+        slow_delay: float = 5.0,
+        seed: int = 0
+    ):
+        self.model = model
+        self.model_name = getattr(model, "model_name", "stub")
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.calls = 0
+        self.failures = 0
+        self._forced_failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fail_next(self, count: int = 1) -> None:
+        with self._lock:
+            self._forced_failures += count
+
+    def generate_content(self, prompt: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+            fail = self._forced_failures > 0 or roll < self.error_rate
+            if self._forced_failures:
+                self._forced_failures -= 1
+            if fail:
+                self.failures += 1
+            slow = not fail and self._random.random() < self.slow_rate
+        if fail:
+            raise StubAPIError(self.error_code, "Injected fault")
+        if slow:
+            time.sleep(self.slow_delay)
+        return self.model.generate_content(prompt, *args, **kwargs)
@@ -0,0 +1,221 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT UNIQUE,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+# Added after the first release; created on databases that predate them
+MIGRATIONS = {
+    "owner": "ALTER TABLE jobs ADD COLUMN owner TEXT",
+    "lease_until": "ALTER TABLE jobs ADD COLUMN lease_until REAL",
+}
+
+
+class IdempotencyKeyConflictError(Exception):
+    """Raised when an idempotency key is reused with a different request."""
+
+
+def request_fingerprint(request: Dict[str, Any]) -> str:
+    return json.dumps(request, sort_keys=True, default=str)
+
+
+class JobStore:
+    """SQLite-backed job records, so finished transcripts survive restarts.
+
+    The database may be shared by several worker processes. A worker
+    ``claim``s a job before running it, which atomically marks it running
+    under the worker's name with a lease; only queued jobs and running
+    jobs whose lease has expired (their worker died) can be claimed. A job
+    whose worker died ``max_attempts`` times is failed by ``sweep``
+    instead, which also deletes finished jobs older than
+    ``retention_seconds``.
+
+    The methods are blocking; ``JobQueue`` calls them on a thread.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, retention_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                self._db.execute(statement)
+
+    def _row_to_job(self, row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def create(self, request: Dict[str, Any], idempotency_key: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Create a queued job, or return the existing one for ``idempotency_key``.
+
+        Returns ``(job, created)``. A job that failed is queued again when
+        it is resubmitted with the same key. Raises
+        ``IdempotencyKeyConflictError`` if the key was used for a different
+        request.
+        """
+        now = time.time()
+        with self._lock:
+            if idempotency_key:
+                existing = self._by_key(idempotency_key)
+                if existing:
+                    return self._resubmit(existing, request, now)
+
+            job_id = uuid.uuid4().hex
+            try:
+                self._db.execute(
+                    "INSERT INTO jobs (id, idempotency_key, status, request, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, idempotency_key, QUEUED, json.dumps(request), now, now)
+                )
+            except sqlite3.IntegrityError:
+                # another process inserted the same key since we looked
+                existing = self._by_key(idempotency_key)
+                if existing is None:
+                    raise
+                return self._resubmit(existing, request, now)
+        return self.get(job_id), True
+
+    def _by_key(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        return self._row_to_job(self._db.execute(
+            "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone())
+
+    def _resubmit(self, existing: Dict[str, Any], request: Dict[str, Any], now: float) -> Tuple[Dict[str, Any], bool]:
+        if request_fingerprint(existing["request"]) != request_fingerprint(request):
+            raise IdempotencyKeyConflictError(
+                f"Idempotency key {existing['idempotency_key']!r} was already used for a different request"
+            )
+        if existing["status"] != FAILED:
+            return existing, False
+        requeued = self._db.execute(
+            "UPDATE jobs SET status = ?, error = NULL, attempts = 0, updated_at = ? WHERE id = ? AND status = ?",
+            (QUEUED, now, existing["id"], FAILED)
+        ).rowcount
+        if not requeued:
+            # another process requeued it first
+            return self._by_key(existing["idempotency_key"]), False
+        existing.update(status=QUEUED, error=None, attempts=0, updated_at=now)
+        return existing, True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row)
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Mark the job running under ``owner``; returns it, or None if it isn't claimable."""
+        now = time.time()
+        with self._lock:
+            claimed = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND COALESCE(lease_until, 0) < ? AND attempts < ?))",
+                (RUNNING, owner, now + lease_seconds, now, job_id, QUEUED, RUNNING, now, self.max_attempts)
+            ).rowcount
+        return self.get(job_id) if claimed else None
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend ``owner``'s lease; False if the job is no longer theirs."""
+        with self._lock:
+            return bool(self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, owner, RUNNING)
+            ).rowcount)
+
+    def release(self, job_id: str, owner: str) -> None:
+        """Put a job ``owner`` stopped working on back in the queue.
+
+        The attempt doesn't count towards ``max_attempts``.
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (QUEUED, time.time(), job_id, owner, RUNNING)
+            )
+
+    def mark_succeeded(self, job_id: str, owner: str, result: Dict[str, Any]) -> bool:
+        with self._lock:
+            return bool(self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id, owner, RUNNING)
+            ).rowcount)
+
+    def mark_failed(self, job_id: str, owner: str, error: str) -> bool:
+        with self._lock:
+            return bool(self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (FAILED, error, time.time(), job_id, owner, RUNNING)
+            ).rowcount)
+
+    def claimable(self) -> List[str]:
+        """Ids of queued jobs and of running jobs whose worker's lease has expired."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? "
+                "OR (status = ? AND COALESCE(lease_until, 0) < ? AND attempts < ?) ORDER BY created_at",
+                (QUEUED, RUNNING, time.time(), self.max_attempts)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def sweep(self) -> Tuple[int, int]:
+        """Fail jobs that ran out of attempts and delete expired finished jobs.
+
+        Returns ``(failed, deleted)``.
+        """
+        now = time.time()
+        with self._lock:
+            failed = self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE status = ? AND COALESCE(lease_until, 0) < ? AND attempts >= ?",
+                (FAILED, f"Gave up after {self.max_attempts} attempts", now, RUNNING, now, self.max_attempts)
+            ).rowcount
+            deleted = self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, now - self.retention_seconds)
+            ).rowcount
+        return failed, deleted
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
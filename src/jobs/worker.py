@@ -0,0 +1,126 @@
+import asyncio
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from .store import JobStore
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Runs podcast jobs on a fixed number of asyncio workers.
+
+    Job state lives in a ``JobStore``; the in-memory queue only holds ids.
+    Several processes can share one store: each job is claimed by exactly
+    one of them, which renews its lease every third of ``lease_seconds``
+    while the job runs. Every ``poll_interval`` seconds each queue picks
+    up queued jobs and jobs whose owner died (its lease ran out), and
+    sweeps the store. Store calls run on a thread so a busy database
+    doesn't stall the event loop.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        workers: int = 2,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 5.0
+    ):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.ensure_future(self._work(i)) for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.ensure_future(self._poll()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, request: Dict[str, Any], idempotency_key: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Queue a job; returns ``(job, created)``.
+
+        With an ``idempotency_key`` that was seen before, the existing job is
+        returned instead and nothing new is queued.
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        job, created = await asyncio.to_thread(self.store.create, request, idempotency_key)
+        if created:
+            self._enqueue(job["id"])
+        return job, created
+
+    def _enqueue(self, job_id: str) -> None:
+        if job_id not in self._pending:
+            self._pending.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                failed, deleted = await asyncio.to_thread(self.store.sweep)
+                if failed or deleted:
+                    logger.debug("Failed %d abandoned jobs, deleted %d old jobs", failed, deleted)
+                for job_id in await asyncio.to_thread(self.store.claimable):
+                    self._enqueue(job_id)
+            except Exception as e:
+                logger.warning(f"Could not poll for jobs: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _work(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._pending.discard(job_id)
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _renew(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await asyncio.to_thread(self.store.renew, job_id, self.owner, self.lease_seconds):
+                logger.warning(f"Lost the lease on job {job_id}")
+                return
+
+    async def _run(self, job_id: str) -> None:
+        # another process may have claimed (or finished) it already
+        job = await asyncio.to_thread(self.store.claim, job_id, self.owner, self.lease_seconds)
+        if job is None:
+            return
+        renewal = asyncio.ensure_future(self._renew(job_id))
+        try:
+            result = await self.handler(job["request"])
+        except asyncio.CancelledError:
+            # shutting down: hand the job back for another worker
+            await asyncio.shield(asyncio.to_thread(self.store.release, job_id, self.owner))
+            raise
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e)
+            logger.error(f"Job {job_id} failed: {detail}")
+            await asyncio.to_thread(self.store.mark_failed, job_id, self.owner, detail)
+        else:
+            if not await asyncio.to_thread(self.store.mark_succeeded, job_id, self.owner, result):
+                logger.warning(f"Job {job_id} finished after its lease was taken over")
+        finally:
+            renewal.cancel()
@@ -1,20 +1,53 @@
+import asyncio
 import os
 import json
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import tweepy
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import logging
 
+from .cache import NewsCache, news_cache
+from .clustering import build_topics
+from .dedup import deduplicate
+from .extraction import ExtractionPool
+from .fetcher import ArticleFetcher
+from .scoring import rank_news_items
+from .twitter import TwitterIngestor
+from ..config.settings import NEWS_SETTINGS, TWITTER_SETTINGS
+from ..observability.metrics import NEWS_FETCH_SECONDS, NEWS_ITEMS, span, timed
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
 class NewsAggregator:
-    def __init__(self):
-        self.twitter_client = self._setup_twitter_client()
+    def __init__(
+        self,
+        cache: Optional[NewsCache] = None,
+        fetcher: Optional[ArticleFetcher] = None,
+        twitter_client: Optional[Any] = None
+    ):
+        self.twitter_client = twitter_client or self._setup_twitter_client()
+        self.twitter_ingestor = TwitterIngestor(
+            self.twitter_client,
+            TWITTER_SETTINGS["search_terms"],
+            max_tweets_per_query=TWITTER_SETTINGS["max_tweets"],
+            max_pages=TWITTER_SETTINGS["max_pages"],
+            max_workers=TWITTER_SETTINGS["max_concurrent_queries"]
+        ) if self.twitter_client else None
+        self.cache = cache or news_cache
+        self.fetcher = fetcher or ArticleFetcher(
+            timeout=NEWS_SETTINGS["article_fetch_timeout_seconds"],
+            max_connections=NEWS_SETTINGS["article_fetch_max_connections"],
+            per_host_limit=NEWS_SETTINGS["article_fetch_per_host_limit"],
+            max_bytes=NEWS_SETTINGS["article_fetch_max_bytes"]
+        )
+        self.extraction_pool = ExtractionPool(
+            max_workers=NEWS_SETTINGS["extraction_workers"],
+            backend=NEWS_SETTINGS["extraction_backend"],
+            max_chars=NEWS_SETTINGS["extraction_max_chars"]
+        )
         
     def _setup_twitter_client(self) -> tweepy.Client:
         """Initialize Twitter API client."""
@@ -49,21 +82,44 @@ class NewsAggregator:
             logger.warning(f"Failed to initialize Twitter client: {e}")
             return None
 
+    async def get_news_digest(self) -> Dict[str, Any]:
+        """Return the top news ``items`` and discussion ``topics``, refreshing the shared cache when it expires."""
+        return await self.cache.get(self._build_digest)
+
     async def get_news_summaries(self) -> List[Dict[str, Any]]:
+        """Return the top ``max_news_items`` aggregated news items."""
+        return (await self.get_news_digest())["items"]
+
+    async def get_discussion_topics(self) -> List[Dict[str, Any]]:
+        """Return the discussion topics built from the latest news."""
+        return (await self.get_news_digest())["topics"]
+
+    async def _build_digest(self) -> Dict[str, Any]:
+        candidates = await self._aggregate_news()
+        with span("topics"):
+            topics = await self.generate_discussion_topics_async(candidates)
+        return {"items": candidates[:NEWS_SETTINGS["max_news_items"]], "topics": topics}
+
+    async def _aggregate_news(self) -> List[Dict[str, Any]]:
         """Fetch and aggregate news from various sources."""
         news_items = []
         
         # Fetch from news APIs
         try:
-            news_items.extend(await self._fetch_news_api())
+            with timed(NEWS_FETCH_SECONDS, source="news_api"):
+                api_news = await self._fetch_news_api()
+            NEWS_ITEMS.labels(source="news_api").inc(len(api_news))
+            news_items.extend(api_news)
         except Exception as e:
             logger.warning(f"Failed to fetch news from APIs: {e}")
         
         # Fetch from Twitter if client is available
         if self.twitter_client:
             try:
-                twitter_news = await self._fetch_twitter_news()
+                with timed(NEWS_FETCH_SECONDS, source="twitter"):
+                    twitter_news = await self._fetch_twitter_news()
                 if twitter_news:
+                    NEWS_ITEMS.labels(source="twitter").inc(len(twitter_news))
                     news_items.extend(twitter_news)
             except Exception as e:
                 logger.warning(f"Failed to fetch Twitter news: {e}")
@@ -73,10 +129,24 @@ class NewsAggregator:
             logger.info("No news items available, using sample news")
             news_items = self._get_sample_news()
         
-        # Sort by relevance and recency
-        news_items.sort(key=lambda x: (x.get('relevance_score', 0), x.get('published_at', datetime.min)), reverse=True)
-        
-        return news_items[:10]  # Return top 10 most relevant items
+        # Merge copies of the same story, then score the whole batch at once
+        # and keep the best candidates for clustering into topics. Both are
+        # CPU-bound, so they run off the event loop
+        with span("dedup"):
+            news_items = await asyncio.to_thread(deduplicate, news_items)
+        with span("scoring"):
+            news_items = await asyncio.to_thread(
+                rank_news_items, news_items, NEWS_SETTINGS["max_cluster_candidates"]
+            )
+        if not news_items:
+            logger.info("No news items passed the relevance threshold, using sample news")
+            news_items = self._get_sample_news()
+
+        if NEWS_SETTINGS["fetch_article_content"]:
+            with timed(NEWS_FETCH_SECONDS, source="articles"):
+                await self.enrich_articles(news_items, NEWS_SETTINGS["article_fetch_top_n"])
+
+        return news_items
 
     def _get_sample_news(self) -> List[Dict[str, Any]]:
         """Return sample news items when no real news is available."""
@@ -127,22 +197,18 @@ class NewsAggregator:
             return []
             
         try:
-            # Search for trending topics and news
-            tweets = self.twitter_client.search_recent_tweets(
-                query="news OR breaking OR update",
-                max_results=100,
-                tweet_fields=['created_at', 'public_metrics', 'context_annotations']
-            )
+            # One incremental query per configured search term
+            tweets = await self.twitter_ingestor.fetch()
             
             news_items = []
-            for tweet in tweets.data or []:
+            for tweet in tweets:
                 news_items.append({
                     'title': tweet.text[:100] + '...',
                     'summary': tweet.text,
                     'source': 'Twitter',
                     'url': f"https://twitter.com/user/status/{tweet.id}",
                     'published_at': tweet.created_at,
-                    'relevance_score': self._calculate_tweet_relevance(tweet)
+                    'public_metrics': tweet.public_metrics
                 })
             
             return news_items
@@ -150,47 +216,21 @@ class NewsAggregator:
             logger.warning(f"Error fetching Twitter news: {e}")
             return []
 
-    def _calculate_tweet_relevance(self, tweet: Any) -> float:
-        """Calculate relevance score for a tweet based on various factors."""
-        # Implement relevance scoring logic here
-        # Consider factors like:
-        # - Engagement metrics
-        # - Account credibility
-        # - Topic relevance
-        # - Time sensitivity
-        return 0.5  # Placeholder score
-
-    def _extract_article_content(self, url: str) -> str:
-        """Extract main content from a news article URL."""
-        try:
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer']):
-                element.decompose()
-            
-            # Extract main content (this would need to be customized per news source)
-            content = soup.find('article') or soup.find('main') or soup.find('body')
-            return content.get_text() if content else ""
-        except Exception as e:
-            logger.warning(f"Error extracting article content: {e}")
-            return ""
+    async def enrich_articles(self, news_items: List[Dict[str, Any]], limit: int) -> None:
+        """Fetch the top ``limit`` articles concurrently and attach their text as ``content``."""
+        items = [item for item in news_items[:limit] if item.get('url')]
+        pages = await self.fetcher.fetch_many(item['url'] for item in items)
+        items = [item for item in items if pages.get(item['url'])]
+        contents = await asyncio.gather(*(
+            self.extraction_pool.extract(pages[item['url']]) for item in items
+        ))
+        for item, content in zip(items, contents):
+            item['content'] = content
 
     def generate_discussion_topics(self, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate discussion topics from news items."""
-        topics = []
-        for item in news_items:
-            topics.append({
-                'title': item['title'],
-                'summary': item['summary'],
-                'source': item['source'],
-                'url': item['url'],
-                'discussion_points': [
-                    "What are the key implications of this news?",
-                    "How might this affect different stakeholders?",
-                    "What historical context is relevant here?",
-                    "What are potential future developments?"
-                ]
-            })
-        return topics 
\ No newline at end of file
+        """Generate discussion topics from news items, one per story."""
+        return build_topics(news_items)
+
+    async def generate_discussion_topics_async(self, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """``generate_discussion_topics`` on a thread; clustering is CPU-bound."""
+        return await asyncio.to_thread(self.generate_discussion_topics, news_items)
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+
+from ..config.settings import NEWS_SETTINGS
+from ..storage.shared_cache import SharedCache, SharedEntry, shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+class NewsCache:
+    """TTL cache for the aggregated news digest with single-flight refresh.
+
+    The digest is a dict (the ranked items and the topics built from them),
+    so topics are computed once per refresh rather than per request.
+
+    Only one refresh runs at a time. While it runs, callers get the stale
+    value if there is one (and ``serve_stale`` is on); otherwise they await
+    the refresh already in progress instead of starting their own.
+
+    With a ``shared`` cache, a digest built by any worker process is reused
+    by all of them, and only one worker refreshes it when it expires.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        serve_stale: bool = True,
+        shared: Optional[SharedCache] = None,
+        key: str = "news:digest"
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.serve_stale = serve_stale
+        self.shared = shared
+        self.key = key
+        self._digest: Optional[Dict[str, Any]] = None
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def is_fresh(self) -> bool:
+        return (
+            self._digest is not None
+            and time.monotonic() - self._fetched_at < self.ttl_seconds
+        )
+
+    async def get(
+        self,
+        refresh: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Return the cached digest, calling ``refresh`` at most once per expiry."""
+        if self.is_fresh():
+            self.hits += 1
+            return dict(self._digest)
+
+        # another worker may already have refreshed them
+        entry = await self.shared.get_async(self.key) if self.shared else None
+        if entry is not None:
+            self._adopt(entry)
+            self.hits += 1
+            self.shared_hits += 1
+            return dict(self._digest)
+
+        self.misses += 1
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh(refresh))
+
+        # a worker that just started can serve what the others fetched
+        if self._digest is None and self.serve_stale and self.shared:
+            entry = await self.shared.get_async(self.key, allow_stale=True)
+            if entry is not None:
+                self._adopt(entry)
+
+        if self._digest is not None and self.serve_stale:
+            return dict(self._digest)
+
+        # shield so a cancelled caller doesn't cancel the refresh for everyone
+        return dict(await asyncio.shield(self._refresh_task))
+
+    async def _refresh(
+        self,
+        refresh: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        try:
+            if self.shared:
+                entry = await self.shared.get_or_refresh(self.key, refresh, self.ttl_seconds)
+                self._adopt(entry)
+                return self._digest
+            digest = await refresh()
+        except Exception as e:
+            if self._digest is None and self.shared:
+                entry = await self.shared.get_async(self.key, allow_stale=True)
+                if entry is not None:
+                    self._adopt(entry)
+            if self._digest is None:
+                raise
+            logger.warning(f"News refresh failed, keeping the stale digest: {e}")
+            return self._digest
+        self._digest = digest
+        self._fetched_at = time.monotonic()
+        return digest
+
+    def _adopt(self, entry: SharedEntry) -> None:
+        self._digest = entry.value
+        # age the entry by when it was fetched, not when this worker read it
+        self._fetched_at = time.monotonic() - (time.time() - entry.created_at)
+
+    def invalidate(self) -> None:
+        self._digest = None
+        self._fetched_at = 0.0
+        if self.shared:
+            self.shared.delete(self.key)
+
+
+# Shared by every NewsAggregator in the process (and, through
+# ``shared_cache``, with the other worker processes)
+news_cache = NewsCache(ttl_seconds=NEWS_SETTINGS["cache_duration_minutes"] * 60, shared=shared_cache)
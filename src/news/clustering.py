@@ -0,0 +1,169 @@
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config.settings import NEWS_SETTINGS
+from .dedup import TOKEN
+
+STOPWORDS = frozenset("""
+a about after again against all also an and any are as at be because been before being between both
+but by can could did do does during each few for from further had has have he her here his how i if
+in into is it its just more most new no not now of on once only or other our out over own said same
+says she should so some such than that the their them then there these they this those through to
+too under until up very was we were what when where which while who why will with would you your
+""".split())
+
+# Terms in more than this share of items (and more than MIN_COMMON_ITEMS of
+# them) say nothing about which story an item is, yet make the similarity
+# matrix dense
+MAX_DOCUMENT_FREQUENCY = 0.2
+MIN_COMMON_ITEMS = 20
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+DISCUSSION_POINTS = [
+    "What are the key implications of this news?",
+    "How might this affect different stakeholders?",
+    "What historical context is relevant here?",
+    "What are potential future developments?"
+]
+
+
+def _sparse() -> Any:
+    # scipy.sparse takes ~0.3 s to import; pay for it on first use rather
+    # than in every worker's startup
+    from scipy import sparse
+    return sparse
+
+
+def terms(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS and len(token) > 1]
+
+
+def tfidf_matrix(texts: List[str]) -> Any:
+    """L2-normalised TF-IDF rows for ``texts`` as a CSR matrix.
+
+    Uses sublinear term frequency (``1 + log tf``) and smoothed IDF, so a
+    word repeated in one long summary doesn't dominate its row. Terms
+    common to most of a large batch are dropped.
+    """
+    sparse = _sparse()
+    tokenized = [terms(text) for text in texts]
+    vocabulary: Dict[str, int] = {}
+    cols = np.fromiter(
+        (vocabulary.setdefault(term, len(vocabulary)) for doc in tokenized for term in doc),
+        dtype=np.int64
+    )
+    n = len(texts)
+    rows = np.repeat(np.arange(n), [len(doc) for doc in tokenized])
+    counts = sparse.csr_matrix(
+        (np.ones(len(cols)), (rows, cols)),
+        shape=(n, max(len(vocabulary), 1))
+    )
+    counts.sum_duplicates()
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    idf[document_frequency > max(MAX_DOCUMENT_FREQUENCY * n, MIN_COMMON_ITEMS)] = 0.0
+    counts.data = (1 + np.log(counts.data)) * idf[counts.indices]
+    counts.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1 / norms) @ counts
+
+
+def cluster_items(items: List[Dict[str, Any]], threshold: float) -> List[List[int]]:
+    """Group related items; returns member indices per cluster, leader first.
+
+    ``items`` must be best first. Clustering is greedy: each item not yet
+    taken starts a cluster and pulls in every untaken item whose cosine
+    similarity to it is at least ``threshold``. Leaders are therefore the
+    best-ranked item of each story and clusters don't chain through loosely
+    related items. The pairwise similarities come from one sparse
+    matrix product.
+    """
+    if not items:
+        return []
+    matrix = tfidf_matrix([f"{item.get('title', '')} {item.get('summary', '')}" for item in items])
+    similarity = (matrix @ matrix.T).tocsr()
+
+    cluster_of = np.full(len(items), -1)
+    clusters: List[List[int]] = []
+    for leader in range(len(items)):
+        if cluster_of[leader] >= 0:
+            continue
+        start, end = similarity.indptr[leader], similarity.indptr[leader + 1]
+        neighbours = similarity.indices[start:end][similarity.data[start:end] >= threshold]
+        members = [leader] + sorted(
+            int(i) for i in neighbours[cluster_of[neighbours] < 0] if i != leader
+        )
+        cluster_of[members] = len(clusters)
+        clusters.append(members)
+    return clusters
+
+
+def merge_summaries(members: List[Dict[str, Any]], max_chars: int) -> str:
+    """The leader's summary followed by the other members' opening sentences."""
+    parts: List[str] = []
+    seen = set()
+    length = 0
+    for position, item in enumerate(members):
+        summary = (item.get('summary') or "").strip()
+        sentences = [summary] if position == 0 else SENTENCE_END.split(summary)[:1]
+        for sentence in sentences:
+            key = sentence.lower()
+            if not sentence or key in seen:
+                continue
+            if parts and length + len(sentence) + 1 > max_chars:
+                return " ".join(parts)
+            seen.add(key)
+            parts.append(sentence)
+            length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def build_topics(
+    items: List[Dict[str, Any]],
+    threshold: Optional[float] = None,
+    max_summary_chars: Optional[int] = None,
+    max_topics: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Story-level discussion topics from ranked news items, best first.
+
+    Every item is clustered, then the ``max_topics`` best stories are kept:
+    by their best item's score, and then by how many items cover them.
+    """
+    threshold = NEWS_SETTINGS["topic_similarity_threshold"] if threshold is None else threshold
+    max_summary_chars = max_summary_chars or NEWS_SETTINGS["topic_summary_max_chars"]
+    max_topics = NEWS_SETTINGS["max_topics"] if max_topics is None else max_topics
+
+    clusters = sorted(
+        cluster_items(items, threshold),
+        key=lambda cluster: (-items[cluster[0]].get('relevance_score', 0.0), -len(cluster))
+    )[:max_topics]
+    topics = []
+    for cluster in clusters:
+        members = [items[i] for i in cluster]
+        leader = members[0]
+        sources: List[Dict[str, Any]] = []
+        seen_urls = set()
+        for item in members:
+            for source in item.get('sources') or [{'source': item['source'], 'url': item['url']}]:
+                if source.get('url') not in seen_urls:
+                    seen_urls.add(source.get('url'))
+                    sources.append(source)
+        topics.append({
+            'title': leader['title'],
+            'summary': merge_summaries(members, max_summary_chars),
+            'source': leader['source'],
+            'sources': sources,
+            'url': leader['url'],
+            'relevance_score': leader.get('relevance_score'),
+            'items': [
+                {key: item.get(key) for key in ('title', 'summary', 'source', 'url', 'relevance_score')}
+                for item in members
+            ],
+            'discussion_points': list(DISCUSSION_POINTS)
+        })
+    return topics
@@ -0,0 +1,164 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from ..config.settings import NEWS_SETTINGS
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "smid", "cmpid",
+    "ocid", "igshid"
+}
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# Mersenne prime for the universal hash family (a * x + b) mod p; with
+# a < 2^31 and 32-bit x the product stays inside uint64
+_PRIME = (1 << 31) - 1
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalise a URL so trivially different links to one story compare equal."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host in ("x.com", "mobile.twitter.com"):
+        host = "twitter.com"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    if host == "twitter.com":
+        # /<anyone>/status/<id>?s=20 etc. all point at the same tweet
+        match = re.search(r"/status(?:es)?/(\d+)", path)
+        if match:
+            path, query = f"/i/status/{match.group(1)}", ""
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def shingle_hashes(text: str, size: int = 3) -> np.ndarray:
+    """32-bit hashes of the word ``size``-grams in ``text``."""
+    tokens = TOKEN.findall(text.lower())
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in set(grams)), dtype=np.uint64)
+
+
+class DedupIndex:
+    """Streaming near-duplicate index over news items.
+
+    Items are matched first on canonical URL, then on MinHash similarity of
+    their title and summary. Candidates come from an LSH index: the
+    signature is split into ``bands`` and only items sharing at least one
+    band bucket are compared, so an insert costs roughly the number of true
+    near-duplicates, not the size of the index. Duplicates are merged into
+    the first item of their group, which records every source it was seen in.
+    Items with no words to compare are only matched on URL.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        num_perm: int = 64,
+        bands: int = 16,
+        max_candidates: int = 64,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_candidates = max_candidates
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self.items: List[Dict[str, Any]] = []
+        self._signatures = np.empty((64, num_perm), dtype=np.uint64)
+        self._by_url: Dict[str, int] = {}
+        self._buckets: Dict[Any, List[int]] = defaultdict(list)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of ``text``; None if it has no words."""
+        hashes = shingle_hashes(text)
+        if not len(hashes):
+            return None
+        # (num_perm, n) table of permuted hashes, reduced to each row's min
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Any]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert ``item``; returns the group it now belongs to."""
+        url = canonicalize_url(item.get('url', ''))
+        if url and url in self._by_url:
+            return self._merge(self._by_url[url], item, url)
+
+        signature = self.signature(f"{item.get('title', '')} {item.get('summary', '')}")
+        # an empty signature would put every such item in one bucket
+        keys = self._band_keys(signature) if signature is not None else []
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ())[-self.max_candidates:])
+        if candidates:
+            candidates = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            similarity = (self._signatures[candidates] == signature).mean(axis=1)
+            best = int(np.argmax(similarity))
+            if similarity[best] >= self.threshold:
+                return self._merge(int(candidates[best]), item, url)
+
+        group = dict(item)
+        group['sources'] = [{'source': item.get('source'), 'url': item.get('url')}]
+        index = len(self.items)
+        self.items.append(group)
+        if index == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        if signature is not None:
+            self._signatures[index] = signature
+        if url:
+            self._by_url[url] = index
+        for key in keys:
+            self._buckets[key].append(index)
+        return group
+
+    def _merge(self, index: int, item: Dict[str, Any], url: str) -> Dict[str, Any]:
+        group = self.items[index]
+        group['sources'].append({'source': item.get('source'), 'url': item.get('url')})
+        if url:
+            self._by_url.setdefault(url, index)
+
+        # the story's reach is the combined reach of every copy. Metrics are
+        # only summed into groups that already have them: grafted onto an
+        # article they would put it under the tweets' engagement floor
+        metrics = item.get('public_metrics')
+        if metrics and group.get('public_metrics'):
+            merged = dict(group.get('public_metrics') or {})
+            for name, value in metrics.items():
+                merged[name] = merged.get(name, 0) + value
+            group['public_metrics'] = merged
+        if item.get('relevance_score', 0) > group.get('relevance_score', 0):
+            group['relevance_score'] = item['relevance_score']
+        return group
+
+
+def deduplicate(items: List[Dict[str, Any]], threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Collapse near-duplicate items, keeping first-seen order."""
+    index = DedupIndex(threshold=NEWS_SETTINGS["dedup_threshold"] if threshold is None else threshold)
+    for item in items:
+        index.add(item)
+    return index.items
@@ -0,0 +1,223 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; the stdlib parser is used instead
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+# Subtrees that never hold article text
+SKIP_TAGS = {
+    "script", "style", "nav", "footer", "header", "aside", "form",
+    "noscript", "svg", "iframe", "button", "template", "select"
+}
+
+# Elements whose text is scored as a separate block
+BLOCK_TAGS = {
+    "p", "div", "article", "section", "main", "li", "ul", "ol", "blockquote",
+    "pre", "td", "th", "table", "figcaption", "h1", "h2", "h3", "h4", "h5", "h6"
+}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "source", "track", "wbr"
+}
+
+FEED_CHUNK_CHARS = 32 * 1024
+
+
+class _DensityCollector:
+    """Collects text blocks and keeps the ones that look like article prose.
+
+    Works on a stream of start/end/data events, so it never builds a tree.
+    A block is kept if it is long enough and not mostly link text (menus,
+    related-story lists, tag clouds). Collection stops once ``max_chars``
+    of kept text has been seen.
+    """
+
+    def __init__(self, max_chars: int, min_block_chars: int = 40, max_link_density: float = 0.5):
+        self.max_chars = max_chars
+        self.min_block_chars = min_block_chars
+        self.max_link_density = max_link_density
+        self.blocks: List[str] = []
+        self.total_chars = 0
+        self.done = False
+        self._text: List[str] = []
+        self._link_chars = 0
+        self._link_depth = 0
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+
+    def start(self, tag: str, attrib: Any = None) -> None:
+        tag = tag.lower()
+        if tag in VOID_TAGS or self.done:
+            return
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        elif tag == "a":
+            self._link_depth += 1
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower()
+        if tag in VOID_TAGS or self.done:
+            return
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        elif tag == "a" and self._link_depth:
+            self._link_depth -= 1
+
+    def data(self, text: str) -> None:
+        if self._skip_tag or self.done:
+            return
+        self._text.append(text)
+        if self._link_depth:
+            self._link_chars += len(text)
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> str:
+        self._flush()
+        return "\n\n".join(self.blocks)[:self.max_chars]
+
+    def _flush(self) -> None:
+        if not self._text:
+            return
+        raw = "".join(self._text)
+        text = " ".join(raw.split())
+        link_density = self._link_chars / len(raw) if raw else 0.0
+        self._text = []
+        self._link_chars = 0
+        if len(text) >= self.min_block_chars and link_density <= self.max_link_density:
+            self.blocks.append(text)
+            self.total_chars += len(text)
+            if self.total_chars >= self.max_chars:
+                self.done = True
+
+
+class _StdlibEventParser(HTMLParser):
+    def __init__(self, collector: _DensityCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.collector.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.collector.data(data)
+
+
+def _feed(parser: Any, collector: _DensityCollector, html: str) -> None:
+    for start in range(0, len(html), FEED_CHUNK_CHARS):
+        parser.feed(html[start:start + FEED_CHUNK_CHARS])
+        if collector.done:
+            break
+
+
+def extract_with_soup(html: str, max_chars: int) -> str:
+    """Original extraction: a full BeautifulSoup tree and ``get_text()``."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(['script', 'style', 'nav', 'footer']):
+        element.decompose()
+    content = soup.find('article') or soup.find('main') or soup.find('body')
+    return content.get_text()[:max_chars] if content else ""
+
+
+def extract_with_stdlib(html: str, max_chars: int) -> str:
+    """Streaming extraction on the stdlib parser, stopping at ``max_chars``."""
+    collector = _DensityCollector(max_chars)
+    parser = _StdlibEventParser(collector)
+    _feed(parser, collector, html)
+    return collector.close()
+
+
+def extract_with_lxml(html: str, max_chars: int) -> str:
+    """Streaming extraction on lxml's C parser, stopping at ``max_chars``."""
+    collector = _DensityCollector(max_chars)
+    parser = etree.HTMLParser(target=collector, remove_comments=True)
+    _feed(parser, collector, html)
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass
+    # the parser's close() already flushed; calling again is harmless
+    return collector.close()
+
+
+BACKENDS: Dict[str, Callable[[str, int], str]] = {
+    "soup": extract_with_soup,
+    "stdlib": extract_with_stdlib,
+}
+if etree is not None:
+    BACKENDS["lxml"] = extract_with_lxml
+
+
+def resolve_backend(backend: str) -> str:
+    if backend == "auto":
+        return "lxml" if "lxml" in BACKENDS else "stdlib"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend {backend!r}; choose from {sorted(BACKENDS)}")
+    return backend
+
+
+def extract_text(html: str, backend: str = "auto", max_chars: int = 20000, max_html_chars: int = 2_000_000) -> str:
+    """Extract the main article text from ``html``.
+
+    ``max_html_chars`` bounds how much markup is parsed at all and
+    ``max_chars`` bounds the returned text; the streaming backends stop
+    parsing as soon as they have enough.
+    """
+    return BACKENDS[resolve_backend(backend)](html[:max_html_chars], max_chars)
+
+
+class ExtractionPool:
+    """Runs ``extract_text`` in worker processes, off the event loop and the GIL.
+
+    With ``max_workers`` set to 0, extraction runs on a thread instead.
+    """
+
+    def __init__(self, max_workers: int = 2, backend: str = "auto", max_chars: int = 20000):
+        self.max_workers = max_workers
+        self.backend = resolve_backend(backend)
+        self.max_chars = max_chars
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def extract(self, html: str) -> str:
+        try:
+            if not self.max_workers:
+                return await asyncio.to_thread(extract_text, html, self.backend, self.max_chars)
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, extract_text, html, self.backend, self.max_chars)
+        except Exception as e:
+            logger.warning(f"Error extracting article content: {e}")
+            return ""
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
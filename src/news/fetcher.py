@@ -0,0 +1,127 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when a response body exceeds the fetcher's size cap."""
+
+
+class ArticleFetcher:
+    """Async HTTP fetcher for article pages.
+
+    One pooled ``httpx.AsyncClient`` keeps connections alive across fetches.
+    Requests are limited globally and per host, every fetch has an overall
+    timeout, bodies are capped at ``max_bytes``, and pages seen before are
+    revalidated with ETag/Last-Modified so unchanged articles come back as a
+    304 instead of being downloaded again.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        per_host_limit: int = 4,
+        max_bytes: int = 2_000_000,
+        validator_cache_size: int = 512,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.max_bytes = max_bytes
+        self.validator_cache_size = validator_cache_size
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        # url -> (etag, last_modified, body)
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+        self.not_modified = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                follow_redirects=True,
+                headers={"User-Agent": "ai-podcast-system/1.0"},
+                transport=self._transport
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def fetch(self, url: str) -> str:
+        """Return the body of ``url`` as text."""
+        async with self._host_limit(url):
+            return await asyncio.wait_for(self._fetch(url), self.timeout)
+
+    async def _fetch(self, url: str) -> str:
+        headers = {}
+        cached = self._validators.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        async with self._get_client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                self.not_modified += 1
+                self._validators.move_to_end(url)
+                return cached[2]
+            response.raise_for_status()
+
+            declared = int(response.headers.get("Content-Length") or 0)
+            if declared > self.max_bytes:
+                raise ResponseTooLargeError(f"{url} is {declared} bytes (limit {self.max_bytes})")
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > self.max_bytes:
+                    raise ResponseTooLargeError(f"{url} exceeds {self.max_bytes} bytes")
+
+            text = body.decode(response.encoding or "utf-8", errors="replace")
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        if etag or last_modified:
+            self._validators[url] = (etag, last_modified, text)
+            self._validators.move_to_end(url)
+            while len(self._validators) > self.validator_cache_size:
+                self._validators.popitem(last=False)
+        return text
+
+    async def fetch_many(self, urls: Any) -> Dict[str, Optional[str]]:
+        """Fetch ``urls`` concurrently; failed fetches map to ``None``."""
+        urls = list(urls)
+
+        async def fetch_one(url: str) -> Optional[str]:
+            try:
+                return await self.fetch(url)
+            except Exception as e:
+                logger.warning(f"Error fetching {url}: {e}")
+                return None
+
+        bodies = await asyncio.gather(*(fetch_one(url) for url in urls))
+        return dict(zip(urls, bodies))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
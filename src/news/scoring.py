@@ -0,0 +1,152 @@
+import math
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..config.settings import NEWS_SETTINGS, TWITTER_SETTINGS
+from ..presenters.personalities import ALEX, SARA
+
+# Sources the presenters (or the configured news list) consider credible
+TRUSTED_SOURCES = frozenset(
+    source.lower()
+    for source in ALEX.trusted_sources + SARA.trusted_sources + NEWS_SETTINGS["sources"]
+)
+
+SOURCE_CREDIBILITY = {
+    "trusted": 1.0,
+    "social": 0.3,
+    "other": 0.5,
+}
+
+
+def _columns(items: List[Dict[str, Any]], trusted: frozenset, now: float) -> tuple:
+    """Pull the fields the scorer needs into flat lists in a single pass."""
+    nan = math.nan
+    engagement, prior, published, credibility, social_only = [], [], [], [], []
+    for item in items:
+        metrics = item.get('public_metrics')
+        if metrics:
+            engagement.append(
+                metrics.get("like_count", 0)
+                + 2 * metrics.get("retweet_count", 0)
+                + metrics.get("reply_count", 0)
+                + metrics.get("quote_count", 0)
+            )
+        else:
+            engagement.append(nan)
+        prior.append(item.get('relevance_score', 0.5))
+        published_at = item.get('published_at')
+        published.append(published_at.timestamp() if isinstance(published_at, datetime) else now)
+        # a merged group is as credible as its most credible copy
+        sources = [
+            str(copy.get('source', '')).lower()
+            for copy in item.get('sources') or [item]
+        ]
+        credibility.append(max(
+            SOURCE_CREDIBILITY["trusted"] if source in trusted
+            else SOURCE_CREDIBILITY["social"] if source == "twitter"
+            else SOURCE_CREDIBILITY["other"]
+            for source in sources
+        ))
+        social_only.append(all(source == "twitter" for source in sources))
+    return (
+        np.array(engagement, dtype=float),
+        np.array(prior, dtype=float),
+        np.array(published, dtype=float),
+        np.array(credibility, dtype=float),
+        np.array(social_only, dtype=bool),
+    )
+
+
+def score_items(
+    items: List[Dict[str, Any]],
+    now: Optional[float] = None,
+    trusted_sources: Iterable[str] = TRUSTED_SOURCES,
+    weights: Optional[Dict[str, float]] = None,
+    half_life_hours: Optional[float] = None,
+    min_engagement: Optional[int] = None
+) -> np.ndarray:
+    """Score a whole batch of news items at once; returns scores in ``[0, 1]``.
+
+    Fields are gathered in one pass; everything after that is array math.
+    The score is a weighted sum of three components:
+
+    - engagement: ``log1p`` of the tweet's weighted ``public_metrics``,
+      saturating at 100x ``min_engagement``. Items without metrics (articles)
+      use their existing ``relevance_score`` instead.
+    - recency: exponential decay of age with a ``half_life_hours`` half-life.
+    - credibility: 1.0 for trusted sources, 0.3 for social media, 0.5 otherwise.
+
+    Tweets below ``min_engagement`` score 0 so the relevance threshold drops them.
+    A merged group (see ``dedup``) containing a non-tweet copy is never
+    floored, and scores at least as well as that copy would on its own.
+    """
+    n = len(items)
+    if not n:
+        return np.zeros(0)
+
+    weights = weights or NEWS_SETTINGS["scoring_weights"]
+    half_life_hours = half_life_hours or NEWS_SETTINGS["recency_half_life_hours"]
+    min_engagement = TWITTER_SETTINGS["min_engagement"] if min_engagement is None else min_engagement
+    now = time.time() if now is None else now
+    trusted = frozenset(source.lower() for source in trusted_sources)
+
+    engagement, prior, published, credibility, social_only = _columns(items, trusted, now)
+
+    has_metrics = ~np.isnan(engagement)
+    ceiling = math.log1p(max(min_engagement, 1) * 100)
+    metric_score = np.clip(np.log1p(np.nan_to_num(engagement)) / ceiling, 0.0, 1.0)
+    prior_score = np.clip(prior, 0.0, 1.0)
+    engagement_score = np.where(
+        has_metrics,
+        np.where(social_only, metric_score, np.maximum(metric_score, prior_score)),
+        prior_score
+    )
+
+    age_hours = np.maximum(now - published, 0.0) / 3600.0
+    recency = np.exp2(-age_hours / half_life_hours)
+
+    scores = (
+        weights["engagement"] * engagement_score
+        + weights["recency"] * recency
+        + weights["credibility"] * credibility
+    ) / sum(weights.values())
+    scores[has_metrics & social_only & (np.nan_to_num(engagement) < min_engagement)] = 0.0
+    return scores
+
+
+def select_top_k(
+    items: List[Dict[str, Any]],
+    scores: np.ndarray,
+    k: int,
+    min_score: float = 0.0
+) -> List[Dict[str, Any]]:
+    """Return the ``k`` best items scoring at least ``min_score``, best first.
+
+    ``argpartition`` finds the top k in O(n) and only those k are sorted.
+    """
+    if k <= 0:
+        return []
+    candidates = np.flatnonzero(scores >= min_score)
+    if len(candidates) > k:
+        top = np.argpartition(scores[candidates], -k)[-k:]
+        candidates = candidates[top]
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [items[i] for i in order]
+
+
+def rank_news_items(
+    items: List[Dict[str, Any]],
+    k: Optional[int] = None,
+    min_score: Optional[float] = None,
+    now: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Score ``items``, store each score as ``relevance_score`` and keep the top ``k``."""
+    k = NEWS_SETTINGS["max_news_items"] if k is None else k
+    min_score = NEWS_SETTINGS["min_relevance_score"] if min_score is None else min_score
+    scores = score_items(items, now=now)
+    for item, score in zip(items, scores.tolist()):
+        item['relevance_score'] = score
+    return select_top_k(items, scores, k, min_score)
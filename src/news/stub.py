@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import requests
+import tweepy
+
+
+class StubTweet:
+    """Minimal stand-in for ``tweepy.Tweet``."""
+
+    def __init__(self, tweet_id: int, text: str, created_at: datetime, public_metrics: Dict[str, int]):
+        self.id = tweet_id
+        self.text = text
+        self.created_at = created_at
+        self.public_metrics = public_metrics
+        self.context_annotations: List[Any] = []
+
+
+class StubTwitterClient:
+    """Offline stand-in for ``tweepy.Client.search_recent_tweets``.
+
+    Every query gets its own deterministic timeline of ``tweets_per_query``
+    tweets, newest first, served with ``since_id`` filtering and
+    ``next_token`` pagination like the real API. ``post()`` adds new tweets.
+    Every ``rate_limit_every``-th call raises ``tweepy.TooManyRequests``
+    with an ``x-rate-limit-reset`` of ``rate_limit_reset_seconds`` from now.
+    """
+
+    def __init__(
+        self,
+        tweets_per_query: int = 150,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        rate_limit_reset_seconds: float = 0.0,
+        bearer_token: Optional[str] = "stub"
+    ):
+        self.bearer_token = bearer_token
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_reset_seconds = rate_limit_reset_seconds
+        self.tweets_per_query = tweets_per_query
+        self.calls = 0
+        self._timelines: Dict[str, List[StubTweet]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def post(self, query: str, count: int = 1) -> None:
+        with self._lock:
+            timeline = self._timeline(query)
+            for _ in range(count):
+                timeline.insert(0, self._make_tweet(query, datetime.now(timezone.utc)))
+
+    def search_recent_tweets(
+        self,
+        query: str,
+        max_results: int = 10,
+        since_id: Optional[int] = None,
+        next_token: Optional[str] = None,
+        **kwargs: Any
+    ) -> tweepy.Response:
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+            timeline = list(self._timeline(query))
+        if self.latency:
+            time.sleep(self.latency)
+        if self.rate_limit_every and calls % self.rate_limit_every == 0:
+            raise self._rate_limit_error()
+
+        if since_id is not None:
+            timeline = [tweet for tweet in timeline if tweet.id > int(since_id)]
+        offset = int(next_token or 0)
+        page = timeline[offset:offset + max_results]
+
+        meta: Dict[str, Any] = {"result_count": len(page)}
+        if page:
+            meta["newest_id"] = str(page[0].id)
+            meta["oldest_id"] = str(page[-1].id)
+        if offset + max_results < len(timeline):
+            meta["next_token"] = str(offset + max_results)
+        return tweepy.Response(data=page or None, includes={}, errors=[], meta=meta)
+
+    def _timeline(self, query: str) -> List[StubTweet]:
+        if query not in self._timelines:
+            now = datetime.now(timezone.utc)
+            tweets = [
+                self._make_tweet(query, now - timedelta(minutes=i))
+                for i in range(self.tweets_per_query, 0, -1)
+            ]
+            self._timelines[query] = list(reversed(tweets))
+        return self._timelines[query]
+
+    def _make_tweet(self, query: str, created_at: datetime) -> StubTweet:
+        tweet_id = self._next_id
+        self._next_id += 1
+        return StubTweet(
+            tweet_id,
+            f"Update {tweet_id} on {query}: officials react to the latest developments in Washington",
+            created_at,
+            {
+                "retweet_count": (tweet_id * 7) % 500,
+                "reply_count": (tweet_id * 3) % 120,
+                "like_count": (tweet_id * 13) % 2000,
+                "quote_count": tweet_id % 40,
+            }
+        )
+
+    def _rate_limit_error(self) -> tweepy.TooManyRequests:
+        reset_time = int(time.time() + self.rate_limit_reset_seconds)
+        response = requests.Response()
+        response.status_code = 429
+        response.reason = "Too Many Requests"
+        response.headers["x-rate-limit-reset"] = str(reset_time)
+        response._content = json.dumps({"title": "Too Many Requests", "detail": "Too Many Requests"}).encode()
+        try:
+            return tweepy.TooManyRequests(response, reset_time=reset_time)
+        except TypeError:  # tweepy < 4.17 has no reset_time argument
+            return tweepy.TooManyRequests(response)
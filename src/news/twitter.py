@@ -0,0 +1,172 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import logging
+
+import tweepy
+
+logger = logging.getLogger(__name__)
+
+TWEET_FIELDS = ['created_at', 'public_metrics', 'context_annotations']
+
+
+class TwitterIngestor:
+    """Incremental, concurrent ingestion of recent tweets.
+
+    Each configured search term becomes its own query, run on a worker
+    thread. A query follows ``next_token`` pagination until its tweet budget
+    or page limit is reached. Its ``since_id`` watermark advances after each
+    successful poll, so later polls only fetch tweets that are new. On a 429
+    the query waits for the ``x-rate-limit-reset`` time (or backs off
+    exponentially when none is given) if that is short enough. Otherwise it
+    sits out until the reset.
+
+    Tweets from earlier polls are retained (up to ``retain_tweets``, for at
+    most ``retain_hours``) and returned together with the new ones.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        search_terms: List[str],
+        max_tweets_per_query: int = 100,
+        max_pages: int = 3,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        max_backoff: float = 30.0,
+        retain_tweets: int = 1000,
+        retain_hours: float = 24
+    ):
+        self.client = client
+        self.search_terms = search_terms
+        self.max_tweets_per_query = max_tweets_per_query
+        self.max_pages = max_pages
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.retain_tweets = retain_tweets
+        self.retain_hours = retain_hours
+        self.since_ids: Dict[str, int] = {}
+        self.blocked_until: Dict[str, float] = {}
+        self._recent: "OrderedDict[Any, Any]" = OrderedDict()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="twitter")
+        # OAuth 1.0a user credentials only: search with user context
+        self._user_auth = getattr(client, "bearer_token", None) is None
+
+    @staticmethod
+    def build_query(term: str) -> str:
+        return f'"{term}" -is:retweet lang:en'
+
+    async def fetch(self) -> List[Any]:
+        """Poll every search term concurrently; return recent, distinct tweets."""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, self.fetch_query, self.build_query(term))
+            for term in self.search_terms
+        ), return_exceptions=True)
+
+        for term, result in zip(self.search_terms, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching tweets for {term!r}: {result}")
+                continue
+            for tweet in result:
+                self._recent.setdefault(tweet.id, tweet)
+
+        self._prune()
+        return list(self._recent.values())
+
+    def _prune(self) -> None:
+        while len(self._recent) > self.retain_tweets:
+            self._recent.popitem(last=False)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retain_hours)
+        expired = [
+            tweet_id for tweet_id, tweet in self._recent.items()
+            if getattr(tweet, "created_at", None) and tweet.created_at < cutoff
+        ]
+        for tweet_id in expired:
+            del self._recent[tweet_id]
+
+    def fetch_query(self, query: str) -> List[Any]:
+        """Fetch the new tweets for one query, following pagination (blocking)."""
+        if time.time() < self.blocked_until.get(query, 0):
+            logger.debug("Skipping rate-limited query %r", query)
+            return []
+
+        tweets: List[Any] = []
+        newest_id = self.since_ids.get(query)
+        next_token: Optional[str] = None
+        interrupted = False
+        for _ in range(self.max_pages):
+            remaining = self.max_tweets_per_query - len(tweets)
+            if remaining < 10:  # the API won't return fewer than 10 per page
+                break
+
+            params: Dict[str, Any] = {
+                "query": query,
+                "max_results": min(100, remaining),
+                "tweet_fields": TWEET_FIELDS,
+                "user_auth": self._user_auth,
+            }
+            if query in self.since_ids:
+                params["since_id"] = self.since_ids[query]
+            if next_token:
+                params["next_token"] = next_token
+
+            response = self._search(query, params)
+            if response is None:
+                interrupted = True
+                break
+
+            tweets.extend(response.data or [])
+            meta = response.meta or {}
+            if meta.get("newest_id") and (newest_id is None or int(meta["newest_id"]) > int(newest_id)):
+                newest_id = int(meta["newest_id"])
+            next_token = meta.get("next_token")
+            if not next_token:
+                break
+
+        # only advance the watermark once the pages below it were all read
+        if newest_id is not None and not interrupted:
+            self.since_ids[query] = int(newest_id)
+        return tweets
+
+    def _search(self, query: str, params: Dict[str, Any]) -> Any:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.client.search_recent_tweets(**params)
+            except tweepy.TooManyRequests as e:
+                reset_time = self._reset_time(e)
+                if reset_time is not None:
+                    delay = reset_time - time.time() + 1
+                else:
+                    delay = self.backoff_base * 2 ** attempt * random.uniform(0.5, 1.5)
+
+                if attempt == self.max_retries or delay > self.max_backoff:
+                    self.blocked_until[query] = time.time() + max(delay, 0)
+                    logger.warning(f"Rate limited on {query!r}; pausing it for {delay:.0f}s")
+                    return None
+                logger.debug("Rate limited on %r; retrying in %.1fs", query, delay)
+                time.sleep(max(delay, 0))
+            except tweepy.TwitterServerError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.backoff_base * 2 ** attempt * random.uniform(0.5, 1.5), self.max_backoff)
+                logger.debug("Twitter server error on %r (%s); retrying in %.1fs", query, e, delay)
+                time.sleep(delay)
+        return None
+
+    @staticmethod
+    def _reset_time(error: Any) -> Optional[float]:
+        reset_time = getattr(error, "reset_time", None)
+        if reset_time is None:
+            headers = getattr(getattr(error, "response", None), "headers", None) or {}
+            reset_time = headers.get("x-rate-limit-reset")
+        return float(reset_time) if reset_time is not None else None
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,155 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Tuple
+import logging
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# From a few milliseconds (cache hits, scoring) to minutes (long episodes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+STAGE_SECONDS = Histogram(
+    "podcast_stage_seconds",
+    "Time spent in each stage of the podcast pipeline",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+NEWS_FETCH_SECONDS = Histogram(
+    "podcast_news_fetch_seconds",
+    "Time to fetch news from each source",
+    ["source"],
+    buckets=LATENCY_BUCKETS
+)
+NEWS_ITEMS = Counter(
+    "podcast_news_items",
+    "News items fetched from each source",
+    ["source"]
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "podcast_llm_queue_seconds",
+    "Time a model call waited for a free generation slot",
+    buckets=LATENCY_BUCKETS
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "podcast_llm_first_token_seconds",
+    "Time from starting a streamed model call to its first chunk",
+    buckets=LATENCY_BUCKETS
+)
+LLM_CALL_SECONDS = Histogram(
+    "podcast_llm_call_seconds",
+    "Duration of model calls once they hold a generation slot",
+    ["mode"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_CALLS = Counter(
+    "podcast_llm_calls",
+    "Model calls by outcome (ok, error, timeout or rejected)",
+    ["mode", "outcome"]
+)
+
+LLM_RETRIES = Counter(
+    "podcast_llm_retries",
+    "Model calls retried after a retryable error"
+)
+LLM_HEDGES = Counter(
+    "podcast_llm_hedges",
+    "Hedged model calls sent, and how many of them answered first",
+    ["outcome"]
+)
+LLM_ROUTES = Counter(
+    "podcast_llm_routes",
+    "Podcast requests routed to each model tier, and why",
+    ["tier", "reason"]
+)
+LLM_ROUTE_SECONDS = Histogram(
+    "podcast_llm_route_seconds",
+    "End-to-end duration of model calls (including queueing and retries) by tier",
+    ["tier"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_ROUTE_TOKENS = Counter(
+    "podcast_llm_route_tokens",
+    "Estimated prompt and output tokens by tier",
+    ["tier", "kind"]
+)
+LLM_ROUTE_COST = Counter(
+    "podcast_llm_route_cost_dollars",
+    "Estimated model spend in USD by tier",
+    ["tier"]
+)
+TTS_SECONDS = Histogram(
+    "podcast_tts_turn_seconds",
+    "Time to synthesise one speaker turn (cache misses only)",
+    ["engine"],
+    buckets=LATENCY_BUCKETS
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of the ``with`` block in ``histogram``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        (histogram.labels(**labels) if labels else histogram).observe(elapsed)
+        logger.debug("%s took %.1f ms", labels or histogram, elapsed * 1000)
+
+
+def span(stage: str) -> Any:
+    """Time one pipeline stage: ``with span("scoring"): ...``."""
+    return timed(STAGE_SECONDS, stage=stage)
+
+
+class StatsCollector:
+    """Exposes values read from live objects (queues, caches) at scrape time.
+
+    Components keep their own plain counters; registering a callable here
+    turns it into a Prometheus gauge or counter without the component
+    depending on the metrics library.
+    """
+
+    def __init__(self, registry: Any = REGISTRY):
+        self._gauges: List[Tuple[str, str, Callable[[], float]]] = []
+        self._counters: List[Tuple[str, str, Callable[[], float]]] = []
+        registry.register(self)
+
+    def gauge(self, name: str, documentation: str, func: Callable[[], float]) -> None:
+        self._gauges.append((name, documentation, func))
+
+    def counter(self, name: str, documentation: str, func: Callable[[], float]) -> None:
+        self._counters.append((name, documentation, func))
+
+    def describe(self) -> List[Any]:
+        # names are only known once registered; skip the registry's up-front check
+        return []
+
+    def collect(self) -> Iterator[Any]:
+        for name, documentation, func in self._gauges:
+            try:
+                yield GaugeMetricFamily(name, documentation, value=func())
+            except Exception as e:
+                logger.warning("Could not collect %s: %s", name, e)
+        for name, documentation, func in self._counters:
+            try:
+                yield CounterMetricFamily(name, documentation, value=func())
+            except Exception as e:
+                logger.warning("Could not collect %s: %s", name, e)
+
+
+def hit_ratio(hits: int, misses: int) -> float:
+    lookups = hits + misses
+    return hits / lookups if lookups else 0.0
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """The Prometheus text exposition of every registered metric."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# Shared collector for the process's runtime stats
+runtime_stats = StatsCollector()
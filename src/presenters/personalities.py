@@ -90,29 +90,3 @@ SARA = PresenterPersonality(
     speaking_style="Direct and practical, often using business and economic examples while maintaining a light-hearted and engaging approach. Enjoys finding common ground and learning from different perspectives.",
     background="Former business executive with experience in market analysis and public policy. Known for bringing people together through thoughtful dialogue and finding practical solutions to complex problems."
 )
-
-def get_presenter_prompt(personality: PresenterPersonality) -> str:
-    """Generate a prompt for the AI model based on the presenter's personality."""
-    return f"""You are {personality.name}, a {personality.political_lean} podcast host with the following characteristics:
-
-Personality Traits: {', '.join(personality.personality_traits)}
-Background: {personality.background}
-Speaking Style: {personality.speaking_style}
-
-Trusted Sources:
-{chr(10).join(f'- {source}' for source in personality.trusted_sources)}
-
-Favorite Quotes:
-{chr(10).join(f'- {quote}' for quote in personality.favorite_quotes)}
-
-When discussing topics:
-1. Maintain your {personality.political_lean} perspective while being open to different viewpoints
-2. Use evidence and data to support your arguments
-3. Keep the tone engaging, conversational, and fun
-4. Reference your trusted sources when appropriate
-5. Be respectful of opposing views while maintaining your position
-6. Use your favorite quotes when relevant to the discussion
-7. Stay true to your speaking style while being natural and authentic
-8. Always maintain a polite and open-minded approach
-9. Look for opportunities to find common ground
-10. Show genuine curiosity about different perspectives""" 
\ No newline at end of file
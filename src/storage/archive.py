@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional
+import logging
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; episodes are then stored gzip-only
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    title TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    gzip_size INTEGER NOT NULL,
+    zstd_size INTEGER,
+    audio_sha256 TEXT,
+    audio_size INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS episodes_created_at ON episodes (created_at);
+"""
+
+# File suffix of each stored representation, by content coding
+SUFFIXES = {"gzip": ".json.gz", "zstd": ".json.zst", "audio": ".wav"}
+
+
+class EpisodeArchive:
+    """Generated episodes, stored compressed under their content hash.
+
+    Each episode's JSON is hashed and compressed once, with gzip and (when
+    ``zstandard`` is installed) zstd, and written to
+    ``<directory>/<id[:2]>/<id>.json.gz``. The id is the first 16 hex
+    digits of the hash, so storing the same episode twice is a no-op. An
+    SQLite index records titles and sizes. Rendered audio can be stored
+    next to the episode: it is written into a temporary file as it is
+    rendered and published with ``commit_audio``.
+
+    Reads are memory-mapped: the API slices the stored bytes directly,
+    whether it sends the whole file or a range. Every method blocks, so
+    async code calls them on a thread.
+    """
+
+    def __init__(self, directory: str, gzip_level: int = 6, zstd_level: int = 10):
+        self.directory = directory
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"), check_same_thread=False, isolation_level=None
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    @property
+    def encodings(self) -> List[str]:
+        return ["zstd", "gzip"] if zstandard else ["gzip"]
+
+    def path(self, episode_id: str, kind: str) -> str:
+        return os.path.join(self.directory, episode_id[:2], f"{episode_id}{SUFFIXES[kind]}")
+
+    def _write(self, path: str, data: bytes) -> None:
+        # write then rename so readers never map a partial file
+        f = self._temporary(path)
+        try:
+            with f:
+                f.write(data)
+            os.replace(f.name, path)
+        except BaseException:
+            self.discard(f)
+            raise
+
+    @staticmethod
+    def _temporary(path: str) -> BinaryIO:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        os.close(fd)
+        return open(tmp_path, "w+b")
+
+    def store(self, episode: Dict[str, Any]) -> str:
+        """Archive ``episode`` and return its id."""
+        body = json.dumps(episode, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        episode_id = digest[:16]
+        if self.get(episode_id) is not None:
+            return episode_id
+
+        compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        self._write(self.path(episode_id, "gzip"), compressed)
+        zstd_size = None
+        if zstandard:
+            packed = zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+            self._write(self.path(episode_id, "zstd"), packed)
+            zstd_size = len(packed)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO episodes (id, sha256, title, size, gzip_size, zstd_size, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (episode_id, digest, episode.get("title", ""), len(body), len(compressed), zstd_size, time.time())
+            )
+        logger.debug("Archived episode %s (%d bytes, %d gzipped)", episode_id, len(body), len(compressed))
+        return episode_id
+
+    def create_audio(self, episode_id: str) -> BinaryIO:
+        """A temporary file to write ``episode_id``'s audio into; see ``commit_audio``."""
+        return self._temporary(self.path(episode_id, "audio"))
+
+    def commit_audio(self, episode_id: str, f: BinaryIO, header: bytes = b"") -> Dict[str, Any]:
+        """Write ``header`` over the start of ``f`` and publish it as the episode's audio.
+
+        Returns the updated index entry.
+        """
+        try:
+            if header:
+                f.seek(0)
+                f.write(header)
+            f.seek(0)
+            digest = hashlib.sha256()
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+            size = f.tell()
+        finally:
+            f.close()
+        os.replace(f.name, self.path(episode_id, "audio"))
+        with self._lock:
+            self._db.execute(
+                "UPDATE episodes SET audio_sha256 = ?, audio_size = ? WHERE id = ?",
+                (digest.hexdigest(), size, episode_id)
+            )
+        return self.get(episode_id)
+
+    def discard(self, f: BinaryIO) -> None:
+        """Close and delete a temporary file that won't be published."""
+        f.close()
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
+
+    def get(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        """The index entry for ``episode_id``."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM episodes WHERE id = ?", (episode_id,)).fetchone()
+        return dict(row) if row else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM episodes ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def open(self, episode_id: str, kind: str) -> Optional[mmap.mmap]:
+        """A read-only memory map of one stored representation, or None."""
+        try:
+            with open(self.path(episode_id, kind), "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: an empty file can't be mapped
+            return None
+
+    def load(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        """The decoded episode."""
+        mapped = self.open(episode_id, "gzip")
+        if mapped is None:
+            return None
+        with mapped:
+            return json.loads(gzip.decompress(mapped))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
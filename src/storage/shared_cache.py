@@ -0,0 +1,308 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+import logging
+
+from ..config.settings import SHARED_CACHE_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE TABLE IF NOT EXISTS locks (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Evict expired entries once every this many writes
+EVICT_EVERY = 100
+
+
+class SharedEntry(NamedTuple):
+    value: Any
+    created_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+def _encode(value: Any) -> str:
+    def default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return {"__datetime__": obj.isoformat()}
+        return str(obj)
+    return json.dumps(value, default=default)
+
+
+def _decode(text: str) -> Any:
+    def object_hook(obj: Dict[str, Any]) -> Any:
+        if len(obj) == 1 and "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        return obj
+    return json.loads(text, object_hook=object_hook)
+
+
+class SharedCache:
+    """TTL cache shared by every worker process through one SQLite file.
+
+    The database runs in WAL mode, so readers never block the writer, and
+    each entry is written in a single statement, so a reader sees either
+    the old value or the new one. ``get_or_refresh`` takes a cross-process
+    lock so that only one worker refreshes an expired entry while the
+    others wait for its result. The lock is a row in ``locks`` with a
+    ``lock_timeout`` lease, renewed while the refresh runs however long it
+    takes, so a crashed worker can't hold it forever and a slow one doesn't
+    lose it.
+
+    Values are stored as JSON; datetimes survive the round trip. The
+    methods are blocking; async code uses ``get_async``/``set_async``, and
+    ``get_or_refresh`` does its database work on a thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        stale_seconds: float = 24 * 3600,
+        lock_timeout: float = 60.0,
+        poll_interval: float = 0.1
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+        self.refreshes = 0
+        self.joined = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # opened lazily, and again in a forked child, which can't share it
+        if self._db is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+            self._pid = os.getpid()
+            self.owner = f"{self._pid}-{uuid.uuid4().hex[:8]}"
+        return self._db
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[SharedEntry]:
+        """The entry for ``key``; expired entries only with ``allow_stale``."""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT value, created_at, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return None
+        if row is None:
+            return None
+        entry = SharedEntry(_decode(row[0]), row[1], row[2])
+        if not entry.fresh and not allow_stale:
+            return None
+        return entry
+
+    async def get_async(self, key: str, allow_stale: bool = False) -> Optional[SharedEntry]:
+        return await asyncio.to_thread(self.get, key, allow_stale)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> SharedEntry:
+        now = time.time()
+        entry = SharedEntry(value, now, now + ttl_seconds)
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO entries (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, _encode(value), entry.created_at, entry.expires_at)
+                )
+                self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self.evict()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+        return entry
+
+    async def set_async(self, key: str, value: Any, ttl_seconds: float) -> SharedEntry:
+        return await asyncio.to_thread(self.set, key, value, ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = "") -> None:
+        """Delete every entry whose key starts with ``prefix``."""
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+    def evict(self) -> None:
+        """Drop entries expired for over ``stale_seconds``, then the oldest beyond ``max_entries``."""
+        with self._lock:
+            db = self._connection()
+            db.execute("DELETE FROM entries WHERE expires_at < ?", (time.time() - self.stale_seconds,))
+            db.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def trim(self, prefix: str, max_entries: int) -> None:
+        """Drop the oldest entries whose key starts with ``prefix`` beyond ``max_entries``."""
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries WHERE substr(key, 1, ?) = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (len(prefix), prefix, max_entries)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache trim failed for {prefix}: {e}")
+
+    def try_lock(self, name: str) -> bool:
+        """Take the cross-process lock ``name`` unless another live owner holds it."""
+        now = time.time()
+        try:
+            with self._lock:
+                cursor = self._connection().execute(
+                    "INSERT INTO locks (name, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE locks.expires_at < ?",
+                    (name, self.owner, now + self.lock_timeout, now)
+                )
+                return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            # without a working store there is nobody to coordinate with
+            logger.warning(f"Shared cache lock failed for {name}: {e}")
+            return True
+
+    def renew(self, name: str) -> bool:
+        """Extend our lease on ``name``; False if we no longer hold it."""
+        try:
+            with self._lock:
+                cursor = self._connection().execute(
+                    "UPDATE locks SET expires_at = ? WHERE name = ? AND owner = ?",
+                    (time.time() + self.lock_timeout, name, self.owner)
+                )
+                return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache lock renewal failed for {name}: {e}")
+            return False
+
+    async def _keep_lock(self, name: str) -> None:
+        while True:
+            await asyncio.sleep(self.lock_timeout / 3)
+            if not await asyncio.to_thread(self.renew, name):
+                logger.warning(f"Lost the shared cache lock {name} during a refresh")
+                return
+
+    def is_locked(self, name: str) -> bool:
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT 1 FROM locks WHERE name = ? AND expires_at >= ?", (name, time.time())
+                ).fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None
+
+    def release(self, name: str) -> None:
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "DELETE FROM locks WHERE name = ? AND owner = ?", (name, self.owner)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache unlock failed for {name}: {e}")
+
+    async def get_or_refresh(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable[Any]],
+        ttl_seconds: float
+    ) -> SharedEntry:
+        """Return the fresh entry for ``key``, refreshing it in one worker only.
+
+        The worker that wins the lock calls ``refresh`` and stores the result.
+        The others poll until that result appears, or take over if the lock
+        is released (say, because the refresh failed) or expires.
+        """
+        lock = f"refresh:{key}"
+        while True:
+            entry = await self.get_async(key)
+            if entry is not None:
+                return entry
+
+            if await asyncio.to_thread(self.try_lock, lock):
+                keeper = asyncio.ensure_future(self._keep_lock(lock))
+                try:
+                    # another worker may have finished between our read and the lock
+                    entry = await self.get_async(key)
+                    if entry is not None:
+                        return entry
+                    self.refreshes += 1
+                    return await self.set_async(key, await refresh(), ttl_seconds)
+                finally:
+                    keeper.cancel()
+                    await asyncio.to_thread(self.release, lock)
+
+            logger.debug("Waiting for another worker to refresh %s", key)
+            self.joined += 1
+            while await asyncio.to_thread(self.is_locked, lock):
+                await asyncio.sleep(self.poll_interval)
+                entry = await self.get_async(key)
+                if entry is not None:
+                    return entry
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._lock:
+                entries = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        return {
+            "path": self.path,
+            "entries": entries,
+            "refreshes": self.refreshes,
+            "joined": self.joined,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# One store for every cache in the process; None when disabled
+shared_cache = SharedCache(
+    SHARED_CACHE_SETTINGS["path"],
+    max_entries=SHARED_CACHE_SETTINGS["max_entries"],
+    stale_seconds=SHARED_CACHE_SETTINGS["stale_hours"] * 3600,
+    lock_timeout=SHARED_CACHE_SETTINGS["lock_timeout_seconds"],
+    poll_interval=SHARED_CACHE_SETTINGS["poll_interval_seconds"]
+) if SHARED_CACHE_SETTINGS["enabled"] else None
@@ -0,0 +1,59 @@
+import hashlib
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.api.responses import file_response
+from src.storage.archive import EpisodeArchive
+
+EPISODE = {"title": "AI Podcast: Budget", "transcript": "Alex: Hello.\nSara: Hi.", "topics": []}
+
+
+def test_audio_is_written_to_a_temporary_file_and_published_on_commit(tmp_path):
+    archive = EpisodeArchive(str(tmp_path))
+    episode_id = archive.store(EPISODE)
+    f = archive.create_audio(episode_id)
+    f.write(b"\0" * 44)
+    f.writelines([b"a" * 1000, b"b" * 1000])
+    assert not os.path.exists(archive.path(episode_id, "audio"))
+
+    entry = archive.commit_audio(episode_id, f, header=b"H" * 44)
+    with open(archive.path(episode_id, "audio"), "rb") as stored:
+        audio = stored.read()
+    assert audio == b"H" * 44 + b"a" * 1000 + b"b" * 1000
+    assert entry["audio_size"] == len(audio)
+    assert entry["audio_sha256"] == hashlib.sha256(audio).hexdigest()
+    assert [name for name in os.listdir(os.path.dirname(f.name)) if name.endswith(".tmp")] == []
+
+
+def test_discarded_audio_leaves_nothing_behind(tmp_path):
+    archive = EpisodeArchive(str(tmp_path))
+    episode_id = archive.store(EPISODE)
+    f = archive.create_audio(episode_id)
+    f.write(b"partial")
+    archive.discard(f)
+    assert [name for name in os.listdir(os.path.dirname(f.name)) if name.endswith(".tmp")] == []
+    assert archive.get(episode_id)["audio_sha256"] is None
+
+
+def test_file_response_serves_ranges_and_etags(tmp_path):
+    path = tmp_path / "audio.wav"
+    body = bytes(range(256)) * 8000
+    path.write_bytes(body)
+    app = FastAPI()
+
+    @app.get("/audio")
+    async def audio(request: Request):
+        return file_response(request, str(path), "audio/wav", '"tag"')
+
+    client = TestClient(app)
+    full = client.get("/audio")
+    assert full.status_code == 200 and full.content == body
+    ranged = client.get("/audio", headers={"Range": "bytes=300000-"})
+    assert ranged.status_code == 206 and ranged.content == body[300000:]
+    assert ranged.headers["content-range"] == f"bytes 300000-{len(body) - 1}/{len(body)}"
+    assert client.get("/audio", headers={"If-None-Match": '"tag"'}).status_code == 304
+    assert client.get("/audio", headers={"Range": f"bytes={len(body)}-"}).status_code == 416
+    stale = client.get("/audio", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+    assert stale.status_code == 200 and stale.content == body
@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+from src.audio.dialogue import Turn
+from src.audio.stub import StubTTSEngine
+from src.audio.tts import AudioCache, TTSPipeline
+from src.presenters.personalities import ALEX
+
+
+def test_eviction_keeps_the_newest_entries_without_rescanning(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path), max_entries=3)
+    walks = []
+    walk = os.walk
+    monkeypatch.setattr(os, "walk", lambda *args: walks.append(1) or walk(*args))
+
+    for n in range(6):
+        cache.set(f"{n:02d}" * 32, b"\0" * 100)
+    assert len(walks) == 1
+    assert cache.size == 300
+    assert cache.get("05" * 32) is not None
+    assert cache.get("00" * 32) is None
+
+
+def test_eviction_keeps_the_cache_under_max_bytes(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=250)
+    for n in range(4):
+        cache.set(f"{n:02d}" * 32, b"\0" * 100)
+    cache.set("01" * 32, b"\0" * 50)
+    assert cache.size <= 250
+    assert sum(os.path.getsize(path) for path in cache._paths()) == cache.size
+
+
+def test_rendered_turns_are_cached(tmp_path):
+    engine = StubTTSEngine()
+    pipeline = TTSPipeline(engine, {}, cache=AudioCache(str(tmp_path)))
+    turn = Turn(0, ALEX, "Good morning and welcome to the show.")
+
+    async def main():
+        return await pipeline.render(turn), await pipeline.render(turn)
+
+    first, second = asyncio.run(main())
+    pipeline.shutdown()
+    assert first == second
+    assert engine.calls == 1 and pipeline.cache.hits == 1
@@ -0,0 +1,72 @@
+from src.news.clustering import build_topics
+
+STORIES = [
+    "Senate passes budget bill after marathon vote",
+    "Wildfires force evacuations across northern California",
+    "Central bank holds interest rates steady amid inflation worries",
+    "School districts adopt new reading curriculum statewide",
+    "Bridge repairs close interstate lanes for the summer",
+]
+
+
+def item(title, score, source="Reuters"):
+    return {
+        'title': title,
+        'summary': f"{title}. Officials commented on the development.",
+        'source': source,
+        'url': f"https://example.com/{abs(hash((title, source)))}",
+        'relevance_score': score,
+    }
+
+
+def test_related_items_become_one_topic_and_later_stories_fill_the_rest():
+    # three outlets on the budget story rank highest
+    items = [item(STORIES[0], 0.9 - i * 0.01, source) for i, source in enumerate(["Reuters", "AP", "NPR"])]
+    items += [item(story, 0.5 - i * 0.05) for i, story in enumerate(STORIES[1:])]
+
+    topics = build_topics(items, max_topics=3)
+    assert [topic['title'] for topic in topics] == STORIES[:3]
+    assert len(topics[0]['items']) == 3 and len(topics[0]['sources']) == 3
+    assert all(len(topic['items']) == 1 for topic in topics[1:])
+
+
+def test_every_candidate_is_clustered_before_picking_topics():
+    items = [item(f"{story} (update {n})", 0.9 - n * 0.01) for n in range(12) for story in STORIES[:1]]
+    items += [item(story, 0.4) for story in STORIES[1:]]
+
+    topics = build_topics(items, max_topics=10)
+    assert len(topics) == len(STORIES)
+    assert topics[0]['title'].startswith(STORIES[0]) and len(topics[0]['items']) == 12
+
+
+def test_topics_are_built_once_per_news_refresh(monkeypatch):
+    import asyncio
+
+    from src.news.aggregator import NewsAggregator
+    from src.news.cache import NewsCache
+    from src.news.stub import StubTwitterClient
+
+    aggregator = NewsAggregator(cache=NewsCache(ttl_seconds=60), twitter_client=StubTwitterClient())
+    candidates = [item(f"{story} (take {n})", 0.9 - n * 0.01) for n in range(5) for story in STORIES]
+    builds = []
+
+    async def aggregate():
+        return list(candidates)
+
+    def topics(news_items):
+        builds.append(len(news_items))
+        return build_topics(news_items)
+
+    monkeypatch.setattr(aggregator, "_aggregate_news", aggregate)
+    monkeypatch.setattr(aggregator, "generate_discussion_topics", topics)
+
+    async def main():
+        first = await aggregator.get_discussion_topics()
+        second = await aggregator.get_discussion_topics()
+        return first, second, await aggregator.get_news_summaries()
+
+    first, second, summaries = asyncio.run(main())
+    aggregator.twitter_ingestor.shutdown()
+    assert builds == [len(candidates)]
+    assert first == second
+    assert len(summaries) == 10
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from src.news.dedup import deduplicate
+from src.news.scoring import rank_news_items, score_items
+
+NOW = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+SUMMARY = "The Senate passed the budget bill late on Tuesday after a marathon session of votes"
+
+
+def article():
+    return {
+        'title': "Senate passes budget bill",
+        'summary': SUMMARY,
+        'source': 'Reuters',
+        'url': "https://reuters.com/world/senate-budget",
+        'published_at': NOW,
+    }
+
+
+def tweet(likes=3):
+    return {
+        'title': "Senate passes budget bill...",
+        'summary': SUMMARY,
+        'source': 'Twitter',
+        'url': "https://twitter.com/user/status/1",
+        'published_at': NOW,
+        'public_metrics': {'like_count': likes, 'retweet_count': 0, 'reply_count': 0, 'quote_count': 0},
+    }
+
+
+def test_low_engagement_tweet_is_dropped():
+    assert rank_news_items([tweet()], now=NOW.timestamp()) == []
+
+
+def test_merging_a_tweet_into_an_article_keeps_its_score():
+    alone = score_items([article()], now=NOW.timestamp())[0]
+
+    groups = deduplicate([article(), tweet()])
+    assert len(groups) == 1
+    assert 'public_metrics' not in groups[0]
+
+    ranked = rank_news_items(groups, now=NOW.timestamp())
+    assert len(ranked) == 1
+    assert ranked[0]['relevance_score'] >= alone
+
+
+def test_merging_an_article_into_a_tweet_lifts_it_over_the_floor():
+    alone = score_items([article()], now=NOW.timestamp())[0]
+
+    groups = deduplicate([tweet(), article()])
+    assert len(groups) == 1
+
+    ranked = rank_news_items(groups, now=NOW.timestamp())
+    assert len(ranked) == 1
+    assert ranked[0]['relevance_score'] >= alone
+
+
+def test_tweet_metrics_are_summed():
+    first, second = tweet(likes=80), tweet(likes=40)
+    second['url'] = "https://x.com/someone/status/2"
+    groups = deduplicate([first, second])
+    assert len(groups) == 1
+    assert groups[0]['public_metrics']['like_count'] == 120
+    assert len(rank_news_items(groups, now=NOW.timestamp())) == 1
+
+
+def test_items_without_words_are_not_merged():
+    items = [
+        {'title': "", 'summary': "", 'source': 'Twitter', 'url': ""},
+        {'title': "🇺🇸🇺🇸", 'summary': "!!!", 'source': 'Twitter', 'url': "https://twitter.com/a/status/2"},
+        {'title': "—", 'summary': "", 'source': 'Twitter', 'url': "https://twitter.com/b/status/3"},
+    ]
+    assert len(deduplicate(items)) == 3
+    # a repeated URL still matches
+    assert len(deduplicate(items + [dict(items[1])])) == 3
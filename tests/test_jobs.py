@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import pytest
+
+from src.jobs.store import FAILED, QUEUED, RUNNING, SUCCEEDED, IdempotencyKeyConflictError, JobStore
+from src.jobs.worker import JobQueue
+
+REQUEST = {"topic": "Budget", "duration_minutes": 5}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+def test_same_key_returns_the_same_job(path):
+    store = JobStore(path)
+    job, created = store.create(REQUEST, "key-1")
+    again, created_again = store.create(dict(REQUEST), "key-1")
+    assert created and not created_again
+    assert again["id"] == job["id"]
+
+
+def test_key_reused_for_a_different_request_is_rejected(path):
+    store = JobStore(path)
+    store.create(REQUEST, "key-1")
+    with pytest.raises(IdempotencyKeyConflictError):
+        store.create({"topic": "Something else", "duration_minutes": 5}, "key-1")
+
+
+def test_concurrent_insert_of_one_key_returns_the_existing_job(path):
+    first, second = JobStore(path), JobStore(path)
+    # second looks the key up before first inserts it
+    original = second._by_key
+    lookups = []
+
+    def by_key(key):
+        lookups.append(key)
+        return None if len(lookups) == 1 else original(key)
+
+    second._by_key = by_key
+
+    job, _ = first.create(REQUEST, "key-1")
+    raced, created = second.create(REQUEST, "key-1")
+    assert not created
+    assert raced["id"] == job["id"]
+    assert len(lookups) == 2
+
+
+def test_failed_job_is_queued_again_on_resubmit(path):
+    store = JobStore(path)
+    job, _ = store.create(REQUEST, "key-1")
+    store.claim(job["id"], "worker", 60)
+    store.mark_failed(job["id"], "worker", "boom")
+    retried, created = store.create(REQUEST, "key-1")
+    assert created and retried["status"] == QUEUED
+
+
+def test_a_job_is_claimed_once(path):
+    first, second = JobStore(path), JobStore(path)
+    job, _ = first.create(REQUEST)
+    assert first.claim(job["id"], "a", 60) is not None
+    assert second.claim(job["id"], "b", 60) is None
+    assert not second.mark_succeeded(job["id"], "b", {})
+    assert first.mark_succeeded(job["id"], "a", {"ok": True})
+    assert first.get(job["id"])["status"] == SUCCEEDED
+
+
+def test_expired_lease_is_claimable_again(path):
+    store = JobStore(path)
+    live, _ = store.create(REQUEST)
+    dead, _ = store.create(REQUEST)
+    store.claim(live["id"], "alive", 60)
+    store.claim(dead["id"], "dead", -1)
+    assert store.claimable() == [dead["id"]]
+    reclaimed = store.claim(dead["id"], "new", 60)
+    assert reclaimed["owner"] == "new" and reclaimed["attempts"] == 2
+
+
+def run_queues(path, count, submit_to_first, duration=0.05):
+    """Start ``count`` queues on one database and return how often each job ran."""
+    runs = []
+
+    async def handler(request):
+        runs.append(request["topic"])
+        await asyncio.sleep(duration)
+        return {"title": request["topic"]}
+
+    async def main():
+        queues = [JobQueue(JobStore(path), handler, workers=2, poll_interval=0.01) for _ in range(count)]
+        queues[0].start()
+        jobs = [(await queues[0].submit({"topic": topic, "duration_minutes": 5}))[0] for topic in submit_to_first]
+        for queue in queues[1:]:
+            queue.start()
+        await asyncio.sleep(0.3)
+        for queue in queues:
+            await queue.stop()
+        return [queues[0].store.get(job["id"]) for job in jobs]
+
+    return runs, asyncio.run(main())
+
+
+def test_queues_sharing_a_database_run_each_job_once(path):
+    runs, jobs = run_queues(path, 3, ["a", "b", "c", "d"])
+    assert sorted(runs) == ["a", "b", "c", "d"]
+    assert all(job["status"] == SUCCEEDED for job in jobs)
+
+
+def test_restart_recovers_jobs_of_a_dead_worker(path):
+    store = JobStore(path)
+    orphaned, _ = store.create({"topic": "orphaned", "duration_minutes": 5})
+    running, _ = store.create({"topic": "running", "duration_minutes": 5})
+    store.claim(orphaned["id"], "dead-worker", -1)
+    store.claim(running["id"], "live-worker", 60)
+
+    runs, _ = run_queues(path, 1, [])
+    assert runs == ["orphaned"]
+    assert store.get(orphaned["id"])["status"] == SUCCEEDED
+    assert store.get(running["id"])["status"] == RUNNING
+
+
+def test_stopping_releases_running_jobs(path):
+    runs, jobs = run_queues(path, 1, ["slow"], duration=10)
+    assert runs == ["slow"]
+    assert jobs[0]["status"] == QUEUED and jobs[0]["owner"] is None
+
+
+def test_handler_error_marks_the_job_failed(path):
+    async def handler(request):
+        raise ValueError("no news")
+
+    async def main():
+        queue = JobQueue(JobStore(path), handler, poll_interval=0.01)
+        queue.start()
+        job, _ = await queue.submit(REQUEST)
+        await asyncio.sleep(0.05)
+        await queue.stop()
+        return queue.store.get(job["id"])
+
+    job = asyncio.run(main())
+    assert job["status"] == FAILED and job["error"] == "no news"
+
+
+def test_a_job_that_keeps_killing_its_worker_is_failed(path):
+    store = JobStore(path, max_attempts=2)
+    job, _ = store.create(REQUEST, "key-1")
+    store.claim(job["id"], "first", -1)
+    store.claim(job["id"], "second", -1)
+    assert store.claimable() == []
+    assert store.claim(job["id"], "third", 60) is None
+    assert store.sweep() == (1, 0)
+    assert store.get(job["id"])["status"] == FAILED
+
+    # resubmitting starts the count again
+    retried, created = store.create(REQUEST, "key-1")
+    assert created and retried["attempts"] == 0
+    assert store.claimable() == [job["id"]]
+
+
+def test_released_jobs_do_not_use_up_attempts(path):
+    store = JobStore(path, max_attempts=1)
+    job, _ = store.create(REQUEST)
+    store.claim(job["id"], "worker", 60)
+    store.release(job["id"], "worker")
+    assert store.claim(job["id"], "worker", 60)["attempts"] == 1
+
+
+def test_sweep_deletes_only_old_finished_jobs(path):
+    store = JobStore(path, retention_seconds=0.05)
+    done, _ = store.create(REQUEST, "key-1")
+    queued, _ = store.create(REQUEST)
+    store.claim(done["id"], "worker", 60)
+    store.mark_succeeded(done["id"], "worker", {})
+    time.sleep(0.1)
+    assert store.sweep() == (0, 1)
+    assert store.get(done["id"]) is None
+    assert store.get(queued["id"])["status"] == QUEUED
+    # the key can be used again
+    assert store.create(REQUEST, "key-1")[1]
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.generation.executor import GenerationExecutor
+from src.generation.models import ModelRegistry, ModelUnavailableError
+from src.generation.router import ModelRouter, ModelTier
+
+TIERS = {
+    "fast": ModelTier("fast", "gemini-1.5-flash", max_output_tokens=1024),
+    "quality": ModelTier("quality", "gemini-1.5-pro", max_output_tokens=4096),
+}
+
+
+class FakeGenAI:
+    """Lists only the models an API key has access to."""
+
+    def __init__(self, *names):
+        self.names = names
+
+    def list_models(self):
+        return [type("Model", (), {"name": f"models/{name}"}) for name in self.names]
+
+    def GenerativeModel(self, name):
+        return name
+
+
+def registry(*available):
+    registry = ModelRegistry(required_models=sorted({tier.model_name for tier in TIERS.values()}))
+    registry._genai = FakeGenAI(*available)
+    return registry
+
+
+def router(available=None):
+    return ModelRouter(
+        TIERS, GenerationExecutor(max_concurrent=1), {"temperature": 0.7},
+        default_tier="quality", fast_tier="fast", fallback_tier="fast",
+        fast_path_max_minutes=10, available=available
+    )
+
+
+def test_short_episodes_take_the_fast_path():
+    route = router().route(5)
+    assert route.tier.name == "fast" and route.reason == "fast_path"
+    assert route.generation_config["max_output_tokens"] < TIERS["fast"].max_output_tokens
+
+
+def test_missing_model_disables_only_its_tier():
+    models = registry("gemini-1.5-pro")
+    models.validate()
+    assert models.missing_models == ["gemini-1.5-flash"]
+
+    route = router(models.is_available).route(5)
+    assert route.tier.name == "quality" and route.reason == "unavailable"
+    assert asyncio.run(models.get_model(route.model_name)) == "gemini-1.5-pro"
+    with pytest.raises(ModelUnavailableError):
+        asyncio.run(models.get_model("gemini-1.5-flash"))
+
+
+def test_no_available_model_fails_validation():
+    models = registry("text-bison")
+    with pytest.raises(ModelUnavailableError):
+        models.validate()
+    with pytest.raises(ModelUnavailableError):
+        router(lambda model_name: False).route(5)
+
+
+def test_duration_is_clamped_before_sizing_the_output_budget():
+    bounded = ModelRouter(
+        TIERS, GenerationExecutor(max_concurrent=1), {}, default_tier="quality",
+        min_minutes=5, max_minutes=60, min_output_tokens=512
+    )
+    assert bounded.route(-5).generation_config["max_output_tokens"] == bounded.route(5).generation_config["max_output_tokens"]
+    assert bounded.route(0).generation_config["max_output_tokens"] >= 512
+    assert bounded.route(100000).generation_config["max_output_tokens"] == TIERS["quality"].max_output_tokens
+    assert router().route(-5).generation_config["max_output_tokens"] == 256
@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+import pytest
+
+from src.generation.executor import GenerationExecutor
+from src.generation.scheduler import CircuitBreaker, ModelScheduler, UpstreamUnavailableError
+from src.generation.stub import FaultInjectingModel, StubAPIError, StubModel
+
+
+def scheduler(max_concurrent=4, **kwargs):
+    options = dict(timeout=1.0, max_retries=3, backoff_base=0.001, max_backoff=0.01,
+                   failure_threshold=3, reset_timeout=0.2)
+    options.update(kwargs)
+    return ModelScheduler(GenerationExecutor(max_concurrent=max_concurrent), **options)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_queue_wait_does_not_count_towards_the_timeout():
+    async def main():
+        model = FaultInjectingModel(StubModel(), slow_rate=1.0, slow_delay=0.15)
+        calls = scheduler(max_concurrent=1, timeout=0.3)
+        # six calls queue behind one slot for far longer than the timeout
+        results = await asyncio.gather(*(calls.generate(model, "prompt") for _ in range(6)))
+        return calls, model, results
+
+    calls, model, results = run(main())
+    assert len(results) == 6 and model.calls == 6
+    assert calls.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_finishes():
+    async def main():
+        executor = GenerationExecutor(max_concurrent=1)
+        model = FaultInjectingModel(StubModel(), slow_rate=1.0, slow_delay=0.3)
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.generate(model, "prompt", timeout=0.05)
+        held = executor.in_flight
+        started = time.perf_counter()
+        await executor.generate(StubModel(), "prompt")
+        return held, time.perf_counter() - started
+
+    held, waited = run(main())
+    assert held == 1
+    assert waited >= 0.2
+
+
+def test_slow_call_times_out_and_is_retried():
+    async def main():
+        # with this seed the first call stalls and the second doesn't
+        model = FaultInjectingModel(StubModel(), slow_rate=0.5, slow_delay=0.3, seed=9)
+        calls = scheduler(timeout=0.1)
+        response = await calls.generate(model, "prompt")
+        return calls, model, response
+
+    calls, model, response = run(main())
+    assert response.text
+    assert model.calls == 2
+    assert calls.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retryable_errors_are_retried():
+    async def main():
+        model = FaultInjectingModel(StubModel())
+        model.fail_next(2)
+        response = await scheduler().generate(model, "prompt")
+        return model, response
+
+    model, response = run(main())
+    assert response.text
+    assert model.calls == 3 and model.failures == 2
+
+
+def test_non_retryable_errors_are_not_retried():
+    async def main():
+        model = FaultInjectingModel(StubModel(), error_code=400)
+        model.fail_next(1)
+        calls = scheduler()
+        with pytest.raises(StubAPIError):
+            await calls.generate(model, "prompt")
+        return calls, model
+
+    calls, model = run(main())
+    assert model.calls == 1
+    assert calls.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_opens_fails_fast_and_recovers_through_half_open():
+    async def main():
+        model = FaultInjectingModel(StubModel())
+        calls = scheduler(max_retries=5, failure_threshold=3, reset_timeout=0.2)
+
+        model.fail_next(3)
+        with pytest.raises(UpstreamUnavailableError):
+            await calls.generate(model, "prompt")
+        assert calls.breaker.state == CircuitBreaker.OPEN
+        assert model.calls == 3
+
+        # open: rejected without calling the model
+        with pytest.raises(UpstreamUnavailableError):
+            await calls.generate(model, "prompt")
+        assert model.calls == 3
+
+        # half-open trial fails: open again
+        await asyncio.sleep(0.25)
+        model.fail_next(1)
+        with pytest.raises(UpstreamUnavailableError):
+            await calls.generate(model, "prompt")
+        assert model.calls == 4
+        assert calls.breaker.state == CircuitBreaker.OPEN
+
+        # half-open trial succeeds: closed
+        await asyncio.sleep(0.25)
+        response = await calls.generate(model, "prompt")
+        assert response.text
+        assert calls.breaker.state == CircuitBreaker.CLOSED
+
+    run(main())
+
+
+def test_stream_is_retried_before_its_first_chunk():
+    async def main():
+        model = FaultInjectingModel(StubModel(chunk_size=16))
+        model.fail_next(1)
+        chunks = [chunk async for chunk in scheduler().stream(model, "prompt")]
+        return model, chunks
+
+    model, chunks = run(main())
+    assert model.calls == 2
+    assert len(chunks) > 1
+
+
+def token_bucket_after(call, **kwargs):
+    async def main():
+        calls = scheduler(tokens_per_minute=60_000, **kwargs)
+        try:
+            await call(calls)
+        except Exception:
+            pass
+        return calls.tokens.tokens
+
+    return run(main())
+
+
+CONFIG = {"max_output_tokens": 5000}
+
+
+def test_failed_calls_hand_back_their_output_reservation():
+    async def call(calls):
+        model = FaultInjectingModel(StubModel(), error_code=400)
+        model.fail_next(1)
+        await calls.generate(model, "prompt", CONFIG)
+
+    assert token_bucket_after(call) > 60_000 - 100
+
+
+def test_streams_hand_back_their_unused_reservation():
+    async def call(calls):
+        chunks = [chunk async for chunk in calls.stream(StubModel(output_tokens=200), "prompt", CONFIG)]
+        assert chunks
+
+    assert 60_000 - 1000 < token_bucket_after(call) < 60_000 - 100
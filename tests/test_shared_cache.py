@@ -0,0 +1,36 @@
+import asyncio
+
+from src.storage.shared_cache import SharedCache
+
+
+def test_a_refresh_longer_than_the_lock_timeout_runs_once(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+        # well past the lock's lease, which must be renewed meanwhile
+        await asyncio.sleep(0.5)
+        return {"items": len(calls)}
+
+    async def main():
+        # two workers with their own connections and lock owners
+        first = SharedCache(path, lock_timeout=0.15, poll_interval=0.02)
+        second = SharedCache(path, lock_timeout=0.15, poll_interval=0.02)
+        entries = await asyncio.gather(
+            first.get_or_refresh("news", refresh, 60),
+            second.get_or_refresh("news", refresh, 60)
+        )
+        return entries, first.refreshes + second.refreshes, first.joined + second.joined
+
+    entries, refreshes, joined = asyncio.run(main())
+    assert len(calls) == 1 and refreshes == 1 and joined == 1
+    assert [entry.value for entry in entries] == [{"items": 1}, {"items": 1}]
+
+
+def test_expired_entries_are_only_served_stale_on_request(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared.sqlite3"))
+    cache.set("news", [1, 2], -1)
+    assert cache.get("news") is None
+    assert cache.get("news", allow_stale=True).value == [1, 2]
+    assert asyncio.run(cache.get_async("news", allow_stale=True)).value == [1, 2]
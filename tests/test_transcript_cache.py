@@ -0,0 +1,90 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from src.generation.cache import TranscriptCache
+from src.storage.shared_cache import SharedCache
+
+
+def generator(calls, delay=0.05):
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return f"transcript {len(calls)}"
+    return generate
+
+
+def test_concurrent_misses_in_one_process_generate_once(tmp_path):
+    cache = TranscriptCache(directory=str(tmp_path))
+    calls = []
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_generate("key", generator(calls)) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["transcript 1"] * 5
+    assert len(calls) == 1
+
+
+def test_waiters_share_the_error_and_take_over_after_a_cancel(tmp_path):
+    cache = TranscriptCache(directory=str(tmp_path))
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("no response")
+
+    async def main():
+        results = await asyncio.gather(
+            *(cache.get_or_generate("failed", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+        leader = asyncio.ensure_future(cache.get_or_generate("cancelled", generator(calls, delay=1)))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(cache.get_or_generate("cancelled", generator(calls)))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(main()) == "transcript 3"
+    assert len(calls) == 3
+
+
+def test_threads_writing_the_same_key_do_not_collide(tmp_path):
+    cache = TranscriptCache(directory=str(tmp_path))
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(50):
+                cache._write_disk("a" * 64, (float(i), f"text {n}"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert cache._read_disk("a" * 64)[1].startswith("text ")
+    assert [name for name in os.listdir(tmp_path / "aa") if name.endswith(".tmp")] == []
+
+
+def test_shared_backend_keeps_at_most_max_disk_entries(tmp_path):
+    shared = SharedCache(str(tmp_path / "shared.sqlite3"))
+    shared.set("news:items", [], 60)
+    cache = TranscriptCache(max_disk_entries=3, shared=shared)
+
+    async def main():
+        for n in range(6):
+            await cache.get_or_generate(f"key-{n}", generator([], delay=0))
+
+    asyncio.run(main())
+    assert shared.stats()["entries"] == 4
+    assert shared.get("transcript:key-5") is not None
+    assert shared.get("transcript:key-0") is None
+    assert shared.get("news:items") is not None
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from src.news.stub import StubTwitterClient
+from src.news.twitter import TwitterIngestor
+
+TERMS = ["Congress", "Federal Reserve", "Supreme Court", "White House"]
+
+
+def ingestor(client, **kwargs):
+    return TwitterIngestor(client, TERMS, **kwargs)
+
+
+def test_search_terms_are_fetched_concurrently():
+    twitter = ingestor(StubTwitterClient(latency=0.1), max_tweets_per_query=50, max_pages=1)
+    started = time.perf_counter()
+    tweets = asyncio.run(twitter.fetch())
+    elapsed = time.perf_counter() - started
+    twitter.shutdown()
+    assert len(tweets) == 4 * 50
+    assert elapsed < 0.3
+
+
+def test_pagination_stops_at_the_tweet_budget():
+    client = StubTwitterClient(tweets_per_query=500)
+    twitter = ingestor(client, max_tweets_per_query=250, max_pages=5)
+    tweets = twitter.fetch_query(twitter.build_query("Congress"))
+    twitter.shutdown()
+    assert len(tweets) == 250
+    assert client.calls == 3
+
+
+def test_later_polls_only_fetch_new_tweets():
+    client = StubTwitterClient(tweets_per_query=30)
+    twitter = ingestor(client)
+    first = asyncio.run(twitter.fetch())
+    client.post(twitter.build_query("Congress"), count=5)
+    calls = client.calls
+    second = asyncio.run(twitter.fetch())
+    twitter.shutdown()
+
+    # one page per term, carrying only the five new tweets
+    assert client.calls - calls == len(TERMS)
+    assert len(second) == len(first) + 5
+    assert len({tweet.id for tweet in second}) == len(second)
+
+
+def test_rate_limited_query_pauses_without_advancing_its_watermark():
+    client = StubTwitterClient(rate_limit_every=1, rate_limit_reset_seconds=600)
+    twitter = ingestor(client, max_backoff=5)
+    query = twitter.build_query("Congress")
+    assert twitter.fetch_query(query) == []
+    assert query not in twitter.since_ids
+    assert twitter.blocked_until[query] > time.time() + 500
+
+    calls = client.calls
+    assert twitter.fetch_query(query) == []
+    assert client.calls == calls
+    twitter.shutdown()